@@ -0,0 +1,59 @@
+"""Sequential vs concurrent news fetches against the local fake NewsAPI.
+
+Starts ``fake_news_server`` in-process, fetches ``--companies`` companies one
+after another and then all at once through ``AsyncNewsScraper``, and reports
+the speedup, the peak request rate seen by the server and how many requests
+it rejected for exceeding its quota.
+
+    python benchmarks/bench_async_news.py --companies 40
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'webapp')]
+
+from async_news import AsyncNewsScraper
+from fake_news_server import FakeNewsServer, run_in_thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--companies', type=int, default=40)
+    parser.add_argument('--latency', type=float, default=0.3)
+    parser.add_argument('--server-rate', type=float, default=10.0, help="server quota, requests/sec")
+    parser.add_argument('--client-rate', type=float, default=8.0, help="client token bucket, requests/sec")
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    companies = [f"Company {i}" for i in range(args.companies)]
+    server = FakeNewsServer(latency=args.latency, rate=args.server_rate, burst=int(args.server_rate))
+    base_url, stop = run_in_thread(server)
+    scraper = AsyncNewsScraper(api_key='bench', base_url=base_url, concurrency=args.concurrency,
+                               rate_per_sec=args.client_rate, burst=int(args.client_rate))
+    try:
+        start = time.perf_counter()
+        for company in companies:
+            scraper.fetch_company_news(company, 7)
+        sequential = time.perf_counter() - start
+
+        server.reset()
+        start = time.perf_counter()
+        frames = scraper.fetch_many(companies, 7)
+        concurrent = time.perf_counter() - start
+    finally:
+        scraper.close()
+        stop()
+
+    articles = sum(len(frame) for frame in frames.values())
+    print(f"{args.companies} companies, {articles} articles, {args.latency * 1e3:.0f} ms server latency")
+    print(f"  sequential : {sequential:6.2f} s")
+    print(f"  concurrent : {concurrent:6.2f} s  ({sequential / concurrent:.1f}x)")
+    print(f"  peak rate  : {server.peak_rate():.1f} req/s (quota {args.server_rate:.0f}, client limit {args.client_rate:.0f})")
+    print(f"  rejected   : {server.stats['rejected']} of {server.stats['requests']} requests (429)")
+
+
+if __name__ == '__main__':
+    main()
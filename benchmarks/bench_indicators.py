@@ -0,0 +1,66 @@
+"""Batch vs incremental indicators when bars arrive one at a time.
+
+For each scenario the last ``--appends`` bars are fed one by one. The batch
+path recomputes ``TechnicalIndicators.add_all_indicators`` over the whole
+history on every new bar; the incremental path appends to
+``IncrementalIndicatorEngine``. Outputs are compared column by column.
+
+    python benchmarks/bench_indicators.py
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'webapp')]
+
+from src.analysis.technical_indicators import TechnicalIndicators
+from indicator_state import INDICATOR_COLUMNS, IncrementalIndicatorEngine
+from synthetic import NSE_MINUTES_PER_DAY, TRADING_DAYS, make_ohlcv
+
+SCENARIOS = {
+    '10y daily': dict(n_bars=10 * TRADING_DAYS, freq='B'),
+    '60d 1-minute': dict(n_bars=60 * NSE_MINUTES_PER_DAY, freq='min',
+                         periods_per_year=TRADING_DAYS * NSE_MINUTES_PER_DAY),
+}
+
+
+def run(name, appends, **kwargs):
+    hist = make_ohlcv(seed=7, **kwargs)
+    warm = len(hist) - appends
+
+    start = time.perf_counter()
+    for end in range(warm + 1, len(hist) + 1):
+        batch = TechnicalIndicators.add_all_indicators(hist.iloc[:end].copy())
+    batch_seconds = time.perf_counter() - start
+
+    engine = IncrementalIndicatorEngine()
+    engine.add_all_indicators(name, hist.iloc[:warm])
+    start = time.perf_counter()
+    for position in range(warm, len(hist)):
+        engine.update(name, hist.index[position], hist['Close'].iloc[position])
+    incremental_seconds = time.perf_counter() - start
+
+    incremental = engine.add_all_indicators(name, hist)
+    max_diff = max(
+        float(np.nanmax(np.abs(incremental[col].to_numpy() - batch[col].to_numpy())))
+        for col in INDICATOR_COLUMNS
+    )
+    print(f"{name:>14} | {len(hist):>7} bars | batch {batch_seconds / appends * 1e3:9.3f} ms/bar"
+          f" | incremental {incremental_seconds / appends * 1e6:8.2f} us/bar"
+          f" | speedup {batch_seconds / incremental_seconds:8.0f}x | max |diff| {max_diff:.2e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--appends', type=int, default=200, help="bars fed one at a time per scenario")
+    args = parser.parse_args()
+    for name, kwargs in SCENARIOS.items():
+        run(name, args.appends, **kwargs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Tick throughput and tick-to-consumer latency of the live intraday mode.
+
+A synthetic replay file is streamed through ``LiveSession`` as fast as
+possible (``--speed 0``) or paced at a replay speed. A consumer thread
+drains the update queue every ``--poll-ms``, like the Live page does, and
+records latency from tick receipt to the moment it handled the update.
+
+    python benchmarks/bench_live_feed.py --days 20
+    python benchmarks/bench_live_feed.py --speed 600 --poll-ms 250
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'webapp')]
+
+from live_feed import LiveSession, ReplayTickSource, write_replay_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=20, help="trading sessions in the replay file")
+    parser.add_argument('--speed', type=float, default=0, help="replay speed (0 = as fast as possible)")
+    parser.add_argument('--poll-ms', type=float, default=50, help="consumer drain interval")
+    parser.add_argument('--queue-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_replay_file(os.path.join(tmp, 'BENCH.csv'), 'BENCH', days=args.days)
+        source = ReplayTickSource('BENCH', path=path, speed=args.speed or None)
+        session = LiveSession(source, avg_sentiment=0.15, queue_size=args.queue_size).start()
+        consumed = 0
+        while session.running or session.updates.qsize():
+            updates = session.drain()
+            session.record_render(updates)
+            consumed += len(updates)
+            time.sleep(args.poll_ms / 1000)
+
+    stats = session.stats()
+    print(f"{stats['ticks']:,} ticks -> {stats['bars']:,} bars | {stats['ticks_per_sec']:,.0f} ticks/s"
+          f" | consumed {consumed:,}, dropped {stats['dropped']:,}"
+          f" | tick->consumer p50 {stats['latency_p50_ms']:.2f} ms, p95 {stats['latency_p95_ms']:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
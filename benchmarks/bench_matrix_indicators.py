@@ -0,0 +1,51 @@
+"""Per-symbol pandas indicators vs one vectorized pass over a close matrix.
+
+    python benchmarks/bench_matrix_indicators.py --symbols 500 --bars 250
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'webapp')]
+
+from src.analysis.technical_indicators import TechnicalIndicators
+from indicator_state import INDICATOR_COLUMNS
+from matrix_indicators import compute_indicators
+from synthetic import make_close_matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--bars', type=int, default=250)
+    args = parser.parse_args()
+
+    close = make_close_matrix(args.symbols, args.bars, seed=3)
+    index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=args.bars)
+
+    start = time.perf_counter()
+    frames = [TechnicalIndicators.add_all_indicators(pd.DataFrame({'Close': row}, index=index))
+              for row in close]
+    pandas_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matrix = compute_indicators(close)
+    matrix_seconds = time.perf_counter() - start
+
+    max_diff = max(
+        float(np.nanmax(np.abs(np.vstack([frame[col].to_numpy() for frame in frames]) - matrix[col])))
+        for col in INDICATOR_COLUMNS
+    )
+    print(f"{args.symbols} symbols x {args.bars} bars")
+    print(f"  per-symbol pandas: {pandas_seconds * 1e3:9.1f} ms")
+    print(f"  matrix:            {matrix_seconds * 1e3:9.1f} ms  ({pandas_seconds / matrix_seconds:.0f}x)")
+    print(f"  max |diff|:        {max_diff:.2e}")
+
+
+if __name__ == '__main__':
+    main()
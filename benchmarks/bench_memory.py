@@ -0,0 +1,108 @@
+"""Memory held per cached analysis result: copied object frames vs compact shared ones.
+
+For ``--symbols`` synthetic symbols a year of bars sits in the price store,
+and each of ``--sessions`` sessions analyses every symbol with
+``--articles`` freshly scraped and scored headlines. The legacy layout
+copies the bar window twice, as the pipeline used to, and keeps text and
+ISO timestamps in object columns with float64 scores. The compact layout
+takes a view of the bars the store holds, adds indicators copy-on-write,
+and runs ``compact_news`` on the article columns. Retained memory is
+measured with tracemalloc while every result is alive.
+
+    python benchmarks/bench_memory.py --symbols 200 --sessions 4 --articles 50
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'webapp')]
+
+from compact import MEMORY_TARGET_BYTES, compact_news
+from indicator_state import IncrementalIndicatorEngine
+from price_store import CachedStockDataFetcher
+from result_cache import estimate_size
+from synthetic import TRADING_DAYS, make_news, make_ohlcv
+
+LOOKBACK_DAYS = 30
+
+
+class _SyntheticFetcher:
+    def get_stock_data(self, symbol, period):
+        hist = make_ohlcv(TRADING_DAYS, seed=int(symbol[3:]), end=pd.Timestamp.now().normalize())
+        return {'historical': hist, 'current_price': float(hist['Close'].iloc[-1]), 'day_change': 0.0}
+
+
+def _scored_news(symbol, n_articles):
+    news_df = make_news(n_articles, companies=[symbol], days=7, seed=int(symbol[3:]))
+    rng = np.random.default_rng(len(symbol))
+    news_df['vader_compound'] = rng.uniform(-1, 1, n_articles)
+    news_df['sentiment_class'] = np.where(news_df['vader_compound'] > 0.05, 'Positive',
+                                          np.where(news_df['vader_compound'] < -0.05, 'Negative', 'Neutral'))
+    return news_df
+
+
+def legacy_result(fetcher, engine, symbol, n_articles):
+    news_df = _scored_news(symbol, n_articles)
+    bars = fetcher.read_bars(symbol)
+    window = bars[bars.index >= pd.Timestamp.now() - pd.Timedelta(days=LOOKBACK_DAYS)]
+    hist = window.copy()
+    for column, values in engine.add_all_indicators(symbol, hist)[['RSI', 'MACD', 'Signal', 'MA20', 'MA50']].items():
+        hist[column] = values.to_numpy().copy()
+    return {'hist': hist, 'stock_data': {'historical': hist}, 'news_df': news_df.astype(object)}
+
+
+def compact_result(fetcher, engine, symbol, n_articles):
+    news_df = _scored_news(symbol, n_articles)
+    stock_data = fetcher.get_stock_data(symbol, period=f"{LOOKBACK_DAYS}d")
+    hist = engine.add_all_indicators(symbol, stock_data['historical'])
+    stock_data['historical'] = hist
+    return {'hist': hist, 'stock_data': stock_data, 'news_df': compact_news(news_df)}
+
+
+def measure(build, fetcher, symbols, sessions, n_articles):
+    """Retained bytes per result and mean ``estimate_size`` of one result."""
+    engine = IncrementalIndicatorEngine()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    results = [build(fetcher, engine, symbol, n_articles) for _ in range(sessions) for symbol in symbols]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    estimated = np.mean([estimate_size(result['hist']) + estimate_size(result['news_df']) for result in results])
+    return retained / len(results), estimated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--symbols', type=int, default=200)
+    parser.add_argument('--sessions', type=int, default=4)
+    parser.add_argument('--articles', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fetcher = CachedStockDataFetcher(_SyntheticFetcher(), cache_dir=tmp)
+        symbols = [f"SYM{i}" for i in range(args.symbols)]
+        for symbol in symbols:
+            fetcher.get_stock_data(symbol, period=f"{TRADING_DAYS}d")
+        legacy_retained, legacy_estimated = measure(legacy_result, fetcher, symbols, args.sessions, args.articles)
+        compact_retained, compact_estimated = measure(compact_result, fetcher, symbols, args.sessions, args.articles)
+
+    print(f"{args.symbols} symbols x {args.sessions} sessions, {args.articles} articles and "
+          f"{LOOKBACK_DAYS} days of bars per result")
+    print(f"  legacy : {legacy_retained / 1024:8.1f} KB retained/result  {legacy_estimated / 1024:8.1f} KB estimated")
+    print(f"  compact: {compact_retained / 1024:8.1f} KB retained/result  {compact_estimated / 1024:8.1f} KB estimated")
+    print(f"  reduction {1 - compact_retained / legacy_retained:.0%} retained; "
+          f"target {MEMORY_TARGET_BYTES / 1024:.0f} KB per cached symbol "
+          f"{'met' if compact_estimated <= MEMORY_TARGET_BYTES else 'MISSED'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Portfolio valuation and risk time at growing position counts.
+
+Synthetic GBM closes stand in for the bulk download, so this measures only
+``value_portfolio``: alignment, P&L, covariance/correlation and historical
+VaR over ``--years`` of daily bars.
+
+    python benchmarks/bench_portfolio.py --positions 10 100 1000 3000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'webapp')]
+
+from portfolio_engine import value_portfolio
+from synthetic import TRADING_DAYS, make_close_matrix
+
+
+def run(n_positions, years):
+    n_bars = int(years * TRADING_DAYS)
+    close = make_close_matrix(n_positions, n_bars, seed=3)
+    dates = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=n_bars)
+    symbols = [f"SYM{i:04d}.NS" for i in range(n_positions)]
+    histories = {symbol: pd.DataFrame({'Close': close[i]}, index=dates) for i, symbol in enumerate(symbols)}
+    rng = np.random.default_rng(3)
+    holdings = pd.DataFrame({
+        'symbol': symbols,
+        'quantity': rng.integers(1, 500, n_positions),
+        'avg_cost': close[:, 0] * rng.uniform(0.8, 1.2, n_positions)
+    })
+
+    start = time.perf_counter()
+    report = value_portfolio(holdings, histories)
+    elapsed = time.perf_counter() - start
+    var95 = report['var'][0.95]['var']
+    print(f"{n_positions:>6} positions x {n_bars} bars | {elapsed * 1e3:8.1f} ms"
+          f" | value ₹{report['totals']['market_value']:,.0f} | 1-day VaR95 ₹{var95:,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--positions', type=int, nargs='+', default=[10, 100, 1000, 3000])
+    parser.add_argument('--years', type=float, default=5)
+    args = parser.parse_args()
+    for n_positions in args.positions:
+        run(n_positions, args.years)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Sentiment throughput vs worker count on a synthetic headline corpus.
+
+    python benchmarks/bench_sentiment_parallel.py --articles 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'webapp')]
+
+from src.analysis.sentiment_analyzer import SentimentAnalyzer
+from sentiment_parallel import DEFAULT_CHUNK_SIZE, SentimentPool
+from synthetic import make_news
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=100_000)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    news_df = make_news(args.articles, seed=11)
+    analyzer = SentimentAnalyzer()
+
+    start = time.perf_counter()
+    serial = analyzer.analyze_dataframe(news_df)
+    serial_seconds = time.perf_counter() - start
+    expected = analyzer.get_average_sentiment(serial)
+    print(f"{args.articles} articles")
+    print(f"  serial     : {args.articles / serial_seconds:10,.0f} articles/sec")
+
+    workers = 1
+    while workers <= args.max_workers:
+        with SentimentPool(workers, args.chunk_size) as pool:
+            pool.analyze_dataframe(news_df.head(workers))  # warm-up: spawn workers, load the lexicon
+            start = time.perf_counter()
+            parallel = pool.analyze_dataframe(news_df)
+            seconds = time.perf_counter() - start
+        same = (np.allclose(parallel['vader_compound'], serial['vader_compound'])
+                and (parallel['sentiment_class'] == serial['sentiment_class']).all()
+                and analyzer.get_average_sentiment(parallel) == expected)
+        print(f"  {workers:>2} workers: {args.articles / seconds:10,.0f} articles/sec"
+              f"  ({serial_seconds / seconds:4.1f}x)  identical={same}")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Cold import time and time-to-first-render for each page of the dashboard.
+
+Every measurement runs in a fresh interpreter so nothing is already in
+``sys.modules``. Import times cover the modules each page loads; render
+times use Streamlit's ``AppTest`` harness to run the script headless, once
+with the background pre-warm disabled and once with it enabled.
+
+    python benchmarks/bench_startup.py --repeats 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEBAPP = os.path.join(ROOT, 'webapp')
+
+PAGE_MODULES = {
+    '📊 Analysis': ['pandas', 'plotly.graph_objects', 'components', 'pipeline', 'batch_analysis'],
+    '📁 Portfolio': ['pages.portfolio'],
+    '🏠 Home': ['pages.home'],
+}
+
+_IMPORT_SNIPPET = """
+import sys, time
+sys.path[:0] = {paths!r}
+start = time.perf_counter()
+import streamlit
+base = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+print(time.perf_counter() - base)
+"""
+
+_RENDER_SNIPPET = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({app!r}, default_timeout=120)
+start = time.perf_counter()
+app.run()
+first = time.perf_counter() - start
+if {page!r} != app.sidebar.radio[0].value:
+    start = time.perf_counter()
+    app.sidebar.radio[0].set_value({page!r}).run()
+    first = time.perf_counter() - start
+print(json.dumps({{'seconds': first, 'errors': [str(e.value) for e in app.exception]}}))
+"""
+
+
+def _python(code, env=None):
+    output = subprocess.run([sys.executable, '-c', code], cwd=WEBAPP, env=env,
+                            capture_output=True, text=True, check=True)
+    return output.stdout.strip().splitlines()[-1]
+
+
+def import_seconds(modules, repeats):
+    code = _IMPORT_SNIPPET.format(paths=[ROOT, WEBAPP], modules=modules)
+    return statistics.median(float(_python(code)) for _ in range(repeats))
+
+
+def render_seconds(page, prewarm, repeats):
+    env = dict(os.environ, STOCK_ANALYZER_PREWARM='1' if prewarm else '0')
+    code = _RENDER_SNIPPET.format(app=os.path.join(WEBAPP, 'app.py'), page=page)
+    runs = [json.loads(_python(code, env)) for _ in range(repeats)]
+    errors = sorted({error for run in runs for error in run['errors']})
+    return statistics.median(run['seconds'] for run in runs), errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'page':<14} {'cold import':>12} {'render (cold)':>14} {'render (prewarm)':>17}")
+    for page, modules in PAGE_MODULES.items():
+        imports = import_seconds(modules, args.repeats)
+        cold, errors = render_seconds(page, False, args.repeats)
+        warm, _ = render_seconds(page, True, args.repeats)
+        print(f"{page:<14} {imports * 1e3:10.0f} ms {cold * 1e3:12.0f} ms {warm * 1e3:15.0f} ms")
+        for error in errors:
+            print(f"    ! {error}")
+
+
+if __name__ == '__main__':
+    main()
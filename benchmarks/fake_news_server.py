@@ -0,0 +1,131 @@
+"""Local stand-in for the NewsAPI ``/v2/everything`` endpoint.
+
+Serves seeded synthetic articles after a configurable latency and enforces a
+per-key request quota (token bucket), answering 429 with ``Retry-After``
+when it is exceeded, so client concurrency and rate limiting can be measured
+offline.
+
+    python benchmarks/fake_news_server.py --port 8765 --latency 0.3 --rate 5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+import zlib
+
+from aiohttp import web
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'webapp')]
+
+from synthetic import make_news
+
+
+class FakeNewsServer:
+    def __init__(self, latency=0.3, rate=5.0, burst=5, articles_per_query=40):
+        self.latency = latency
+        self.rate = rate
+        self.burst = burst
+        self.articles_per_query = articles_per_query
+        self.stats = {'requests': 0, 'rejected': 0, 'peak_concurrency': 0}
+        self._in_flight = 0
+        self._buckets = {}
+        self._request_times = []
+
+    def _allow(self, api_key):
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(api_key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        allowed = tokens >= 1
+        self._buckets[api_key] = (tokens - 1 if allowed else tokens, now)
+        return allowed
+
+    async def everything(self, request):
+        self.stats['requests'] += 1
+        self._request_times.append(time.monotonic())
+        if not self._allow(request.query.get('apiKey', '')):
+            self.stats['rejected'] += 1
+            return web.json_response(
+                {'status': 'error', 'code': 'rateLimited'}, status=429, headers={'Retry-After': '1'}
+            )
+        self._in_flight += 1
+        self.stats['peak_concurrency'] = max(self.stats['peak_concurrency'], self._in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self._in_flight -= 1
+        company = request.query.get('q', 'Company')
+        page = int(request.query.get('page', 1))
+        # Same articles for a query in every run (``hash`` of a str is salted per process)
+        news = make_news(self.articles_per_query, companies=[company], seed=zlib.crc32(f"{company}:{page}".encode('utf-8')))
+        return web.json_response({
+            'status': 'ok',
+            'totalResults': self.articles_per_query,
+            'articles': [{
+                'source': {'id': None, 'name': row.source},
+                'title': row.title,
+                'description': row.description,
+                'url': row.url,
+                'publishedAt': row.published_at + 'Z'
+            } for row in news.itertuples()]
+        })
+
+    @property
+    def request_times(self):
+        """Monotonic arrival time of every request since the last ``reset``."""
+        return list(self._request_times)
+
+    def reset(self):
+        self.stats = {'requests': 0, 'rejected': 0, 'peak_concurrency': 0}
+        self._request_times.clear()
+
+    def peak_rate(self, window=1.0):
+        """Most requests seen in any ``window``-second span."""
+        times = self.request_times
+        best, start = 0, 0
+        for end, t in enumerate(times):
+            while t - times[start] > window:
+                start += 1
+            best = max(best, end - start + 1)
+        return best / window
+
+    def app(self):
+        app = web.Application()
+        app.router.add_get('/v2/everything', self.everything)
+        return app
+
+
+def run_in_thread(server, port=0):
+    """Start ``server`` on a daemon thread; returns ``(base_url, stop)``."""
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(server.app())
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, '127.0.0.1', port)
+    loop.run_until_complete(site.start())
+    bound_port = site._server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    return f"http://127.0.0.1:{bound_port}/v2/everything", stop
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.3)
+    parser.add_argument('--rate', type=float, default=5.0, help="allowed requests/sec per API key")
+    parser.add_argument('--burst', type=int, default=5)
+    args = parser.parse_args()
+    server = FakeNewsServer(args.latency, args.rate, args.burst)
+    web.run_app(server.app(), host='127.0.0.1', port=args.port)
+
+
+if __name__ == '__main__':
+    main()
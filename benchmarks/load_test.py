@@ -0,0 +1,79 @@
+"""Closed-loop load test against a running ``webapp/service.py serve`` instance.
+
+Each worker thread keeps one HTTP/1.1 connection open and sends requests back
+to back for ``--duration`` seconds, cycling through ``--symbols``. Reports
+throughput, latency percentiles and non-200 responses.
+
+    python webapp/service.py serve --port 8000 &
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --concurrency 16 --duration 20
+"""
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from collections import Counter
+from urllib.parse import quote, urlsplit
+
+
+def worker(host, port, paths, deadline, latencies, statuses, lock):
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    local_latencies, local_statuses = [], Counter()
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+            local_statuses[response.status] += 1
+        except (OSError, http.client.HTTPException) as exc:
+            local_statuses[type(exc).__name__] += 1
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        local_latencies.append(time.perf_counter() - start)
+    connection.close()
+    with lock:
+        latencies.extend(local_latencies)
+        statuses.update(local_statuses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--symbols', nargs='+', default=['RELIANCE.NS', 'TCS.NS', 'INFY.NS', 'HDFCBANK.NS'])
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=20)
+    args = parser.parse_args()
+
+    target = urlsplit(args.url)
+    paths = [f"/recommend?symbol={quote(symbol)}&days={args.days}" for symbol in args.symbols]
+    latencies, statuses, lock = [], Counter(), threading.Lock()
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(target=worker, args=(target.hostname, target.port or 80, paths, deadline,
+                                              latencies, statuses, lock))
+        for _ in range(args.concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(latencies):,} requests in {elapsed:.1f}s with {args.concurrency} connections")
+    print(f"  throughput: {len(latencies) / elapsed:,.0f} req/s")
+    if latencies:
+        cuts = statistics.quantiles(latencies, n=100)
+        print(f"  latency   : p50 {cuts[49] * 1e3:.1f} ms  p95 {cuts[94] * 1e3:.1f} ms  "
+              f"p99 {cuts[98] * 1e3:.1f} ms  max {max(latencies) * 1e3:.1f} ms")
+    print(f"  responses : {dict(statuses)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,263 @@
+"""Offline benchmark suite for every pipeline stage, with regression checks.
+
+Each stage runs on seeded synthetic inputs (GBM OHLCV with volume, generated
+headline corpora) at each size of the chosen scale. Time is the best of
+``--repeat`` runs; peak memory comes from one extra run under tracemalloc.
+Stages whose implementation cannot be imported here are reported as
+skipped. ``--save-baseline`` writes the results as the new baseline;
+otherwise results are compared with it, and any stage slower or larger than
+the baseline by more than ``--threshold`` is flagged and the exit status is
+1.
+
+    python benchmarks/run.py --scale small --save-baseline
+    python benchmarks/run.py --scale small
+    python benchmarks/run.py --scale large --stages indicators.matrix features.batch
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'webapp')]
+
+from synthetic import NSE_MINUTES_PER_DAY, TRADING_DAYS, make_close_matrix, make_news, make_ohlcv
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+DEFAULT_THRESHOLD = 0.25
+SCALES = {
+    'small': {'symbols': [1, 10], 'headlines': [100, 1_000]},
+    'medium': {'symbols': [1, 10, 100], 'headlines': [100, 10_000, 100_000]},
+    'large': {'symbols': [1, 10, 100, 1_000], 'headlines': [100, 10_000, 100_000, 1_000_000]},
+}
+HISTORY_BARS = TRADING_DAYS
+CHART_BARS = 60 * NSE_MINUTES_PER_DAY
+
+
+def _histories(n_symbols, n_bars=HISTORY_BARS, **kwargs):
+    return [make_ohlcv(n_bars, seed=i, **kwargs) for i in range(n_symbols)]
+
+
+def _stock_data(hist):
+    return {'historical': hist, 'current_price': float(hist['Close'].iloc[-1]),
+            'day_change': float(hist['Close'].pct_change().iloc[-1] * 100), 'pe_ratio': 20.0}
+
+
+# Each stage: (axis, setup(n) -> state, run(state)). Imports happen in setup so a
+# missing dependency skips only the stages that need it.
+
+def _sentiment_setup(n):
+    from src.analysis.sentiment_analyzer import SentimentAnalyzer
+    return SentimentAnalyzer(), make_news(n, seed=1)
+
+
+def _sentiment_run(state):
+    analyzer, news_df = state
+    analyzer.analyze_dataframe(news_df)
+
+
+def _indicators_setup(n):
+    from src.analysis.technical_indicators import TechnicalIndicators
+    return TechnicalIndicators, _histories(n)
+
+
+def _indicators_run(state):
+    indicators, histories = state
+    for hist in histories:
+        indicators.add_all_indicators(hist.copy())
+
+
+def _incremental_setup(n):
+    from indicator_state import IncrementalIndicatorEngine
+    return IncrementalIndicatorEngine, _histories(n)
+
+
+def _incremental_run(state):
+    engine_class, histories = state
+    engine = engine_class()
+    for i, hist in enumerate(histories):
+        engine.add_all_indicators(i, hist)
+
+
+def _matrix_setup(n):
+    from matrix_indicators import compute_indicators
+    return compute_indicators, make_close_matrix(n, HISTORY_BARS, seed=1)
+
+
+def _matrix_run(state):
+    compute_indicators, close = state
+    compute_indicators(close)
+
+
+def _features_setup(n):
+    from src.models.predictor import StockPredictor
+    from indicator_state import IncrementalIndicatorEngine
+    engine = IncrementalIndicatorEngine()
+    stock_data = [_stock_data(engine.add_all_indicators(i, hist)) for i, hist in enumerate(_histories(n))]
+    return StockPredictor(), make_news(20, seed=2), stock_data
+
+
+def _features_run(state):
+    predictor, news_df, stock_data = state
+    for data in stock_data:
+        predictor.prepare_features(news_df, data)
+
+
+def _batch_features_setup(n):
+    from batch_predict import build_feature_matrix
+    histories = _histories(n)
+    close = np.vstack([hist['Close'].to_numpy() for hist in histories])
+    volume = np.vstack([hist['Volume'].to_numpy() for hist in histories])
+    rng = np.random.default_rng(3)
+    return build_feature_matrix, rng.uniform(-1, 1, n), close, volume, rng.uniform(5, 60, n)
+
+
+def _batch_features_run(state):
+    build_feature_matrix, sentiment, close, volume, pe_ratio = state
+    build_feature_matrix(sentiment, close, volume, pe_ratio)
+
+
+def _charts_setup(n):
+    from chart_data import build_payload
+    from matrix_indicators import compute_indicators
+    histories = _histories(n, CHART_BARS, freq='min', periods_per_year=TRADING_DAYS * NSE_MINUTES_PER_DAY)
+    for hist in histories:
+        for column, values in compute_indicators(hist['Close'].to_numpy()[None, :]).items():
+            hist[column] = values[0]
+    return build_payload, histories
+
+
+def _charts_run(state):
+    build_payload, histories = state
+    for hist in histories:
+        build_payload(hist)
+
+
+STAGES = {
+    'sentiment.analyze_dataframe': ('headlines', _sentiment_setup, _sentiment_run),
+    'indicators.add_all_indicators': ('symbols', _indicators_setup, _indicators_run),
+    'indicators.incremental': ('symbols', _incremental_setup, _incremental_run),
+    'indicators.matrix': ('symbols', _matrix_setup, _matrix_run),
+    'features.prepare_features': ('symbols', _features_setup, _features_run),
+    'features.batch': ('symbols', _batch_features_setup, _batch_features_run),
+    'charts.build_payload': ('symbols', _charts_setup, _charts_run),
+}
+
+
+def measure(run, state, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run(state)
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(state)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_suite(stage_names, scale, repeat):
+    results = {}
+    for name in stage_names:
+        axis, setup, run = STAGES[name]
+        for n in SCALES[scale][axis]:
+            key = f"{name}[{n}]"
+            try:
+                state = setup(n)
+            except ImportError as exc:
+                print(f"{key:<40} skipped ({exc})")
+                break
+            seconds, peak = measure(run, state, repeat)
+            results[key] = {'axis': axis, 'n': n, 'seconds': seconds,
+                            'throughput': n / seconds if seconds else None, 'peak_mb': peak / 1e6}
+            print(f"{key:<40} {seconds * 1e3:10.2f} ms  {n / seconds:14,.0f} {axis}/s  {peak / 1e6:9.1f} MB peak")
+            del state
+    return results
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """``[(key, metric, baseline, current, ratio)]`` for every regression beyond ``threshold``."""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get('results', {}).get(key)
+        if not previous:
+            continue
+        for metric in ('seconds', 'peak_mb'):
+            if previous[metric] and current[metric] > previous[metric] * (1 + threshold):
+                regressions.append((key, metric, previous[metric], current[metric], current[metric] / previous[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', choices=list(SCALES), default='small')
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="flag stages slower or larger than baseline by more than this fraction")
+    parser.add_argument('--output', help="also write this run's results as JSON")
+    args = parser.parse_args()
+
+    results = run_suite(args.stages, args.scale, args.repeat)
+    report = {'environment': environment(), 'scale': args.scale, 'created': time.time(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        baseline = {'results': {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        # Merge so a partial run only replaces the stages it measured
+        baseline['results'].update(results)
+        baseline.update(environment=report['environment'], created=report['created'])
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get('environment') != report['environment']:
+        print("\nNote: baseline was recorded in a different environment; timings may not be comparable")
+    regressions = compare(results, baseline, args.threshold)
+    if not regressions:
+        print(f"\nNo regressions beyond {args.threshold:.0%} of the baseline")
+        return
+    print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+    for key, metric, previous, current, ratio in regressions:
+        print(f"  {key:<40} {metric:<8} {previous:10.4f} -> {current:10.4f}  ({ratio:.2f}x)")
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
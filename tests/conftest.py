@@ -0,0 +1,6 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The webapp modules import each other by bare name, as they do under ``streamlit run``
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'webapp')]
@@ -0,0 +1,99 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+import async_news
+from async_news import AsyncNewsScraper, TokenBucket
+from benchmarks.fake_news_server import FakeNewsServer, run_in_thread
+
+
+@pytest.fixture
+def serve():
+    stops = []
+
+    def start(**kwargs):
+        server = FakeNewsServer(**kwargs)
+        base_url, stop = run_in_thread(server)
+        stops.append(stop)
+        return server, base_url
+
+    yield start
+    for stop in stops:
+        stop()
+
+
+@pytest.fixture
+def scrapers():
+    made = []
+
+    def make(base_url, **kwargs):
+        scraper = AsyncNewsScraper(api_key='test', base_url=base_url, **kwargs)
+        made.append(scraper)
+        return scraper
+
+    yield make
+    for scraper in made:
+        scraper.close()
+
+
+def test_token_bucket_enforces_the_rate():
+    async def acquire_times(bucket, n):
+        start = time.monotonic()
+        times = []
+        for _ in range(n):
+            await bucket.acquire()
+            times.append(time.monotonic() - start)
+        return times
+
+    times = asyncio.run(acquire_times(TokenBucket(rate=20, capacity=2), 12))
+    # The burst goes out at once, the rest at the refill rate
+    assert times[1] < 0.02
+    assert times[-1] >= (12 - 2) / 20 - 0.02
+
+
+def test_429_is_retried_after_retry_after(serve, scrapers, monkeypatch):
+    monkeypatch.setattr(async_news, 'BACKOFF_BASE_SECONDS', 0.01)
+    server, base_url = serve(latency=0, rate=1, burst=1)
+    scraper = scrapers(base_url, rate_per_sec=100, burst=100, max_retries=2)
+
+    start = time.monotonic()
+    frames = scraper.fetch_many(['Alpha', 'Beta'])
+    elapsed = time.monotonic() - start
+
+    assert server.stats['rejected'] >= 1
+    assert scraper.stats['retries'] >= 1
+    assert scraper.stats['failures'] == 0
+    assert all(len(frame) == server.articles_per_query for frame in frames.values())
+    # The server's Retry-After (1s) wins over the much shorter backoff
+    assert elapsed >= 1.0
+
+
+def test_concurrency_is_bounded(serve, scrapers):
+    server, base_url = serve(latency=0.1, rate=1000, burst=1000)
+    scraper = scrapers(base_url, concurrency=2, rate_per_sec=1000, burst=1000)
+
+    frames = scraper.fetch_many([f"Company {i}" for i in range(8)])
+
+    assert len(frames) == 8
+    assert server.stats['requests'] == 8
+    assert server.stats['peak_concurrency'] == 2
+
+
+def test_matches_the_sync_scraper(serve, scrapers, monkeypatch):
+    news_scraper = pytest.importorskip('src.scrapers.news_scraper')
+    requests = pytest.importorskip('requests')
+    server, base_url = serve(latency=0, rate=1000, burst=1000)
+    scraper = scrapers(base_url)
+
+    # Point the sync scraper's NewsAPI calls at the fake server
+    request = requests.Session.request
+    monkeypatch.setattr(requests.Session, 'request', lambda self, method, url, *args, **kwargs: request(
+        self, method, url.replace(async_news.NEWSAPI_URL, base_url), *args, **kwargs))
+    expected = news_scraper.NewsScraper(api_key='test').fetch_company_news('Alpha', days=7)
+    actual = scraper.fetch_company_news('Alpha', days=7)
+
+    assert list(actual.columns) == list(expected.columns)
+    assert actual[['title', 'url']].to_dict('records') == expected[['title', 'url']].to_dict('records')
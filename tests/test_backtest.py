@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import daily_sentiment, run_backtest, synthetic_inputs
+
+
+@pytest.fixture(scope='module')
+def inputs():
+    return synthetic_inputs(20, 1, articles_per_symbol_day=2)
+
+
+def test_same_bar_execution_is_rejected(inputs):
+    with pytest.raises(ValueError):
+        run_backtest(*inputs, execution_lag=0)
+
+
+def test_later_data_does_not_change_earlier_results(inputs):
+    close, dates, symbols, news_df = inputs
+    t = len(dates) // 2
+    base = run_backtest(close, dates, symbols, news_df)
+
+    future_close = close.copy()
+    future_close[:, t + 1:] *= np.random.default_rng(1).uniform(0.5, 1.5, future_close[:, t + 1:].shape)
+    later = pd.to_datetime(news_df['published_at']) >= dates[t] + pd.Timedelta(days=1)
+    future_news = news_df.assign(vader_compound=np.where(later, -news_df['vader_compound'], news_df['vader_compound']))
+    changed = run_backtest(future_close, dates, symbols, future_news)
+
+    np.testing.assert_array_equal(changed['scores'][:, :t + 1], base['scores'][:, :t + 1])
+    assert not np.array_equal(changed['scores'], base['scores'])
+    # A position opened at the close after bar d is marked at the close after that
+    known = dates[t - 2]
+    pd.testing.assert_frame_equal(changed['equity'].loc[:known], base['equity'].loc[:known])
+
+
+def test_articles_are_dated_by_the_exchange_day():
+    dates = pd.DatetimeIndex(['2026-01-05', '2026-01-06'], tz='Asia/Kolkata')
+    # 20:00 UTC on the 5th is 01:30 IST on the 6th
+    news_df = pd.DataFrame({'symbol': ['AAA.NS'], 'published_at': ['2026-01-05T20:00:00Z'], 'vader_compound': [0.8]})
+    sentiment = daily_sentiment(news_df, ['AAA.NS'], dates, lookback_days=1)
+    assert list(sentiment[0]) == [0.0, 0.8]
+
+    # Bars stamped in another zone still land on their IST date
+    sentiment = daily_sentiment(news_df, ['AAA.NS'], dates.tz_convert('UTC'), lookback_days=1)
+    assert list(sentiment[0]) == [0.0, 0.8]
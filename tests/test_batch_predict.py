@@ -0,0 +1,53 @@
+import logging
+
+import numpy as np
+
+from batch_predict import FEATURE_NAMES, build_feature_matrix, model_scores, predict_batch
+from scoring import compute_buy_scores
+
+
+class _FirstColumnModel:
+    """Buy probability is whatever the first column it is given holds."""
+
+    def predict_proba(self, features):
+        first = np.clip(features[:, 0], 0, 1)
+        return np.column_stack([1 - first, first])
+
+
+class _Predictor:
+    def __init__(self, feature_names):
+        self.model = _FirstColumnModel()
+        self.feature_names = feature_names
+
+
+def _features(n=4):
+    rng = np.random.default_rng(0)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, (n, 60)), axis=1)
+    volume = rng.uniform(1e5, 1e6, (n, 60))
+    return build_feature_matrix(rng.uniform(-1, 1, n), close, volume, rng.uniform(5, 60, n))
+
+
+def test_model_columns_follow_the_trained_feature_order():
+    features = _features()
+    trained_order = ['volatility', 'sentiment', 'price_change', 'volume', 'pe_ratio', 'trend']
+    scores = model_scores(_Predictor(trained_order), features)
+    np.testing.assert_allclose(scores, np.clip(features[:, FEATURE_NAMES.index('volatility')], 0, 1))
+
+
+def test_unknown_features_fall_back_to_the_rules_with_a_warning(caplog):
+    features = _features()
+    rsi = np.array([25.0, 50.0, 75.0, 50.0])
+    with caplog.at_level(logging.WARNING, logger='batch_predict'):
+        recommendations, confidences = predict_batch(_Predictor(['sentiment', 'sector_momentum']), features, rsi)
+    assert 'sector_momentum' in caplog.text
+    expected = compute_buy_scores(features[:, 0], features[:, 1], rsi)
+    np.testing.assert_allclose(confidences, expected.astype(np.float32))
+    assert len(recommendations) == 4
+
+
+def test_a_predictor_without_a_model_uses_the_rules_quietly(caplog):
+    predictor = _Predictor(FEATURE_NAMES)
+    predictor.model = None
+    with caplog.at_level(logging.WARNING, logger='batch_predict'):
+        assert model_scores(predictor, _features()) is None
+    assert not caplog.records
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from chart_data import build_payload, lttb, lttb_many
+
+
+def _reference_lttb(y, n_out):
+    """Textbook Largest-Triangle-Three-Buckets, one bucket at a time."""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    chosen = [0]
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_x, next_y = (end + next_end - 1) / 2.0, y[end:next_end].mean()
+        previous = chosen[-1]
+        xs = np.arange(start, end)
+        areas = np.abs((previous - next_x) * (y[start:end] - y[previous]) - (previous - xs) * (next_y - y[previous]))
+        chosen.append(start + int(np.argmax(areas)))
+    return np.array(chosen + [n - 1])
+
+
+@pytest.mark.parametrize('n', [2, 5, 10, 999, 1000, 1001, 4321])
+@pytest.mark.parametrize('n_out', [2, 3, 4, 50, 1000])
+def test_lttb_matches_the_reference(n, n_out):
+    rng = np.random.default_rng(n * 7 + n_out)
+    series = [np.cumsum(rng.normal(size=n - shift)) for shift in (0, 1) if n - shift > 0]
+    for y, picked in zip(series, lttb_many(series, n_out)):
+        np.testing.assert_array_equal(picked, _reference_lttb(y, n_out))
+    np.testing.assert_array_equal(lttb(series[0], n_out), _reference_lttb(series[0], n_out))
+
+
+def test_lttb_keeps_the_extremes():
+    y = np.zeros(10_000)
+    y[1234], y[8765] = 50.0, -50.0
+    picked = lttb(y, 100)
+    assert {1234, 8765} <= set(picked)
+
+
+def test_payload_lines_skip_leading_gaps():
+    index = pd.date_range('2026-10-01 09:15', periods=3000, freq='min', tz='Asia/Kolkata')
+    close = np.linspace(100, 130, 3000)
+    ma = pd.Series(close).rolling(50).mean().to_numpy()
+    hist = pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 1, 'MA50': ma},
+                        index=index)
+
+    payload = build_payload(hist, max_points=500)
+
+    x, y = payload['lines']['MA50']
+    assert len(y) == 500 and not np.isnan(y).any()
+    assert x[0] == index[49].strftime('%Y-%m-%d %H:%M')
+    assert payload['candles']['x'][0] == '2026-10-01 09:15'
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from compact import compact_news, copy_on_write, format_published, window
+
+
+def test_published_at_round_trips_for_display():
+    news_df = pd.DataFrame({
+        'title': ['a', 'b', 'c'],
+        'published_at': ['2026-10-16T09:30:00Z', '2026-10-15T18:05:12Z', 'not a date'],
+        'source': ['Mint', 'Mint', 'ET'],
+        'vader_compound': [0.5, -0.25, 0.0],
+    })
+    compact = compact_news(news_df)
+    assert pd.api.types.is_datetime64_any_dtype(compact['published_at'])
+    assert isinstance(compact['source'].dtype, pd.CategoricalDtype)
+    assert compact['vader_compound'].dtype == np.float32
+    assert list(format_published(compact['published_at'])) == ['2026-10-16T09:30:00Z', '2026-10-15T18:05:12Z', '']
+    # Text columns pass through unchanged
+    pd.testing.assert_series_equal(format_published(news_df['title']), news_df['title'])
+
+
+def test_window_shares_the_stored_bars():
+    bars = pd.DataFrame({'Close': np.arange(10.0)}, index=pd.date_range('2026-10-01', periods=10))
+    recent = window(bars, pd.Timestamp('2026-10-07'))
+    assert list(recent['Close']) == [6.0, 7.0, 8.0, 9.0]
+    assert np.shares_memory(recent['Close'].to_numpy(), bars['Close'].to_numpy()) == copy_on_write()
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicator_state import INDICATOR_COLUMNS, IncrementalIndicatorEngine
+from matrix_indicators import compute_indicators
+from synthetic import make_ohlcv
+
+
+def batch_indicators(hist):
+    """The pandas formulas the engine reproduces (``TechnicalIndicators.add_all_indicators``)."""
+    close = hist['Close']
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False).mean()
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    return pd.DataFrame({
+        'RSI': 100 - 100 / (1 + gain / loss),
+        'MACD': macd,
+        'Signal': macd.ewm(span=9, adjust=False).mean(),
+        'MA20': close.rolling(20).mean(),
+        'MA50': close.rolling(50).mean(),
+    }, index=hist.index)
+
+
+def assert_matches_batch(result, hist):
+    pd.testing.assert_frame_equal(result[INDICATOR_COLUMNS], batch_indicators(hist), check_exact=False, rtol=1e-9)
+
+
+@pytest.fixture
+def hist():
+    return make_ohlcv(200, seed=7)
+
+
+def test_full_history_matches_batch(hist):
+    assert_matches_batch(IncrementalIndicatorEngine().add_all_indicators('AAA', hist), hist)
+
+
+def test_extending_history_only_feeds_new_bars(hist):
+    engine = IncrementalIndicatorEngine()
+    engine.add_all_indicators('AAA', hist.iloc[:120])
+    assert_matches_batch(engine.add_all_indicators('AAA', hist), hist)
+    assert len(engine._series['AAA'].index) == len(hist)
+
+
+def test_revised_last_bar_is_recomputed(hist):
+    engine = IncrementalIndicatorEngine()
+    engine.add_all_indicators('AAA', hist)
+    revised = hist.assign(Close=np.r_[hist['Close'].to_numpy()[:-1], hist['Close'].iloc[-1] * 1.05])
+    assert_matches_batch(engine.add_all_indicators('AAA', revised), revised)
+
+
+def test_shifted_window_resets_the_symbol(hist):
+    engine = IncrementalIndicatorEngine()
+    engine.add_all_indicators('AAA', hist.iloc[:150])
+    later = hist.iloc[30:]
+    assert_matches_batch(engine.add_all_indicators('AAA', later), later)
+
+
+def test_single_bar_updates_match_batch(hist):
+    engine = IncrementalIndicatorEngine()
+    for timestamp, close in hist['Close'].items():
+        # An intraday tick revises the bar before it closes
+        engine.update('AAA', timestamp, close * 0.99)
+        last = engine.update('AAA', timestamp, close)
+    expected = batch_indicators(hist).iloc[-1]
+    assert np.allclose([last[column] for column in INDICATOR_COLUMNS], expected.to_numpy(), rtol=1e-9)
+
+
+def test_matrix_pass_matches_batch(hist):
+    values = compute_indicators(hist['Close'].to_numpy())
+    expected = batch_indicators(hist)
+    for column in INDICATOR_COLUMNS:
+        np.testing.assert_allclose(values[column][0], expected[column].to_numpy(), rtol=1e-9)
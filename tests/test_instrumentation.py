@@ -0,0 +1,40 @@
+import pandas as pd
+
+from instrumentation import InstrumentedComponent, Tracer
+from shared_store import SharedStore, SQLiteBackend, share
+
+
+class _Fetcher:
+    def __init__(self):
+        self.calls = 0
+
+    def get_stock_data(self, symbol, period='1mo'):
+        self.calls += 1
+        return {'historical': pd.DataFrame({'Close': [1.0, 2.0, 3.0]})}
+
+
+def test_spans_nest_inside_the_open_trace():
+    tracer = Tracer()
+    with tracer.trace('analysis'):
+        with tracer.span('compute'):
+            pass
+        with tracer.span('charts'):
+            pass
+    assert list(tracer.waterfall()['Span']) == ['analysis', 'compute', 'charts']
+    assert list(tracer.waterfall()['Depth']) == [0, 1, 1]
+
+
+def test_upstream_counters_skip_shared_store_hits(tmp_path):
+    tracer = Tracer()
+    upstream = _Fetcher()
+    counted = InstrumentedComponent(upstream, 'stock_upstream', rows={'get_stock_data': 'bars_fetched'},
+                                    sizes={'get_stock_data': 'result_bytes'}, tracer=tracer)
+    store = SharedStore(SQLiteBackend(str(tmp_path / 'shared.sqlite')))
+    fetcher = InstrumentedComponent(share(counted, store, 'prices', {'get_stock_data': 60}), 'stock_fetcher',
+                                    tracer=tracer)
+
+    for _ in range(3):
+        assert len(fetcher.get_stock_data('AAA')['historical']) == 3
+    assert upstream.calls == 1
+    assert tracer.counters[('bars_fetched', (('component', 'stock_upstream'),))] == 3
+    assert tracer.counters[('component_calls', (('component', 'stock_fetcher'), ('method', 'get_stock_data')))] == 3
@@ -0,0 +1,91 @@
+import time
+
+import pandas as pd
+import pytest
+
+from live_feed import TICKS_PER_BAR, BarAggregator, ClosedBars, LiveSession, Tick, TickSource
+
+START = pd.Timestamp('2026-10-16 09:15')
+
+
+def _tick(seconds, price, volume=10):
+    return Tick('TEST', START + pd.Timedelta(seconds=seconds), price, volume, time.perf_counter())
+
+
+def _minute_ticks(n_bars):
+    """``TICKS_PER_BAR`` ticks per minute; bar ``i`` trades around ``100 + i``."""
+    return [_tick(60 * i + 10 * j + 5, 100 + i + (-1) ** j * j * 0.5)
+            for i in range(n_bars) for j in range(TICKS_PER_BAR)]
+
+
+class _ListSource(TickSource):
+    symbol = 'TEST'
+
+    def __init__(self, ticks):
+        self._ticks = ticks
+
+    def ticks(self):
+        yield from self._ticks
+
+
+def test_tick_source_requires_ticks():
+    with pytest.raises(TypeError):
+        TickSource()
+
+
+def test_bar_aggregator_folds_ticks_into_ohlcv():
+    aggregator = BarAggregator('1min')
+    prices = [100.0, 101.5, 99.0, 100.5]
+    for seconds, price in zip([1, 20, 40, 59], prices):
+        bar, closed = aggregator.add(_tick(seconds, price, volume=5))
+        assert closed is None
+    assert bar == {'timestamp': START, 'Open': 100.0, 'High': 101.5, 'Low': 99.0, 'Close': 100.5, 'Volume': 20}
+
+    bar, closed = aggregator.add(_tick(61, 102.0))
+    assert closed['Close'] == 100.5
+    assert bar['timestamp'] == START + pd.Timedelta(minutes=1)
+    assert bar['Open'] == bar['Close'] == 102.0
+
+
+def _updates(ticks):
+    aggregator = BarAggregator('1min')
+    updates = []
+    for tick in ticks:
+        bar, _ = aggregator.add(tick)
+        updates.append({'timestamp': bar['timestamp'], 'current_price': tick.price})
+    return updates
+
+
+def test_closed_bars_keep_a_bar_that_ends_a_drain():
+    updates = _updates(_minute_ticks(30))
+    bars = ClosedBars()
+    closed = []
+    # Every drain ends exactly on a bar's last tick
+    for i in range(0, len(updates), 3 * TICKS_PER_BAR):
+        closed += bars.add(updates[i:i + 3 * TICKS_PER_BAR])
+    closed += bars.flush()
+
+    stamps = [update['timestamp'] for update in closed]
+    assert stamps == [START + pd.Timedelta(minutes=i) for i in range(30)]
+    # Each bar is reported with its final tick
+    assert [update['current_price'] for update in closed] == [u['current_price'] for u in updates[TICKS_PER_BAR - 1::TICKS_PER_BAR]]
+
+
+def test_closed_bars_flush_returns_the_open_bar_once():
+    bars = ClosedBars()
+    assert bars.add(_updates(_minute_ticks(1))) == []
+    assert len(bars.flush()) == 1
+    assert bars.flush() == []
+
+
+def test_live_session_updates_cover_every_bar():
+    session = LiveSession(_ListSource(_minute_ticks(30)), avg_sentiment=0.2).start()
+    session._thread.join(timeout=10)
+    assert not session.running
+    assert session.error is None
+
+    bars = ClosedBars()
+    closed = bars.add(session.drain()) + bars.flush()
+    assert len(closed) == 30
+    assert session.stats()['ticks'] == 30 * TICKS_PER_BAR
+    assert {'RSI', 'MACD', 'buy_score', 'recommendation'} <= set(closed[-1])
@@ -0,0 +1,104 @@
+import time
+
+import pandas as pd
+import pytest
+
+import news_store
+from news_store import NEAR_DUPLICATE_DISTANCE, NewsStore, StoredNewsScraper, normalize_url
+
+
+def _iso(ts):
+    return pd.Timestamp(ts, unit='s', tz='UTC').strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _articles(titles, urls=None, published=None, source='Mint'):
+    now = time.time()
+    return pd.DataFrame({
+        'title': titles,
+        'description': [''] * len(titles),
+        'published_at': published or [_iso(now - 3600)] * len(titles),
+        'source': [source] * len(titles),
+        'url': urls or [f"https://example.com/{i}" for i in range(len(titles))],
+    })
+
+
+@pytest.fixture
+def store(tmp_path):
+    return NewsStore(str(tmp_path / 'news.sqlite'))
+
+
+def test_normalize_url():
+    assert normalize_url('https://WWW.Example.com/markets/story/?utm_source=x&b=2&a=1&fbclid=y') == \
+        '//example.com/markets/story?a=1&b=2'
+    assert normalize_url('http://example.com/markets/story?a=1&b=2') == '//example.com/markets/story?a=1&b=2'
+    assert normalize_url(None) is None
+    assert normalize_url('') is None
+
+
+def test_urls_are_deduplicated_across_and_within_batches(store):
+    urls = ['https://www.example.com/a?utm_medium=rss', 'https://example.com/a/']
+    assert store.add_articles('ACME', _articles(['First take', 'Second take'], urls)) == 1
+    assert store.add_articles('ACME', _articles(['Third take'], ['https://example.com/a'])) == 0
+    # Another company may store the same link
+    assert store.add_articles('OTHER', _articles(['Third take'], ['https://example.com/a'])) == 1
+
+
+def test_syndicated_titles_are_near_duplicates(store):
+    store.add_articles('ACME', _articles(['Acme Q2 profit rises 12% on strong orders']))
+    copies = _articles(['ACME Q2 profit rises 12%, on strong orders - Mint'], ['https://other.com/x'])
+    assert store.add_articles('ACME', copies) == 0
+
+
+@pytest.mark.parametrize('distance, stored', [(NEAR_DUPLICATE_DISTANCE, 1), (NEAR_DUPLICATE_DISTANCE + 1, 2)])
+def test_near_duplicate_distance_boundary(store, monkeypatch, distance, stored):
+    base = 0x0123456789ABCDEF
+    fingerprints = {'Original': base, 'Copy': base ^ ((1 << distance) - 1)}
+    monkeypatch.setattr(news_store, 'title_simhash', lambda title, source=None: fingerprints[title])
+
+    store.add_articles('ACME', _articles(['Original']))
+    store.add_articles('ACME', _articles(['Copy'], ['https://example.com/copy']))
+    assert len(store.articles_since('ACME', 0)) == stored
+
+    # The same pair within one batch
+    store.add_articles('BATCH', _articles(['Original', 'Copy']))
+    assert len(store.articles_since('BATCH', 0)) == stored
+
+
+def test_undated_articles_fall_back_to_their_ingest_time(store):
+    store.add_articles('ACME', _articles(['Dated', 'Undated'], published=[_iso(time.time() - 30 * 86400), 'yesterday-ish']))
+    recent = store.articles_since('ACME', time.time() - 86400)
+    assert list(recent['title']) == ['Undated']
+
+
+def test_search_indexes_every_inserted_article(store):
+    if not store.has_fts:
+        pytest.skip("SQLite without FTS5")
+    store.add_articles('ACME', _articles(['Acme wins railway order', 'Acme plans buyback']))
+    store.add_articles('ACME', _articles(['Acme railway unit listing'], ['https://example.com/later']))
+    assert set(store.search('railway')['title']) == {'Acme wins railway order', 'Acme railway unit listing'}
+
+
+class _Scraper:
+    def __init__(self, newest_age_days):
+        self.newest_age_days = newest_age_days
+        self.days = []
+
+    def fetch_company_news(self, company, days=7):
+        self.days.append(days)
+        return _articles([f"{company} story {len(self.days)}"], [f"https://example.com/{len(self.days)}"],
+                         [_iso(time.time() - self.newest_age_days * 86400)])
+
+
+def test_refreshes_fetch_the_days_since_the_newest_article(store):
+    scraper = _Scraper(newest_age_days=2.5)
+    stored = StoredNewsScraper(scraper, store, refresh_interval=0)
+    stored.fetch_company_news('ACME', days=7)
+    news = stored.fetch_company_news('ACME', days=7)
+
+    assert scraper.days == [7, 3]
+    assert len(news) == 2
+
+    # Within the refresh interval nothing goes upstream
+    stored.refresh_interval = 900
+    stored.fetch_company_news('ACME', days=7)
+    assert scraper.days == [7, 3]
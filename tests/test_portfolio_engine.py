@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from matrix_indicators import stack_closes
+from portfolio_engine import _pairwise_covariance, _returns, value_portfolio
+from synthetic import TRADING_DAYS, make_ohlcv
+
+
+def _histories(late_start=100):
+    histories = {symbol: make_ohlcv(300, seed=seed) for seed, symbol in enumerate(['AAA', 'BBB', 'CCC'])}
+    # CCC only lists part-way through the window
+    histories['CCC'] = histories['CCC'].iloc[late_start:]
+    return histories
+
+
+def test_covariance_is_pairwise_complete():
+    histories = _histories()
+    holdings = pd.DataFrame({'symbol': ['AAA', 'BBB', 'CCC'], 'quantity': [10, 5, 20], 'avg_cost': [100, 100, 100]})
+    report = value_portfolio(holdings, histories)
+
+    closes = pd.DataFrame({symbol: frame['Close'] for symbol, frame in histories.items()})
+    expected = closes.pct_change(fill_method=None).cov() * TRADING_DAYS
+    np.testing.assert_allclose(report['covariance'].loc[expected.index, expected.columns], expected, rtol=1e-9)
+    assert np.isfinite(report['correlation'].to_numpy()).all()
+
+
+def test_late_listing_does_not_dilute_volatility():
+    holdings = pd.DataFrame({'symbol': ['AAA', 'CCC'], 'quantity': [1, 1], 'avg_cost': [100, 100]})
+    report = value_portfolio(holdings, _histories())
+    returns = _histories()['CCC']['Close'].pct_change().dropna()
+    volatility = report['positions'].set_index('Symbol')['Volatility']
+    assert np.isclose(volatility['CCC'], returns.std() * np.sqrt(TRADING_DAYS))
+    assert report['portfolio_returns'].notna().all()
+
+
+def _listed_from(returns, dates, start):
+    close = 100 * np.cumprod(1 + returns[start:])
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 1000},
+                        index=dates[start:])
+
+
+def test_ragged_histories_give_a_psd_covariance():
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range('2025-01-01', periods=300)
+    first, second, third = (rng.normal(0, 0.01, 100) for _ in range(3))
+    # BBB lists a third of the way in, CCC two thirds: each pair is measured over a different window
+    histories = {
+        'AAA': _listed_from(np.r_[first, 3 * second, third], dates, 0),
+        'BBB': _listed_from(np.r_[first, 3 * second, third], dates, 100),
+        'CCC': _listed_from(np.r_[first, second, -third], dates, 200),
+    }
+    holdings = pd.DataFrame({'symbol': ['AAA', 'BBB', 'CCC'], 'quantity': [1, -1, 1], 'avg_cost': [100, 100, 100]})
+    _, _, close = stack_closes(histories)
+    assert np.linalg.eigvalsh(_pairwise_covariance(_returns(close))).min() < 0
+
+    report = value_portfolio(holdings, histories)
+    assert np.linalg.eigvalsh(report['covariance'].to_numpy()).min() > -1e-12
+    assert np.isfinite(report['totals']['volatility'])
+    assert np.isfinite(report['positions']['Risk Share']).all()
+    assert (np.abs(report['correlation'].to_numpy()) <= 1 + 1e-9).all()
+    # Position volatility is still each symbol's own
+    volatility = report['positions'].set_index('Symbol')['Volatility']
+    for symbol, hist in histories.items():
+        assert np.isclose(volatility[symbol], hist['Close'].pct_change().std() * np.sqrt(TRADING_DAYS))
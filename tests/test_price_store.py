@@ -0,0 +1,116 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import price_store
+from price_store import MIN_REFRESH_DAYS, CachedStockDataFetcher
+
+
+class _Fetcher:
+    """Daily IST bars ending ``end_days_ago`` days ago; each close is ``base`` plus the day of year."""
+
+    def __init__(self, end_days_ago=0, base=100.0):
+        self.end_days_ago = end_days_ago
+        self.base = base
+        self.periods = []
+
+    def get_stock_data(self, symbol, period="1mo"):
+        self.periods.append(period)
+        days = int(period[:-1])
+        end = pd.Timestamp.now(tz='Asia/Kolkata').normalize() - pd.Timedelta(days=self.end_days_ago)
+        index = pd.date_range(end=end, periods=days, freq='D')
+        close = self.base + index.dayofyear.to_numpy(dtype=float)
+        bars = pd.DataFrame({'Close': close, 'Volume': 1000}, index=index)
+        return {'current_price': float(close[-1]), 'historical': bars}
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / 'prices')
+
+
+def test_fresh_covered_requests_are_served_from_disk(cache_dir):
+    fetcher = _Fetcher()
+    cached = CachedStockDataFetcher(fetcher, cache_dir)
+    first = cached.get_stock_data('AAA.NS', period='60d')
+    second = cached.get_stock_data('AAA.NS', period='30d')
+
+    assert fetcher.periods == ['60d']
+    assert cached.stats == {'hits': 1, 'incremental': 0, 'full': 1}
+    assert len(second['historical']) < len(first['historical'])
+    assert second['current_price'] == first['current_price']
+
+    # A longer lookback than is covered goes upstream in full
+    cached.get_stock_data('AAA.NS', period='90d')
+    assert fetcher.periods == ['60d', '90d']
+
+
+def test_stale_snapshots_fetch_only_the_missing_days(cache_dir):
+    fetcher = _Fetcher(end_days_ago=10)
+    cached = CachedStockDataFetcher(fetcher, cache_dir, snapshot_ttl=0)
+    cached.get_stock_data('AAA.NS', period='60d')
+    stored = cached.read_bars('AAA.NS')
+
+    fetcher.end_days_ago = 0
+    fetcher.base = 200.0
+    result = cached.get_stock_data('AAA.NS', period='60d')
+    merged = cached.read_bars('AAA.NS')
+
+    assert fetcher.periods == ['60d', '11d']
+    assert cached.stats['incremental'] == 1
+    assert merged.index.is_unique and merged.index.is_monotonic_increasing
+    assert len(merged) == len(stored) + 10
+    # Days before the refresh keep their stored bars; re-fetched days take the new ones
+    pd.testing.assert_frame_equal(merged.loc[:stored.index[-2]], stored.loc[:stored.index[-2]], check_freq=False)
+    assert merged.loc[stored.index[-1], 'Close'] == stored['Close'].iloc[-1] + 100
+    assert merged['Close'].iloc[-1] == result['current_price']
+
+
+def test_refreshes_fetch_at_least_min_refresh_days(cache_dir):
+    fetcher = _Fetcher()
+    cached = CachedStockDataFetcher(fetcher, cache_dir, snapshot_ttl=0)
+    cached.get_stock_data('AAA.NS', period='60d')
+    cached.get_stock_data('AAA.NS', period='60d')
+    assert fetcher.periods == ['60d', f"{MIN_REFRESH_DAYS}d"]
+
+
+def test_snapshot_ttl(cache_dir, monkeypatch):
+    fetcher = _Fetcher()
+    cached = CachedStockDataFetcher(fetcher, cache_dir, snapshot_ttl=300)
+    cached.get_stock_data('AAA.NS', period='60d')
+    now = price_store.time.time()
+    monkeypatch.setattr(price_store.time, 'time', lambda: now + 299)
+    cached.get_stock_data('AAA.NS', period='60d')
+    assert len(fetcher.periods) == 1
+    monkeypatch.setattr(price_store.time, 'time', lambda: now + 301)
+    cached.get_stock_data('AAA.NS', period='60d')
+    assert len(fetcher.periods) == 2
+
+
+def test_bars_fall_back_to_pickle_without_a_parquet_engine(cache_dir, monkeypatch):
+    def no_engine(*args, **kwargs):
+        raise ImportError("no parquet engine")
+
+    monkeypatch.setattr(pd.DataFrame, 'to_parquet', no_engine)
+    cached = CachedStockDataFetcher(_Fetcher(), cache_dir)
+    bars = cached.get_stock_data('AAA.NS', period='60d')['historical']
+
+    assert sorted(os.listdir(cache_dir)) == ['AAA.NS.json', 'AAA.NS.pkl']
+    # A new process reads the pickle back
+    reloaded = CachedStockDataFetcher(_Fetcher(), cache_dir).read_bars('AAA.NS')
+    pd.testing.assert_frame_equal(reloaded.iloc[-len(bars):], bars, check_freq=False)
+
+
+def test_served_windows_are_not_changed_by_later_merges(cache_dir):
+    fetcher = _Fetcher()
+    cached = CachedStockDataFetcher(fetcher, cache_dir, snapshot_ttl=0)
+    served = cached.get_stock_data('AAA.NS', period='60d')['historical']
+    before = served.copy()
+
+    fetcher.base = 500.0
+    cached.get_stock_data('AAA.NS', period='60d')
+
+    assert cached.read_bars('AAA.NS')['Close'].iloc[-1] != before['Close'].iloc[-1]
+    pd.testing.assert_frame_equal(served, before)
@@ -0,0 +1,91 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from result_cache import ResultCache, estimate_size
+
+
+class _Counter:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            calls = self.calls
+        time.sleep(self.delay)
+        return {'calls': calls, 'frame': pd.DataFrame({'x': [1.0, 2.0]})}
+
+
+def test_fresh_then_stale_then_expired():
+    cache = ResultCache(ttl=0.05, max_stale=0.3)
+    compute = _Counter()
+    assert cache.get_or_compute('k', compute)[1] == 'miss'
+    assert cache.get_or_compute('k', compute)[1] == 'fresh'
+    assert compute.calls == 1
+
+    time.sleep(0.08)
+    value, status = cache.get_or_compute('k', compute)
+    assert (status, value['calls']) == ('stale', 1)
+    # The background refresh replaces the entry
+    for _ in range(100):
+        value, status = cache.get_or_compute('k', compute)
+        if status == 'fresh':
+            break
+        time.sleep(0.01)
+    assert (status, value['calls']) == ('fresh', 2)
+    assert cache.info()['refreshes'] == 1
+
+    time.sleep(0.35)
+    value, status = cache.get_or_compute('k', compute)
+    assert (status, value['calls']) == ('miss', 3)
+
+
+def test_concurrent_misses_compute_once():
+    cache = ResultCache()
+    compute = _Counter(delay=0.1)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute('k', compute)))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert compute.calls == 1
+    assert {status for _, status in results} == {'miss'}
+
+
+def test_least_recently_used_entries_are_evicted():
+    entry_size = estimate_size(np.zeros(1000))
+    cache = ResultCache(max_bytes=int(entry_size * 2.5))
+    for key in ['a', 'b']:
+        cache.get_or_compute(key, lambda: np.zeros(1000))
+    cache.get_or_compute('a', lambda: np.zeros(1000))
+    cache.get_or_compute('c', lambda: np.zeros(1000))
+
+    info = cache.info()
+    assert (info['entries'], info['evictions']) == (2, 1)
+    assert info['bytes'] <= cache.max_bytes
+    # 'a' was used after 'b', so 'b' went first
+    assert cache.get_or_compute('a', lambda: np.zeros(1000))[1] == 'fresh'
+    assert cache.get_or_compute('b', lambda: np.zeros(1000))[1] == 'miss'
+
+
+def test_sessions_get_independent_copies():
+    cache = ResultCache()
+    compute = _Counter()
+    first, _ = cache.get_or_compute('k', compute)
+    first['calls'] = 99
+    first['frame'].loc[0, 'x'] = -1.0
+    second, _ = cache.get_or_compute('k', compute)
+    assert second['calls'] == 1
+    assert second['frame'].loc[0, 'x'] == 1.0
+
+
+def test_shared_objects_are_sized_once():
+    frame = pd.DataFrame({'x': np.arange(1000.0)})
+    assert estimate_size({'hist': frame, 'stock_data': {'historical': frame}}) < 2 * estimate_size(frame)
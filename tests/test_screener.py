@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from matrix_indicators import compute_indicators, latest
+from indicator_state import HISTORY_BARS, history_days
+from screener import ScreenerIndex
+from synthetic import make_ohlcv
+
+
+class _Fetcher:
+    def __init__(self, histories):
+        self.histories = histories
+        self.periods = []
+
+    def get_stock_data(self, symbol, period):
+        self.periods.append(period)
+        return {'historical': self.histories[symbol], 'day_change': 0.5}
+
+
+class _Scraper:
+    def fetch_company_news(self, company, days):
+        return pd.DataFrame()
+
+
+def test_history_days_covers_the_bars():
+    # Weekdays alone must exceed the bars, leaving the rest for holidays
+    assert history_days() * 5 / 7 > HISTORY_BARS
+
+
+def test_refresh_matches_each_symbol_alone(tmp_path):
+    a = make_ohlcv(200, seed=1)
+    # Trades a different calendar: every third bar of A's is missing
+    b = make_ohlcv(200, seed=2).iloc[::3]
+    b = b.set_axis(b.index + pd.Timedelta(hours=6))
+    histories = {'AAA': a, 'BBB': b}
+    fetcher = _Fetcher(histories)
+
+    index = ScreenerIndex(str(tmp_path / 'screener.sqlite'))
+    assert index.refresh({'stock_fetcher': fetcher, 'news_scraper': _Scraper(), 'sentiment_analyzer': None},
+                         [('A Ltd', 'AAA'), ('B Ltd', 'BBB')]) == 2
+    assert set(fetcher.periods) == {f"{history_days()}d"}
+
+    rows = index.query(order_by='symbol', descending=False).set_index('symbol')
+    for symbol, hist in histories.items():
+        alone = {name: latest(values)[0] for name, values in compute_indicators(hist['Close'].to_numpy()).items()}
+        for column, name in [('rsi', 'RSI'), ('macd', 'MACD'), ('signal', 'Signal'), ('ma20', 'MA20'), ('ma50', 'MA50')]:
+            assert np.isclose(rows.loc[symbol, column], alone[name]), (symbol, column)
+    # No predictor, no model confidence
+    assert rows['confidence'].isna().all()
+
+
+class _SentimentFirstModel:
+    def predict_proba(self, features):
+        return np.column_stack([1 - features[:, 0], features[:, 0]])
+
+
+class _Predictor:
+    model = _SentimentFirstModel()
+    feature_names = ['pe_ratio', 'sentiment']
+
+
+def test_refresh_stores_the_model_confidence(tmp_path):
+    histories = {'AAA': make_ohlcv(200, seed=1), 'BBB': make_ohlcv(200, seed=2)}
+    fetcher = _Fetcher(histories)
+    fetcher.get_stock_data = lambda symbol, period: {'historical': histories[symbol], 'day_change': 0.5,
+                                                     'pe_ratio': {'AAA': 0.25, 'BBB': 0.75}[symbol]}
+    index = ScreenerIndex(str(tmp_path / 'screener.sqlite'))
+    index.refresh({'stock_fetcher': fetcher, 'news_scraper': _Scraper(), 'sentiment_analyzer': None,
+                   'predictor': _Predictor()}, [('A Ltd', 'AAA'), ('B Ltd', 'BBB')])
+
+    rows = index.query([('confidence', '>', 0.5)])
+    assert list(rows['symbol']) == ['BBB']
+    assert rows['confidence'].iloc[0] == 0.75
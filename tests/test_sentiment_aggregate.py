@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from sentiment_aggregate import SentimentAggregator
+
+
+def _news(days, start='2026-01-01', score=0.5):
+    published = pd.Timestamp(start, tz='UTC') + pd.to_timedelta(np.arange(days), unit='D') + pd.Timedelta(hours=9)
+    return pd.DataFrame({
+        'title': [f"Story {i}" for i in range(days)],
+        'description': [''] * days,
+        'published_at': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'source': ['Reuters'] * days,
+        'vader_compound': [score] * days,
+    })
+
+
+def test_window_matches_brute_force_decay():
+    aggregator = SentimentAggregator(half_life_days=3)
+    news = _news(10).assign(vader_compound=np.linspace(-1, 1, 10), source=['Reuters', 'Mint'] * 5)
+    assert aggregator.add('ACME', news) == 10
+    assert aggregator.add('ACME', news) == 0
+
+    as_of = pd.Timestamp('2026-01-10')
+    published = pd.to_datetime(news['published_at'])
+    age = (as_of.tz_localize('UTC') - published).dt.total_seconds() / 86400
+    weights = news['source'].map({'Reuters': 1.5, 'Mint': 1.0}) * np.exp(-np.log(2) / 3 * age)
+    window = aggregator.window('ACME', 5, as_of=as_of)
+    recent = published >= pd.Timestamp('2026-01-06', tz='UTC')
+    expected = (weights * news['vader_compound'])[recent].sum() / weights[recent].sum()
+    assert window['article_count'] == 5
+    assert np.isclose(window['avg_compound'], expected)
+
+
+def test_seen_keys_are_pruned_with_their_buckets():
+    aggregator = SentimentAggregator(half_life_days=30, retention_days=10)
+    old = _news(5, start='2026-01-01')
+    aggregator.add('ACME', old)
+    aggregator.add('ACME', _news(5, start='2026-03-01').assign(title=lambda df: 'New ' + df['title']))
+    state = aggregator._companies['ACME']
+    assert len(state.seen) == 5
+    assert set(state.day_keys) == set(state.buckets)
+    assert aggregator.stats()['articles'] == 5
+    # Articles older than the retained span are not taken in again
+    assert aggregator.add('ACME', old) == 0
+    assert len(state.seen) == 5
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+from sentiment_cache import CachedSentimentAnalyzer, article_key
+
+
+class _Analyzer:
+    def __init__(self):
+        self.scored = []
+
+    def analyze_dataframe(self, news_df):
+        self.scored.extend(news_df['title'])
+        scores = [0.5 if 'up' in title else -0.5 for title in news_df['title']]
+        return news_df.assign(vader_compound=scores,
+                              sentiment_class=['Positive' if s > 0 else 'Negative' for s in scores])
+
+
+def _news(titles, **columns):
+    return pd.DataFrame({'title': titles, 'description': [''] * len(titles),
+                         'source': ['Mint'] * len(titles), **columns})
+
+
+@pytest.fixture
+def cache(tmp_path):
+    analyzer = _Analyzer()
+    return CachedSentimentAnalyzer(analyzer, path=str(tmp_path / 'sentiment.sqlite')), analyzer
+
+
+def test_articles_are_scored_once(cache):
+    cached, analyzer = cache
+    cached.analyze_dataframe(_news(['Shares up', 'Profit down']))
+    result = cached.analyze_dataframe(_news(['profit  DOWN', 'Orders up']))
+    assert analyzer.scored == ['Shares up', 'Profit down', 'Orders up']
+    assert list(result['vader_compound']) == [-0.5, 0.5]
+    assert cached.cache_stats()['entries'] == 3
+
+
+def test_frames_that_already_carry_scores_are_rescored_and_cached(cache):
+    cached, analyzer = cache
+    # A round-tripped frame: stale scores and an unrelated caller column
+    stale = _news(['Shares up', 'Profit down'], vader_compound=[0.0, 0.0], sentiment_class=['Neutral'] * 2,
+                  _symbol=['AAA', 'BBB'])
+    result = cached.analyze_dataframe(stale)
+    assert list(result['vader_compound']) == [0.5, -0.5]
+    assert list(result['_symbol']) == ['AAA', 'BBB']
+
+    again = cached.analyze_dataframe(_news(['Shares up', 'Profit down']))
+    assert analyzer.scored == ['Shares up', 'Profit down']
+    assert list(again['vader_compound']) == [0.5, -0.5]
+    assert list(again['sentiment_class']) == ['Positive', 'Negative']
+    assert '_symbol' not in again.columns
+
+
+def test_empty_stored_payloads_are_misses(cache):
+    cached, analyzer = cache
+    cached.scores.put_many({article_key('Shares up', ''): {}})
+    result = cached.analyze_dataframe(_news(['Shares up']))
+    assert analyzer.scored == ['Shares up']
+    assert list(result['vader_compound']) == [0.5]
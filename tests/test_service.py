@@ -0,0 +1,73 @@
+import http.client
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import service
+
+
+class _FakeEngine:
+    def __init__(self):
+        self.calls = []
+
+    def recommend(self, symbol, company=None, days=service.DEFAULT_DAYS):
+        self.calls.append((symbol, company, days))
+        return {'symbol': symbol, 'days': days, 'found': True}
+
+
+@pytest.fixture
+def server():
+    engine = _FakeEngine()
+    handler = type('Handler', (service._Handler,), {'engine': engine})
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address[1], engine
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _get(port, path):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    connection.request('GET', path)
+    response = connection.getresponse()
+    body = json.loads(response.read())
+    connection.close()
+    return response.status, body
+
+
+@pytest.mark.parametrize('value, expected', [('1', 1), ('30', 30), (7, 7)])
+def test_parse_days_accepts_the_slider_range(value, expected):
+    assert service.parse_days(value) == expected
+
+
+@pytest.mark.parametrize('value', ['0', '31', '-5', '100000', 'abc', '7.5', None])
+def test_parse_days_rejects_values_outside_the_slider_range(value):
+    with pytest.raises(ValueError):
+        service.parse_days(value)
+
+
+def test_recommend_passes_validated_days(server):
+    port, engine = server
+    status, body = _get(port, '/recommend?symbol=tcs.ns&days=14')
+    assert status == 200
+    assert body['days'] == 14
+    assert engine.calls == [('tcs.ns', None, 14)]
+
+
+@pytest.mark.parametrize('query', ['days=7', 'symbol=TCS.NS&days=0', 'symbol=TCS.NS&days=31',
+                                   'symbol=TCS.NS&days=abc'])
+def test_recommend_rejects_bad_input_without_calling_the_engine(server, query):
+    port, engine = server
+    status, body = _get(port, f'/recommend?{query}')
+    assert status == 400
+    assert 'error' in body
+    assert engine.calls == []
+
+
+def test_unknown_path_is_404(server):
+    port, _ = server
+    status, _ = _get(port, '/nope')
+    assert status == 404
@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pandas as pd
+
+import shared_store
+from sentiment_cache import CachedSentimentAnalyzer, SharedScores
+from shared_store import SharedStore, SQLiteBackend, share
+
+
+class _Analyzer:
+    def __init__(self):
+        self.scored = []
+
+    def analyze_dataframe(self, news_df):
+        self.scored.extend(news_df['title'])
+        return news_df.assign(vader_compound=[len(title) / 100 for title in news_df['title']])
+
+
+class _Scraper:
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_company_news(self, company, days=7):
+        self.calls += 1
+        time.sleep(0.05)
+        return pd.DataFrame()
+
+
+def _store(tmp_path):
+    return SharedStore(SQLiteBackend(str(tmp_path / 'shared.sqlite')))
+
+
+def _news(titles):
+    return pd.DataFrame({'title': titles, 'description': [''] * len(titles)})
+
+
+def test_sentiment_is_shared_per_article(tmp_path):
+    analyzer = _Analyzer()
+    store = _store(tmp_path)
+    # Two workers, one score layer: the shared store
+    first_worker, second_worker = (CachedSentimentAnalyzer(analyzer, scores=SharedScores(store, 60))
+                                   for _ in range(2))
+
+    first = first_worker.analyze_dataframe(_news(['Alpha rises', 'Beta falls']))
+    # Another lookback: one known article, one new, in a different order
+    second = second_worker.analyze_dataframe(_news(['Gamma flat', 'alpha  RISES']))
+
+    assert analyzer.scored == ['Alpha rises', 'Beta falls', 'Gamma flat']
+    assert second_worker.cache_stats()['entries'] == 3
+    assert store.backend.info('articles')['entries'] == 0
+    assert list(first['vader_compound']) == [0.11, 0.10]
+    assert list(second['vader_compound']) == [0.10, 0.11]
+    assert list(second['title']) == ['Gamma flat', 'alpha  RISES']
+
+
+def test_empty_results_are_handed_off_then_expire(tmp_path, monkeypatch):
+    scraper = _Scraper()
+    shared = share(scraper, _store(tmp_path), 'articles', {'fetch_company_news': 900})
+
+    threads = [threading.Thread(target=shared.fetch_company_news, args=('ACME',)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert shared.fetch_company_news('ACME').empty
+    assert scraper.calls == 1
+
+    monkeypatch.setattr(shared_store, 'HANDOFF_TTL_SECONDS', 0)
+    shared.fetch_company_news('OTHER')
+    shared.fetch_company_news('OTHER')
+    assert scraper.calls == 3
@@ -1,19 +1,11 @@
 import streamlit as st
 import sys
 import os
-import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.scrapers.news_scraper import NewsScraper
-from src.scrapers.stock_data_fetcher import StockDataFetcher
-from src.analysis.sentiment_analyzer import SentimentAnalyzer
-from src.analysis.technical_indicators import TechnicalIndicators
-from src.models.predictor import StockPredictor
+from warmup import prewarm
 
 # Page config
 st.set_page_config(
@@ -23,6 +15,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Load the sentiment lexicon, predictor and heavy libraries in the background
+prewarm()
+
 # ========== GLOBAL CUSTOM CSS ==========
 st.markdown("""
 <style>
@@ -222,10 +217,13 @@ with st.sidebar:
     # Page selection
     page = st.radio(
         "Go to",
-        ["📊 Analysis", "📁 Portfolio", "🏠 Home"],
+        ["📊 Analysis", "🔎 Screener", "⚡ Live", "📁 Portfolio", "🏠 Home"],
         index=0,
-        label_visibility="collapsed"
+        label_visibility="collapsed",
+        key="page"
     )
+    debug = st.checkbox("🐞 Debug panel", key="debug_input",
+                        help="Show span timings of the last run and export metrics")
     
     st.markdown("---")
     st.markdown("### About")
@@ -244,17 +242,29 @@ with st.sidebar:
 
 # ========== PAGE ROUTING ==========
 if page == "📊 Analysis":
-    # Initialize components for analysis
+    # Heavy modules are imported per page so Home and Portfolio don't load them
+    import pandas as pd
+    import plotly.graph_objects as go
+    from chart_data import get_chart_figures
+    from compact import format_published
+    from components import get_components
+    from instrumentation import tracer
+    from pipeline import analyze_symbol
+    from result_cache import DEFAULT_MAX_BYTES, DEFAULT_TTL_SECONDS, ResultCache
+    from batch_analysis import DEFAULT_MAX_WORKERS, parse_watchlist, results_table, run_batch
+    
     @st.cache_resource
-    def init_components():
-        return {
-            'news_scraper': NewsScraper(),
-            'stock_fetcher': StockDataFetcher(),
-            'sentiment_analyzer': SentimentAnalyzer(),
-            'predictor': StockPredictor()
-        }
+    def init_result_cache():
+        # Shared by every session in this process
+        cache = ResultCache(
+            ttl=float(os.getenv('ANALYSIS_CACHE_TTL', DEFAULT_TTL_SECONDS)),
+            max_bytes=int(os.getenv('ANALYSIS_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+        )
+        tracer.register_collector(lambda: {f"result_cache_{k}": v for k, v in cache.info().items()})
+        return cache
     
-    components = init_components()
+    components = get_components()
+    result_cache = init_result_cache()
     
     # Analysis section header
     st.markdown("""
@@ -265,87 +275,66 @@ if page == "📊 Analysis":
     
     # Input parameters in expander
     with st.expander("🔍 Input Parameters", expanded=True):
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            company = st.text_input("Company Name", "Reliance Industries", key="company_input")
-        with col2:
-            symbol = st.text_input("Stock Symbol", "RELIANCE.NS", key="symbol_input").upper()
-        with col3:
-            days = st.slider("News Lookback Days", 1, 30, 7, key="days_input")
+        mode = st.radio("Mode", ["Single Stock", "Watchlist Batch"], horizontal=True, key="mode_input")
+        analyze_btn = False
+        batch_btn = False
         
-        analyze_btn = st.button("🚀 Analyze Stock", type="primary", use_container_width=True)
+        if mode == "Single Stock":
+            # Defaults live in session state so Screener drill-downs can overwrite them
+            st.session_state.setdefault('company_input', "Reliance Industries")
+            st.session_state.setdefault('symbol_input', "RELIANCE.NS")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                company = st.text_input("Company Name", key="company_input")
+            with col2:
+                symbol = st.text_input("Stock Symbol", key="symbol_input").upper()
+            with col3:
+                days = st.slider("News Lookback Days", 1, 30, 7, key="days_input")
+            
+            analyze_btn = st.button("🚀 Analyze Stock", type="primary", use_container_width=True)
+            # Drill-downs from the Screener arrive with the inputs filled in
+            analyze_btn = analyze_btn or st.session_state.pop('run_analysis', False)
+        else:
+            watchlist_text = st.text_area(
+                "Watchlist (one `Company, SYMBOL` per line)",
+                "Reliance Industries, RELIANCE.NS\nTata Consultancy Services, TCS.NS\nInfosys, INFY.NS",
+                height=150,
+                key="watchlist_input"
+            )
+            col1, col2 = st.columns(2)
+            with col1:
+                days = st.slider("News Lookback Days", 1, 30, 7, key="batch_days_input")
+            with col2:
+                max_workers = st.slider("Parallel Fetches", 1, 32, DEFAULT_MAX_WORKERS, key="workers_input")
+            
+            batch_btn = st.button("🚀 Analyze Watchlist", type="primary", use_container_width=True)
     
     # Main analysis content
     if analyze_btn:
-        with st.spinner("Fetching data and analyzing..."):
-            # Fetch news
-            news_df = components['news_scraper'].fetch_company_news(company, days)
+        # The trace stays open until the tabs are rendered, so their chart spans land in it
+        with tracer.trace(f"analysis {symbol}"):
+            with st.spinner("Fetching data and analyzing..."):
+                result, cache_status = result_cache.get_or_compute(
+                    (symbol, company, days),
+                    lambda: analyze_symbol(components, company, symbol, days)
+                )
+            if cache_status == 'stale':
+                st.caption("♻️ Showing a cached result while a fresh one is computed in the background.")
+            news_df = result['news_df']
+            sentiment_summary = result['sentiment_summary']
+            stock_data = result['stock_data']
             
             # Mock data if no news
-            if news_df.empty:
+            if result['used_mock_news']:
                 st.warning("⚠️ No real news found. Using mock data for demonstration.")
-                mock_news = []
-                sources = ['Economic Times', 'Moneycontrol', 'Bloomberg', 'Reuters']
-                headlines = [
-                    f"{company} reports strong quarterly results",
-                    f"{company} launches new product line",
-                    f"Market analysts positive on {company} growth",
-                    f"{company} faces regulatory hurdles",
-                    f"{company} announces expansion plans"
-                ]
-                for i in range(min(5, days)):
-                    mock_news.append({
-                        'title': headlines[i % len(headlines)],
-                        'description': f"Mock description for {company}",
-                        'published_at': (datetime.now() - timedelta(days=i)).isoformat(),
-                        'source': sources[i % len(sources)],
-                        'url': 'https://example.com'
-                    })
-                news_df = pd.DataFrame(mock_news)
-            
-            # Sentiment analysis
-            news_df = components['sentiment_analyzer'].analyze_dataframe(news_df)
-            sentiment_summary = components['sentiment_analyzer'].get_average_sentiment(news_df)
-            
-            # Fetch stock data
-            stock_data = components['stock_fetcher'].get_stock_data(symbol, period=f"{max(days, 30)}d")
             
             if not stock_data:
                 st.error(f"❌ Could not fetch stock data for symbol {symbol}. Please check the symbol.")
             else:
-                # Add technical indicators
-                hist = stock_data['historical'].copy()
-                if not hist.empty:
-                    hist = TechnicalIndicators.add_all_indicators(hist)
-                    stock_data['historical'] = hist
-                
-                # Prepare features for prediction
-                features = components['predictor'].prepare_features(news_df, stock_data)
-                
-                # Simple rule-based recommendation
-                avg_sentiment = sentiment_summary['avg_compound']
-                day_change = stock_data['day_change']
-                
-                buy_score = 0.5
-                if avg_sentiment > 0.1:
-                    buy_score += 0.2
-                elif avg_sentiment < -0.1:
-                    buy_score -= 0.2
-                
-                if day_change < -2:
-                    buy_score += 0.1
-                elif day_change > 5:
-                    buy_score -= 0.1
-                
-                if not hist.empty and 'RSI' in hist.columns:
-                    latest_rsi = hist['RSI'].iloc[-1]
-                    if latest_rsi < 30:
-                        buy_score += 0.15
-                    elif latest_rsi > 70:
-                        buy_score -= 0.15
-                
-                buy_score = max(0, min(1, buy_score))
-                recommendation = "BUY" if buy_score > 0.6 else "DON'T BUY" if buy_score < 0.4 else "HOLD"
+                hist = result['hist']
+                features = result['features']
+                buy_score = result['buy_score']
+                recommendation = result['recommendation']
                 
                 # Display metrics in cards
                 st.markdown("### 📊 Key Metrics")
@@ -407,6 +396,14 @@ if page == "📊 Analysis":
                     st.subheader(f"Recent News about {company}")
                     st.write(f"Total articles analyzed: {len(news_df)}")
                     
+                    cache_stats = components['sentiment_analyzer'].cache_stats()
+                    throughput = cache_stats['articles_per_sec']
+                    st.caption(
+                        f"Sentiment cache: {cache_stats['hit_rate']*100:.1f}% hit rate · "
+                        f"{cache_stats['entries']:,} stored scores · "
+                        + (f"{throughput:,.0f} articles/sec scoring" if throughput else "no articles scored yet")
+                    )
+                    
                     # Sentiment pie chart
                     fig = go.Figure(data=[go.Pie(
                         labels=['Positive', 'Negative', 'Neutral'],
@@ -418,13 +415,34 @@ if page == "📊 Analysis":
                     )])
                     fig.update_layout(title="Sentiment Distribution", height=400)
                     st.plotly_chart(fig, use_container_width=True)
-                    
+
+                    # Time-decayed, source-weighted sentiment over the lookback
+                    aggregator = components.get('sentiment_aggregator')
+                    if aggregator is not None:
+                        decayed = aggregator.window(company, days)
+                        if decayed['article_count']:
+                            st.caption(
+                                f"Time-decayed sentiment ({aggregator.half_life_days:g}-day half-life, source-weighted): "
+                                f"{decayed['avg_compound']:.2f} over {decayed['article_count']} articles"
+                            )
+                    sentiment_series = result.get('sentiment_series')
+                    if sentiment_series is not None and sentiment_series.notna().any():
+                        fig = go.Figure(go.Scatter(x=sentiment_series.index, y=sentiment_series,
+                                                   mode='lines+markers', name='Decayed sentiment',
+                                                   connectgaps=False, line=dict(color='purple')))
+                        fig.add_hline(y=0, line_dash="dash", line_color="gray")
+                        fig.update_layout(title="Decayed Sentiment by Trading Day", height=300,
+                                          yaxis=dict(range=[-1, 1]))
+                        st.plotly_chart(fig, use_container_width=True)
+
                     # News table
                     if not news_df.empty:
                         display_cols = ['published_at', 'source', 'title', 'sentiment_class', 'vader_compound']
-                        display_df = news_df[display_cols].copy()
+                        display_df = news_df[display_cols]
                         display_df.columns = ['Date', 'Source', 'Title', 'Sentiment', 'Score']
                         display_df = display_df.sort_values('Date', ascending=False).head(10)
+                        # Sorted on the stored timestamps, shown as the text the feed gave
+                        display_df = display_df.assign(Date=format_published(display_df['Date']))
                         
                         def color_sentiment(val):
                             if val == 'Positive':
@@ -441,36 +459,9 @@ if page == "📊 Analysis":
                     st.subheader(f"{symbol} Stock Price - Last {days} Days")
                     
                     if not hist.empty:
-                        fig = make_subplots(rows=2, cols=1, shared_xaxes=True, 
-                                           vertical_spacing=0.03, row_heights=[0.7, 0.3])
-                        
-                        fig.add_trace(go.Candlestick(
-                            x=hist.index.strftime('%Y-%m-%d'),
-                            open=hist['Open'],
-                            high=hist['High'],
-                            low=hist['Low'],
-                            close=hist['Close'],
-                            name="Price",
-                            increasing_line_color='green',
-                            decreasing_line_color='red'
-                        ), row=1, col=1)
-                        
-                        fig.add_trace(go.Bar(
-                            x=hist.index.strftime('%Y-%m-%d'),
-                            y=hist['Volume'],
-                            name="Volume",
-                            marker_color='lightblue'
-                        ), row=2, col=1)
-                        
-                        fig.update_layout(
-                            title=f"{symbol} Stock Price",
-                            xaxis_title="Date",
-                            yaxis_title="Price (₹)",
-                            xaxis_rangeslider_visible=False,
-                            height=600
-                        )
-                        
-                        st.plotly_chart(fig, use_container_width=True)
+                        with tracer.span('charts'):
+                            figures = get_chart_figures(symbol, hist)
+                        st.plotly_chart(figures['price'], use_container_width=True)
                         
                         # Last price highlight
                         last_price = hist['Close'].iloc[-1]
@@ -483,46 +474,11 @@ if page == "📊 Analysis":
                     st.subheader("Technical Indicators")
                     
                     if not hist.empty:
-                        # RSI
-                        fig_rsi = go.Figure()
-                        fig_rsi.add_trace(go.Scatter(
-                            x=hist.index.strftime('%Y-%m-%d'), y=hist['RSI'],
-                            mode='lines', name='RSI', line=dict(color='purple')
-                        ))
-                        fig_rsi.add_hline(y=70, line_dash="dash", line_color="red", annotation_text="Overbought")
-                        fig_rsi.add_hline(y=30, line_dash="dash", line_color="green", annotation_text="Oversold")
-                        fig_rsi.update_layout(title="RSI", height=300)
-                        st.plotly_chart(fig_rsi, use_container_width=True)
-                        
-                        # MACD
-                        fig_macd = go.Figure()
-                        fig_macd.add_trace(go.Scatter(
-                            x=hist.index.strftime('%Y-%m-%d'), y=hist['MACD'],
-                            mode='lines', name='MACD', line=dict(color='blue')
-                        ))
-                        fig_macd.add_trace(go.Scatter(
-                            x=hist.index.strftime('%Y-%m-%d'), y=hist['Signal'],
-                            mode='lines', name='Signal', line=dict(color='red')
-                        ))
-                        fig_macd.update_layout(title="MACD", height=300)
-                        st.plotly_chart(fig_macd, use_container_width=True)
-                        
-                        # Moving Averages
-                        fig_ma = go.Figure()
-                        fig_ma.add_trace(go.Scatter(
-                            x=hist.index.strftime('%Y-%m-%d'), y=hist['Close'],
-                            mode='lines', name='Close', line=dict(color='black', width=2)
-                        ))
-                        fig_ma.add_trace(go.Scatter(
-                            x=hist.index.strftime('%Y-%m-%d'), y=hist['MA20'],
-                            mode='lines', name='MA20', line=dict(color='blue', dash='dash')
-                        ))
-                        fig_ma.add_trace(go.Scatter(
-                            x=hist.index.strftime('%Y-%m-%d'), y=hist['MA50'],
-                            mode='lines', name='MA50', line=dict(color='orange', dash='dash')
-                        ))
-                        fig_ma.update_layout(title="Moving Averages", height=300)
-                        st.plotly_chart(fig_ma, use_container_width=True)
+                        with tracer.span('charts'):
+                            figures = get_chart_figures(symbol, hist)
+                        st.plotly_chart(figures['rsi'], use_container_width=True)
+                        st.plotly_chart(figures['macd'], use_container_width=True)
+                        st.plotly_chart(figures['moving_averages'], use_container_width=True)
                     else:
                         st.warning("No historical data for technical indicators")
                 
@@ -551,9 +507,244 @@ if page == "📊 Analysis":
                     if recommendation == "BUY":
                         st.balloons()
     
+    elif batch_btn:
+        pairs = parse_watchlist(watchlist_text)
+        if not pairs:
+            st.warning("⚠️ Watchlist is empty. Add at least one `Company, SYMBOL` line.")
+        else:
+            with tracer.trace(f"watchlist of {len(pairs)}"):
+                with st.spinner(f"Analyzing {len(pairs)} stocks..."):
+                    results, timer, wall_seconds = run_batch(components, pairs, days, max_workers=max_workers)
+            
+                table = results_table(results)
+                failed = table['Error'].notna().sum()
+            
+                col1, col2, col3, col4 = st.columns(4)
+                col1.metric("Stocks Analyzed", len(table) - failed)
+                col2.metric("BUY Signals", int((table['Recommendation'] == "BUY").sum()))
+                col3.metric("Failed", int(failed))
+                col4.metric("Wall-clock", f"{wall_seconds:.2f}s")
+            
+                st.markdown("### 📋 Watchlist Results")
+                st.dataframe(table, use_container_width=True, hide_index=True)
+            
+                st.markdown("### ⏱️ Stage Timings")
+                st.caption("Fetch stages overlap on the thread pool, so their totals can exceed the wall-clock time.")
+                st.dataframe(timer.summary(), use_container_width=True, hide_index=True)
+    
     # If not analyzed yet
     else:
-        st.info("👆 Enter parameters and click **Analyze Stock** to get started.")
+        button_label = "Analyze Stock" if mode == "Single Stock" else "Analyze Watchlist"
+        st.info(f"👆 Enter parameters and click **{button_label}** to get started.")
+
+elif page == "🔎 Screener":
+    import pandas as pd
+    from screener import DEFAULT_SENTIMENT_DAYS, ScreenerIndex
+    
+    @st.cache_resource
+    def init_screener_index():
+        return ScreenerIndex()
+    
+    def open_in_analysis(company, symbol):
+        # Runs before the next script run, so the widgets pick these values up
+        st.session_state.page = "📊 Analysis"
+        st.session_state.mode_input = "Single Stock"
+        st.session_state.company_input = company
+        st.session_state.symbol_input = symbol
+        st.session_state.run_analysis = True
+    
+    screener_index = init_screener_index()
+    
+    st.markdown("""
+    <div class="fade-in">
+        <h2 style="color: #333; margin-bottom: 1.5rem;">🔎 Market Screener</h2>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    with st.expander("🔄 Refresh Index", expanded=len(screener_index) == 0):
+        universe_text = st.text_area(
+            "Universe (one `Company, SYMBOL` per line)",
+            "Reliance Industries, RELIANCE.NS\nTata Consultancy Services, TCS.NS\nInfosys, INFY.NS\n"
+            "HDFC Bank, HDFCBANK.NS\nICICI Bank, ICICIBANK.NS",
+            height=150,
+            key="universe_input"
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            max_age_minutes = st.slider("Skip symbols refreshed in the last (minutes)", 0, 1440, 60,
+                                        key="screener_max_age_input")
+        with col2:
+            refresh_btn = st.button("🔄 Refresh", use_container_width=True)
+        if refresh_btn:
+            from batch_analysis import parse_watchlist
+            from components import get_components
+            with st.spinner("Precomputing indicators and sentiment..."):
+                written = screener_index.refresh(get_components(), parse_watchlist(universe_text),
+                                                 max_age=max_age_minutes * 60 or None)
+            st.success(f"✅ Refreshed {written} symbols")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        max_rsi = st.slider("RSI below", 0, 100, 30, key="screener_rsi_input")
+    with col2:
+        min_sentiment = st.slider(f"{DEFAULT_SENTIMENT_DAYS}-day sentiment above", -1.0, 1.0, 0.0, 0.05,
+                                  key="screener_sentiment_input")
+    with col3:
+        above_ma50 = st.checkbox("Price above MA50", value=True, key="screener_ma50_input")
+    with col4:
+        recommendations = st.multiselect("Recommendation", ["BUY", "HOLD", "DON'T BUY"], key="screener_rec_input")
+    
+    filters = [('rsi', '<', max_rsi), ('sentiment', '>', min_sentiment)]
+    if above_ma50:
+        filters.append(('close', '>', 'ma50'))
+    matches = screener_index.query(filters)
+    if recommendations:
+        matches = matches[matches['recommendation'].isin(recommendations)]
+    
+    st.caption(f"{len(matches)} of {len(screener_index)} indexed symbols match")
+    if matches.empty:
+        st.info("No symbols match these filters")
+    else:
+        display_df = matches[['symbol', 'company', 'as_of', 'close', 'day_change', 'rsi', 'ma50',
+                              'sentiment', 'articles', 'buy_score', 'confidence', 'recommendation']].rename(columns={
+            'symbol': 'Symbol', 'company': 'Company', 'as_of': 'As Of', 'close': 'Close',
+            'day_change': 'Change %', 'rsi': 'RSI', 'ma50': 'MA50', 'sentiment': 'Sentiment',
+            'articles': 'Articles', 'buy_score': 'Buy Score', 'confidence': 'Model Confidence',
+            'recommendation': 'Recommendation'
+        })
+        if display_df['Model Confidence'].isna().all():
+            display_df = display_df.drop(columns='Model Confidence')
+        st.dataframe(display_df.round(2), use_container_width=True, hide_index=True)
+        
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            choice = st.selectbox("Drill down", range(len(matches)), key="screener_pick_input",
+                                  format_func=lambda i: f"{matches['symbol'].iloc[i]} · {matches['company'].iloc[i]}")
+        with col2:
+            st.button("📊 Open in Analysis", use_container_width=True, on_click=open_in_analysis,
+                      args=(matches['company'].iloc[choice], matches['symbol'].iloc[choice]))
+
+elif page == "⚡ Live":
+    import time
+    import pandas as pd
+    from components import get_components
+    from live_feed import ClosedBars, LiveSession, ReplayTickSource
+    
+    LIVE_HISTORY_BARS = 1000
+    LIVE_REFRESH_SECONDS = 0.25
+    # Charts are redrawn from the trimmed history this often; in between, closed bars are appended
+    LIVE_REDRAW_SECONDS = 30
+    
+    st.markdown("""
+    <div class="fade-in">
+        <h2 style="color: #333; margin-bottom: 1.5rem;">⚡ Live Intraday</h2>
+    </div>
+    """, unsafe_allow_html=True)
+    st.caption("Ticks are replayed from a local file (generated on first use) and folded into 1-minute bars; "
+               "indicators and the buy score update incrementally on every tick.")
+    
+    with st.expander("🔍 Feed Parameters", expanded=True):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            company = st.text_input("Company Name", "Reliance Industries", key="live_company_input")
+        with col2:
+            symbol = st.text_input("Stock Symbol", "RELIANCE.NS", key="live_symbol_input").upper()
+        with col3:
+            speed = st.select_slider("Replay Speed", [1, 10, 60, 300, 1000], value=60,
+                                     format_func=lambda v: f"{v}x", key="live_speed_input")
+        col1, col2 = st.columns(2)
+        with col1:
+            start_btn = st.button("▶️ Start Feed", type="primary", use_container_width=True)
+        with col2:
+            stop_btn = st.button("⏹️ Stop Feed", use_container_width=True)
+    
+    session = st.session_state.get('live_session')
+    if stop_btn and session is not None:
+        session.stop()
+    if start_btn:
+        if session is not None:
+            session.stop()
+        # Sentiment moves on a news timescale; score ticks against the stored articles of the last week
+        components = get_components()
+        articles = components['news_scraper'].store.articles_since(company, time.time() - 7 * 86400)
+        avg_sentiment = 0.0
+        if not articles.empty:
+            scored = components['sentiment_analyzer'].analyze_dataframe(articles)
+            avg_sentiment = components['sentiment_analyzer'].get_average_sentiment(scored)['avg_compound']
+        session = LiveSession(ReplayTickSource(symbol, speed=speed), avg_sentiment=avg_sentiment).start()
+        st.session_state.live_session = session
+        st.session_state.live_history = pd.DataFrame(columns=['Price', 'MA20', 'MA50', 'Buy Score'], dtype=float)
+        st.session_state.live_bars = ClosedBars()
+        st.session_state.live_latest = None
+        st.session_state.live_finished = False
+    
+    def show_latest(placeholder, latest):
+        if latest is None:
+            return
+        with placeholder.container():
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Price", f"₹{latest['current_price']:.2f}", f"{latest['day_change']:+.2f}%")
+            col2.metric("RSI", "N/A" if pd.isna(latest['RSI']) else f"{latest['RSI']:.1f}")
+            col3.metric("Buy Score", f"{latest['buy_score']*100:.1f}%")
+            col4.metric("Recommendation", latest['recommendation'])
+    
+    def show_stats(placeholder, session):
+        stats = session.stats()
+        latency = "n/a" if stats['latency_p50_ms'] is None else \
+            f"p50 {stats['latency_p50_ms']:.1f} ms, p95 {stats['latency_p95_ms']:.1f} ms"
+        placeholder.caption(f"{stats['ticks']:,} ticks, {stats['bars']:,} bars closed · "
+                            f"{stats['ticks_per_sec']:,.0f} ticks/s · tick→render {latency} · "
+                            f"{stats['dropped']:,} updates dropped")
+    
+    def live_panel(session):
+        # The stored history is drawn once per run; after that only newly closed bars are sent, with add_rows
+        history = st.session_state.live_history
+        latest_slot = st.empty()
+        show_latest(latest_slot, st.session_state.live_latest)
+        price_chart = st.line_chart(history[['Price', 'MA20', 'MA50']], height=300)
+        score_chart = st.line_chart(history[['Buy Score']], height=200)
+        stats_slot = st.empty()
+        redraw_at = time.monotonic() + LIVE_REDRAW_SECONDS
+        while True:
+            # One drain per pass; the open bar is carried to the next pass until a later bar closes it
+            running = session.running
+            updates = session.drain()
+            closed = st.session_state.live_bars.add(updates)
+            if not running:
+                # The feed thread has exited, so this drain held its last updates
+                closed += st.session_state.live_bars.flush()
+            if closed:
+                frame = pd.DataFrame(closed).rename(columns={'current_price': 'Price', 'buy_score': 'Buy Score'})
+                frame = frame.set_index('timestamp')[history.columns]
+                st.session_state.live_history = pd.concat([st.session_state.live_history, frame]).tail(LIVE_HISTORY_BARS)
+                price_chart.add_rows(frame[['Price', 'MA20', 'MA50']])
+                score_chart.add_rows(frame[['Buy Score']])
+            if updates:
+                st.session_state.live_latest = updates[-1]
+                show_latest(latest_slot, updates[-1])
+                session.record_render(updates)
+            show_stats(stats_slot, session)
+            
+            if not running:
+                if session.error is not None:
+                    st.error(f"❌ Feed stopped: {session.error}")
+                if not st.session_state.live_finished:
+                    # A full rerun clears the streaming notice
+                    st.session_state.live_finished = True
+                    st.rerun()
+                return
+            if time.monotonic() >= redraw_at:
+                # Appended rows are never trimmed in the browser; redraw from the bounded history
+                st.rerun(scope='fragment')
+            time.sleep(LIVE_REFRESH_SECONDS)
+    
+    if session is not None:
+        if session.running:
+            st.info(f"📡 Streaming {session.symbol}")
+        # While the feed runs, only this fragment loops; the rest of the page stays idle
+        st.fragment(live_panel)(session)
+    else:
+        st.info("👈 Start the feed to stream live updates")
 
 elif page == "📁 Portfolio":
     # Import and show portfolio page
@@ -565,6 +756,35 @@ elif page == "🏠 Home":
     from pages.home import show_home
     show_home()
 
+# ========== DEBUG PANEL ==========
+# Rendered after the page so it shows the run that just finished
+if debug:
+    import plotly.graph_objects as go
+    from instrumentation import tracer
+    
+    with st.sidebar:
+        st.markdown("---")
+        st.markdown("### 🐞 Last Run")
+        trace = tracer.last_trace()
+        if trace is None:
+            st.caption("No traced run yet")
+        else:
+            waterfall = tracer.waterfall(trace)
+            labels = [f"{'  ' * depth}{name}" for depth, name in zip(waterfall['Depth'], waterfall['Span'])]
+            fig = go.Figure(go.Bar(
+                y=labels, x=waterfall['Duration (ms)'], base=waterfall['Start (ms)'],
+                orientation='h', marker_color='steelblue',
+                hovertext=waterfall['Thread'], hovertemplate="%{y}: %{x:.1f} ms<br>%{hovertext}<extra></extra>"
+            ))
+            fig.update_layout(title=trace.name, xaxis_title="ms", height=120 + 22 * len(labels),
+                              margin=dict(l=10, r=10, t=40, b=10), yaxis=dict(autorange="reversed"))
+            st.plotly_chart(fig, use_container_width=True)
+            st.dataframe(waterfall, use_container_width=True, hide_index=True)
+            st.download_button("⬇️ Trace (JSON)", tracer.chrome_trace_json(trace), file_name="trace.json",
+                               mime="application/json", use_container_width=True)
+        st.download_button("⬇️ Metrics (Prometheus)", tracer.prometheus(), file_name="metrics.txt",
+                           mime="text/plain", use_container_width=True)
+
 # ========== FOOTER ==========
 st.markdown("""
 <div class="footer">
@@ -0,0 +1,178 @@
+"""Asyncio NewsAPI client with pooled connections and client-side rate limiting.
+
+``AsyncNewsScraper`` runs its own event loop on a background thread so one
+``aiohttp`` session (and its keep-alive connections) is shared by every call,
+including the blocking ``fetch_company_news`` used by the Streamlit page.
+Each upstream host gets a concurrency cap and a token bucket; 429/5xx
+responses and connection errors are retried with jittered exponential
+backoff. ``components.news_upstream`` puts it under the article store when
+aiohttp is installed, so batch and screener fetches share the pool.
+"""
+import asyncio
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+import aiohttp
+import pandas as pd
+
+NEWSAPI_URL = "https://newsapi.org/v2/everything"
+NEWS_COLUMNS = ['title', 'description', 'published_at', 'source', 'url']
+
+DEFAULT_CONCURRENCY = 4
+# NewsAPI allows short bursts; stay well under the per-key quota
+DEFAULT_RATE_PER_SEC = 2.0
+DEFAULT_BURST = 4
+DEFAULT_MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Allow ``rate`` acquisitions per second with bursts up to ``capacity``."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class _HostLimiter:
+    def __init__(self, concurrency, rate, burst):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.bucket = TokenBucket(rate, burst)
+
+
+class AsyncNewsScraper:
+    """Concurrent NewsAPI fetches; output matches ``NewsScraper.fetch_company_news``."""
+
+    def __init__(self, api_key=None, base_url=NEWSAPI_URL, concurrency=DEFAULT_CONCURRENCY,
+                 rate_per_sec=DEFAULT_RATE_PER_SEC, burst=DEFAULT_BURST,
+                 max_retries=DEFAULT_MAX_RETRIES, page_size=100, max_pages=1, timeout=15):
+        self.api_key = api_key or os.getenv('NEWS_API_KEY')
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self.max_retries = max_retries
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.stats = {'requests': 0, 'retries': 0, 'failures': 0}
+        self._limiters = {}
+        self._session = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='async-news', daemon=True)
+        self._thread.start()
+
+    # ----- blocking API -----
+
+    def fetch_company_news(self, company, days=7):
+        return self._run(self.afetch_company_news(company, days))
+
+    def fetch_many(self, companies, days=7):
+        """Fetch several companies at once; returns ``{company: news_df}``."""
+        return self._run(self.afetch_many(companies, days))
+
+    def close(self):
+        if self._session is not None:
+            self._run(self._session.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    # ----- async API -----
+
+    async def afetch_many(self, companies, days=7):
+        frames = await asyncio.gather(*(self.afetch_company_news(c, days) for c in companies))
+        return dict(zip(companies, frames))
+
+    async def afetch_company_news(self, company, days=7):
+        params = {
+            'q': company,
+            'from': (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d'),
+            'sortBy': 'publishedAt',
+            'language': 'en',
+            'pageSize': self.page_size,
+            'page': 1,
+            'apiKey': self.api_key or ''
+        }
+        first = await self._get_json(params)
+        if not first:
+            return pd.DataFrame(columns=NEWS_COLUMNS)
+        articles = list(first.get('articles', []))
+
+        total_pages = -(-first.get('totalResults', 0) // self.page_size)
+        pages = range(2, min(total_pages, self.max_pages) + 1)
+        for payload in await asyncio.gather(*(self._get_json(dict(params, page=p)) for p in pages)):
+            if payload:
+                articles.extend(payload.get('articles', []))
+        return _articles_frame(articles)
+
+    async def _get_json(self, params):
+        session = await self._get_session()
+        limiter = self._limiter_for(self.base_url)
+        for attempt in range(self.max_retries + 1):
+            async with limiter.semaphore:
+                await limiter.bucket.acquire()
+                self.stats['requests'] += 1
+                try:
+                    async with session.get(self.base_url, params=params) as response:
+                        if response.status == 200:
+                            return await response.json()
+                        if response.status not in RETRY_STATUSES:
+                            self.stats['failures'] += 1
+                            return None
+                        retry_after = response.headers.get('Retry-After')
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    retry_after = None
+            if attempt == self.max_retries:
+                break
+            self.stats['retries'] += 1
+            delay = BACKOFF_BASE_SECONDS * 2 ** attempt * random.uniform(0.5, 1.5)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            await asyncio.sleep(delay)
+        self.stats['failures'] += 1
+        return None
+
+    async def _get_session(self):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit_per_host=self.concurrency, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    def _limiter_for(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._limiters:
+            self._limiters[host] = _HostLimiter(self.concurrency, self.rate_per_sec, self.burst)
+        return self._limiters[host]
+
+
+def _articles_frame(articles):
+    rows = [{
+        'title': article.get('title'),
+        'description': article.get('description'),
+        'published_at': article.get('publishedAt'),
+        'source': (article.get('source') or {}).get('name'),
+        'url': article.get('url')
+    } for article in articles if article.get('title')]
+    return pd.DataFrame(rows, columns=NEWS_COLUMNS)
@@ -0,0 +1,227 @@
+"""Walk-forward backtest of the Analysis page's buy_score rules.
+
+Only the rule score is backtested, not ``StockPredictor``: its saved model
+was trained on the same history, so replaying it would need a retrain per
+walk-forward fold to be free of look-ahead.
+
+Prices are a ``(n_symbols, n_bars)`` close matrix on a shared date axis and
+news is a frame of scored articles (``symbol``, ``published_at``,
+``vader_compound``). Every quantity is computed for all symbols and days in
+one vectorized pass, but each value at bar ``t`` only uses data up to ``t``:
+
+* sentiment is the mean ``vader_compound`` of articles published in the
+  ``lookback_days`` calendar days up to bar ``t`` (an article published on a
+  non-trading day counts from the next bar). Days are exchange (IST) dates:
+  article times are converted from UTC and tz-aware bar dates from their own
+  zone before flooring, naive bar dates are taken as IST already;
+* ``day_change`` and RSI use closes up to ``t``;
+* a signal formed at the close of ``t`` is entered at the close of
+  ``t + execution_lag`` and held for ``horizon`` bars, so news published
+  after the close of ``t`` is already public when the position is opened.
+  Daily sentiment buckets do not record whether an article came before or
+  after the close, so ``execution_lag`` must be at least 1.
+
+The daily strategy holds the current BUY names equal-weighted; the benchmark
+holds every symbol equal-weighted.
+
+    python webapp/backtest.py --synthetic 500 --years 5
+    python webapp/backtest.py --watchlist watchlist.txt
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from matrix_indicators import compute_indicators, stack_closes
+from scoring import compute_buy_scores, get_recommendations
+from synthetic import TRADING_DAYS, make_close_matrix, make_news
+
+DEFAULT_LOOKBACK_DAYS = 7
+DEFAULT_HORIZON = 1
+DEFAULT_EXECUTION_LAG = 1
+EXCHANGE_TZ = 'Asia/Kolkata'
+
+
+def _exchange_days(dates):
+    index = pd.DatetimeIndex(dates)
+    if index.tz is not None:
+        index = index.tz_convert(EXCHANGE_TZ).tz_localize(None)
+    return index.normalize()
+
+
+def daily_sentiment(news_df, symbols, dates, lookback_days=DEFAULT_LOOKBACK_DAYS):
+    """``(n_symbols, n_bars)`` mean sentiment over the trailing calendar window (0 when no news)."""
+    n_symbols, n_bars = len(symbols), len(dates)
+    sums = np.zeros((n_symbols, n_bars))
+    counts = np.zeros((n_symbols, n_bars))
+    day_index = _exchange_days(dates)
+    if not news_df.empty:
+        published = pd.to_datetime(news_df['published_at'], utc=True, errors='coerce', format='mixed')
+        published = published.dt.tz_convert(EXCHANGE_TZ).dt.tz_localize(None).dt.normalize()
+        bar = np.searchsorted(day_index.values, published.values, side='left')
+        row = pd.Index(symbols).get_indexer(news_df['symbol'])
+        keep = (row >= 0) & (bar < n_bars) & published.notna().values
+        np.add.at(sums, (row[keep], bar[keep]), news_df['vader_compound'].to_numpy(dtype=float)[keep])
+        np.add.at(counts, (row[keep], bar[keep]), 1)
+
+    sums = np.cumsum(sums, axis=1)
+    counts = np.cumsum(counts, axis=1)
+    # Window (t - lookback_days, t]: subtract the running totals at the last bar before it
+    start = np.searchsorted(day_index.values, (day_index - pd.Timedelta(days=lookback_days)).values, side='right')
+    before = start - 1
+    window_sums = sums - np.where(before >= 0, sums[:, np.maximum(before, 0)], 0.0)
+    window_counts = counts - np.where(before >= 0, counts[:, np.maximum(before, 0)], 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(window_counts > 0, window_sums / window_counts, 0.0)
+
+
+def _forward_returns(close, lag, horizon):
+    out = np.full_like(close, np.nan)
+    entry = lag
+    exit_ = lag + horizon
+    if close.shape[1] > exit_:
+        out[:, :close.shape[1] - exit_] = close[:, exit_:] / close[:, entry:close.shape[1] - horizon] - 1
+    return out
+
+
+def _max_drawdown(equity):
+    peaks = np.maximum.accumulate(equity)
+    return float(np.min(equity / peaks - 1)) if len(equity) else 0.0
+
+
+def run_backtest(close, dates, symbols, news_df, lookback_days=DEFAULT_LOOKBACK_DAYS,
+                 horizon=DEFAULT_HORIZON, execution_lag=DEFAULT_EXECUTION_LAG):
+    if execution_lag < 1:
+        raise ValueError("execution_lag must be at least 1: same-day entries would trade on news "
+                         "published after the close")
+    close = np.asarray(close, dtype=float)
+    sentiment = daily_sentiment(news_df, symbols, dates, lookback_days)
+    day_change = np.full_like(close, np.nan)
+    day_change[:, 1:] = (close[:, 1:] / close[:, :-1] - 1) * 100
+    rsi = compute_indicators(close)['RSI']
+
+    scores = compute_buy_scores(sentiment, np.nan_to_num(day_change), rsi)
+    recommendations = get_recommendations(scores)
+    forward = _forward_returns(close, execution_lag, horizon)
+
+    rows = []
+    for label in ["BUY", "HOLD", "DON'T BUY"]:
+        mask = (recommendations == label) & ~np.isnan(forward)
+        returns = forward[mask]
+        hit = (returns > 0) if label != "DON'T BUY" else (returns < 0)
+        rows.append({
+            'Recommendation': label,
+            'Signals': int(mask.sum()),
+            'Hit Rate': float(hit.mean()) if returns.size else np.nan,
+            f'Mean {horizon}-bar Return': float(returns.mean()) if returns.size else np.nan,
+        })
+    summary = pd.DataFrame(rows)
+
+    # Daily rebalanced equity curves use one-bar forward returns
+    daily = _forward_returns(close, execution_lag, 1)
+    valid_days = ~np.all(np.isnan(daily), axis=0)
+    buy = (recommendations == "BUY") & ~np.isnan(daily)
+    with np.errstate(invalid='ignore'):
+        strategy = np.where(buy.any(axis=0), np.nansum(np.where(buy, daily, 0), axis=0) / buy.sum(axis=0), 0.0)
+    benchmark = np.nanmean(daily[:, valid_days], axis=0)
+    strategy = strategy[valid_days]
+    curve_dates = pd.DatetimeIndex(dates)[valid_days]
+    equity = pd.DataFrame({
+        'Strategy': np.cumprod(1 + strategy),
+        'Benchmark': np.cumprod(1 + benchmark)
+    }, index=curve_dates)
+
+    years = len(strategy) / TRADING_DAYS
+    metrics = {}
+    for name, returns in (('strategy', strategy), ('benchmark', benchmark)):
+        curve = equity['Strategy' if name == 'strategy' else 'Benchmark'].to_numpy()
+        total = float(curve[-1] - 1) if len(curve) else 0.0
+        std = returns.std()
+        metrics[name] = {
+            'total_return': total,
+            'annual_return': (1 + total) ** (1 / years) - 1 if years > 0 else np.nan,
+            'sharpe': float(returns.mean() / std * np.sqrt(TRADING_DAYS)) if std > 0 else np.nan,
+            'max_drawdown': _max_drawdown(curve),
+        }
+    metrics['exposure'] = float((buy.any(axis=0)[valid_days]).mean()) if valid_days.any() else 0.0
+    return {'summary': summary, 'equity': equity, 'metrics': metrics, 'scores': scores}
+
+
+def synthetic_inputs(n_symbols, years, articles_per_symbol_day=0.5, seed=0):
+    n_bars = int(years * TRADING_DAYS)
+    close = make_close_matrix(n_symbols, n_bars, seed=seed)
+    dates = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=n_bars)
+    symbols = [f"SYM{i:04d}.NS" for i in range(n_symbols)]
+    calendar_days = (dates[-1] - dates[0]).days + 1
+    n_articles = int(n_symbols * calendar_days * articles_per_symbol_day)
+    news_df = make_news(n_articles, companies=symbols, days=calendar_days, seed=seed, end=dates[-1] + pd.Timedelta(days=1))
+    news_df = news_df.rename(columns={'company': 'symbol'})
+    news_df['vader_compound'] = np.clip(np.random.default_rng(seed).normal(0.05, 0.35, n_articles), -1, 1)
+    return close, dates, symbols, news_df
+
+
+def cached_inputs(pairs):
+    """Closes from the on-disk price store and scored articles from the news store."""
+    from components import get_components
+
+    components = get_components()
+    store = components['news_scraper'].store
+    fetcher = components['stock_fetcher']
+    histories, frames = {}, []
+    for company, symbol in pairs:
+        histories[symbol] = fetcher.read_bars(symbol)
+        articles = store.articles_since(company, 0)
+        if not articles.empty:
+            scored = components['sentiment_analyzer'].analyze_dataframe(articles)
+            frames.append(scored.assign(symbol=symbol)[['symbol', 'published_at', 'vader_compound']])
+
+    symbols, dates, close = stack_closes(histories)
+    news_df = pd.concat(frames, ignore_index=True) if frames else \
+        pd.DataFrame(columns=['symbol', 'published_at', 'vader_compound'])
+    return close, dates, symbols, news_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the buy_score rules")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--synthetic', type=int, metavar='N_SYMBOLS', help="generate N synthetic symbols")
+    source.add_argument('--watchlist', help="file of 'Company, SYMBOL' lines to replay from the local caches")
+    parser.add_argument('--years', type=float, default=5, help="synthetic history length")
+    parser.add_argument('--lookback-days', type=int, default=DEFAULT_LOOKBACK_DAYS)
+    parser.add_argument('--horizon', type=int, default=DEFAULT_HORIZON)
+    parser.add_argument('--execution-lag', type=int, default=DEFAULT_EXECUTION_LAG,
+                        help="bars between a signal and its entry (at least 1)")
+    args = parser.parse_args()
+    if args.execution_lag < 1:
+        parser.error("--execution-lag must be at least 1")
+
+    start = time.perf_counter()
+    if args.synthetic:
+        close, dates, symbols, news_df = synthetic_inputs(args.synthetic, args.years)
+    else:
+        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from batch_analysis import parse_watchlist
+        with open(args.watchlist) as f:
+            close, dates, symbols, news_df = cached_inputs(parse_watchlist(f.read()))
+    loaded = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = run_backtest(close, dates, symbols, news_df, args.lookback_days, args.horizon, args.execution_lag)
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(symbols)} symbols x {len(dates)} bars, {len(news_df):,} articles "
+          f"(load {loaded:.1f}s, backtest {elapsed:.2f}s)\n")
+    print(result['summary'].to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    print()
+    for name in ('strategy', 'benchmark'):
+        m = result['metrics'][name]
+        print(f"{name:>9}: total {m['total_return']:+.2%}  annual {m['annual_return']:+.2%}  "
+              f"sharpe {m['sharpe']:.2f}  max drawdown {m['max_drawdown']:.2%}")
+    print(f" exposure: {result['metrics']['exposure']:.1%} of days hold at least one BUY")
+
+
+if __name__ == '__main__':
+    main()
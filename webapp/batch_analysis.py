@@ -0,0 +1,93 @@
+"""Watchlist mode: analyze many (company, symbol) pairs in one run."""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from instrumentation import run_in_context
+from pipeline import StageTimer, fetch_news, fetch_prices, finish_analysis
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def parse_watchlist(text):
+    """Parse ``Company, SYMBOL`` lines; a bare symbol doubles as the company name."""
+    pairs = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if ',' in line:
+            company, symbol = [part.strip() for part in line.rsplit(',', 1)]
+        else:
+            symbol = line
+            company = line.split('.')[0]
+        if symbol:
+            pairs.append((company or symbol, symbol.upper()))
+    return pairs
+
+
+def run_batch(components, pairs, days, max_workers=DEFAULT_MAX_WORKERS, timer=None):
+    """Analyze every pair, overlapping the news and price fetches on a thread pool.
+
+    Network calls for all tickers are submitted up front; sentiment, indicators
+    and scoring run on the calling thread for each ticker as soon as both of
+    its fetches complete, whatever order they finish in. Results come back in
+    watchlist order. Returns ``(results, timer, wall_seconds)``.
+    """
+    timer = timer or StageTimer()
+    start = time.perf_counter()
+    results = [None] * len(pairs)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        inputs = [
+            (run_in_context(pool, fetch_news, components, company, days, timer),
+             run_in_context(pool, fetch_prices, components, symbol, days, timer))
+            for company, symbol in pairs
+        ]
+        owner = {future: i for i, pair_futures in enumerate(inputs) for future in pair_futures}
+        for future in as_completed(owner):
+            i = owner[future]
+            news_future, price_future = inputs[i]
+            if not (news_future.done() and price_future.done()) or results[i] is not None:
+                continue
+            company, symbol = pairs[i]
+            try:
+                news_df, used_mock_news = news_future.result()
+                stock_data = price_future.result()
+                result = finish_analysis(components, company, symbol, news_df, stock_data,
+                                         used_mock_news, timer, days)
+                result['error'] = None if stock_data else "Could not fetch stock data"
+            except Exception as exc:
+                result = {'company': company, 'symbol': symbol, 'error': str(exc)}
+            results[i] = result
+    return results, timer, time.perf_counter() - start
+
+
+def results_table(results):
+    """Flatten batch results into one row per ticker, best buy_score first."""
+    rows = []
+    for result in results:
+        stock_data = result.get('stock_data') or {}
+        summary = result.get('sentiment_summary') or {}
+        hist = result.get('hist')
+        latest_rsi = None
+        if hist is not None and not hist.empty and 'RSI' in hist.columns:
+            latest_rsi = hist['RSI'].iloc[-1]
+        news_df = result.get('news_df')
+        rows.append({
+            'Company': result['company'],
+            'Symbol': result['symbol'],
+            'Price': stock_data.get('current_price'),
+            'Day Change %': stock_data.get('day_change'),
+            'Avg Sentiment': summary.get('avg_compound'),
+            'Articles': len(news_df) if news_df is not None else 0,
+            'Mock News': result.get('used_mock_news', False),
+            'RSI': latest_rsi,
+            'Buy Score': result.get('buy_score'),
+            'Recommendation': result.get('recommendation'),
+            'Error': result.get('error')
+        })
+    table = pd.DataFrame(rows)
+    if not table.empty:
+        table = table.sort_values('Buy Score', ascending=False, na_position='last')
+    return table
@@ -0,0 +1,119 @@
+"""Score a whole symbol universe in one vectorized call.
+
+``build_feature_matrix`` turns aligned close/volume matrices plus per-symbol
+sentiment and P/E into a C-contiguous float32 matrix, one row per symbol and
+one column per entry of ``FEATURE_NAMES``:
+
+* ``sentiment``    average VADER compound over the lookback
+* ``price_change`` last bar's change, in percent
+* ``volume``       last volume relative to its ``VOLUME_WINDOW``-bar mean
+* ``pe_ratio``     trailing P/E (NaN when unknown)
+* ``trend``        return over the last ``TREND_WINDOW`` bars
+* ``volatility``   std of daily returns over the last ``VOLATILITY_WINDOW`` bars
+
+``model_scores`` runs the predictor's fitted model over every row at once,
+with the columns put in the order of the trained predictor's
+``feature_names``; a predictor trained on a feature this module cannot
+build is skipped with a warning. ``predict_batch`` falls back to the
+Analysis page's rule-based buy_score in that case. The screener stores the
+model scores next to the rule score.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+from matrix_indicators import compute_indicators, latest, stack_closes
+from scoring import compute_buy_scores, get_recommendations
+
+logger = logging.getLogger(__name__)
+
+FEATURE_NAMES = ['sentiment', 'price_change', 'volume', 'pe_ratio', 'trend', 'volatility']
+TREND_WINDOW = 5
+VOLUME_WINDOW = 20
+VOLATILITY_WINDOW = 20
+
+
+def _ffill(matrix):
+    return pd.DataFrame(matrix).ffill(axis=1).to_numpy(dtype=float)
+
+
+def build_feature_matrix(sentiment, close, volume, pe_ratio):
+    """``(n_symbols, len(FEATURE_NAMES))`` float32 features from aligned matrices."""
+    close = _ffill(np.atleast_2d(close))
+    volume = np.atleast_2d(np.asarray(volume, dtype=float))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = close[:, 1:] / close[:, :-1] - 1
+        price_change = returns[:, -1] * 100
+        volume_ratio = volume[:, -1] / np.nanmean(volume[:, -VOLUME_WINDOW:], axis=1)
+        trend = close[:, -1] / close[:, -TREND_WINDOW - 1] - 1 if close.shape[1] > TREND_WINDOW else \
+            np.full(close.shape[0], np.nan)
+        volatility = np.nanstd(returns[:, -VOLATILITY_WINDOW:], axis=1)
+
+    columns = {
+        'sentiment': np.asarray(sentiment, dtype=float),
+        'price_change': price_change,
+        'volume': volume_ratio,
+        'pe_ratio': np.asarray(pe_ratio, dtype=float),
+        'trend': trend,
+        'volatility': volatility,
+    }
+    return np.ascontiguousarray(np.column_stack([columns[name] for name in FEATURE_NAMES]), dtype=np.float32)
+
+
+def model_feature_names(predictor):
+    """The trained predictor's feature order, or None when its model cannot be fed from ``FEATURE_NAMES``."""
+    if not hasattr(getattr(predictor, 'model', None), 'predict_proba'):
+        return None
+    names = list(getattr(predictor, 'feature_names', None) or [])
+    unknown = [name for name in names if name not in FEATURE_NAMES]
+    if not names or unknown:
+        logger.warning("Predictor features %s do not match FEATURE_NAMES %s; not using the model for batch scores",
+                       names, FEATURE_NAMES)
+        return None
+    return names
+
+
+def model_scores(predictor, features):
+    """The fitted model's buy probability per row of ``features``, or None when it cannot score them."""
+    names = model_feature_names(predictor)
+    if names is None:
+        return None
+    columns = [FEATURE_NAMES.index(name) for name in names]
+    return predictor.model.predict_proba(np.nan_to_num(features[:, columns]))[:, 1]
+
+
+def predict_batch(predictor, features, latest_rsi=None):
+    """Return ``(recommendations, confidences)`` arrays, one entry per row of ``features``."""
+    scores = model_scores(predictor, features)
+    if scores is None:
+        sentiment = features[:, FEATURE_NAMES.index('sentiment')]
+        day_change = features[:, FEATURE_NAMES.index('price_change')]
+        scores = compute_buy_scores(sentiment, day_change, latest_rsi)
+    # Threshold before narrowing: float32(0.6) is just above 0.6
+    return get_recommendations(scores), scores.astype(np.float32)
+
+
+def predict_universe(predictor, stock_data, sentiment):
+    """Score ``{symbol: stock_data}`` with ``{symbol: avg_compound}`` in one pass.
+
+    Returns a frame indexed by symbol with the features, latest RSI,
+    recommendation and confidence.
+    """
+    histories = {symbol: data['historical'] for symbol, data in stock_data.items() if data}
+    symbols, _, close = stack_closes(histories)
+    if not symbols:
+        return pd.DataFrame(columns=FEATURE_NAMES + ['RSI', 'Recommendation', 'Confidence'])
+    _, _, volume = stack_closes(histories, 'Volume')
+    pe_ratio = [stock_data[symbol].get('pe_ratio', np.nan) or np.nan for symbol in symbols]
+    avg_sentiment = [sentiment.get(symbol, 0.0) for symbol in symbols]
+
+    features = build_feature_matrix(avg_sentiment, close, volume, pe_ratio)
+    latest_rsi = latest(compute_indicators(close)['RSI'])
+    recommendations, confidences = predict_batch(predictor, features, latest_rsi)
+
+    table = pd.DataFrame(features, index=pd.Index(symbols, name='Symbol'), columns=FEATURE_NAMES)
+    table['RSI'] = latest_rsi
+    table['Recommendation'] = recommendations
+    table['Confidence'] = confidences
+    return table
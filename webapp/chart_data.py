@@ -0,0 +1,171 @@
+"""Chart payloads and figures for the Chart and Technical tabs.
+
+The x-axis labels are formatted once per history and shared by every trace.
+Histories longer than ``max_points`` are downsampled: candles are merged
+into buckets (first open, highest high, lowest low, last close, summed
+volume) and indicator lines use Largest-Triangle-Three-Buckets, which keeps
+peaks and troughs. Figures are cached per (symbol, date range), so
+rerunning the page for the same data does not rebuild them.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+MAX_POINTS = 1000
+MAX_CACHED_CHARTS = 64
+LINE_COLUMNS = ['Close', 'RSI', 'MACD', 'Signal', 'MA20', 'MA50']
+
+_figures = OrderedDict()
+_lock = threading.Lock()
+
+
+def lttb(y, n_out):
+    """Indices of ``n_out`` points of ``y`` chosen by Largest-Triangle-Three-Buckets."""
+    return lttb_many([y], n_out)[0]
+
+
+def lttb_many(series, n_out):
+    """``lttb`` of several series; one pass over the buckets picks every series' point in it."""
+    series = [np.asarray(y, dtype=float) for y in series]
+    chosen = [np.arange(len(y)) for y in series]
+    long = [k for k, y in enumerate(series) if 3 <= n_out < len(y)]
+    if not long:
+        return chosen
+    lengths = np.array([len(series[k]) for k in long])
+    edges = np.stack([np.linspace(1, n - 1, n_out - 1).astype(int) for n in lengths])
+    starts, ends = edges[:, :-1], edges[:, 1:]
+    # Average of the next bucket (or the last point) is the third triangle vertex
+    next_starts = np.concatenate([ends[:, :-1], lengths[:, None] - 1], axis=1)
+    next_ends = np.concatenate([ends[:, 1:], lengths[:, None]], axis=1)
+    next_x = (next_starts + next_ends - 1) / 2.0
+    next_y = np.stack([(sums[b] - sums[a]) / (b - a) for sums, a, b in
+                       zip((np.r_[0.0, np.cumsum(series[k])] for k in long), next_starts, next_ends)])
+    # Buckets are padded to one width with their first point, which argmax never prefers to the original
+    width = int((ends - starts).max())
+    xs = starts[..., None] + np.arange(width)
+    xs = np.where(xs < ends[..., None], xs, starts[..., None])
+    ys = np.stack([series[k][x] for k, x in zip(long, xs)])
+
+    rows = np.arange(len(long))
+    picked = np.empty((len(long), n_out), dtype=int)
+    picked[:, 0], picked[:, -1] = 0, lengths - 1
+    previous_x = np.zeros(len(long))
+    previous_y = np.array([series[k][0] for k in long])
+    # Each bucket's point depends on the one picked before it, so only the buckets are looped over
+    for i in range(n_out - 2):
+        bucket_x, bucket_y = xs[:, i], ys[:, i]
+        areas = np.abs((previous_x - next_x[:, i])[:, None] * (bucket_y - previous_y[:, None])
+                       - (previous_x[:, None] - bucket_x) * (next_y[:, i] - previous_y)[:, None])
+        best = areas.argmax(axis=1)
+        picked[:, i + 1] = previous_x = bucket_x[rows, best]
+        previous_y = bucket_y[rows, best]
+    for row, k in enumerate(long):
+        chosen[k] = picked[row]
+    return chosen
+
+
+def _labels(index, positions):
+    """One shared label per position; only the points that are drawn get formatted."""
+    intraday = len(index) and ((index.hour != 0) | (index.minute != 0)).any()
+    unique = np.unique(np.concatenate(positions)) if positions else np.arange(0)
+    drawn = index[unique]
+    if drawn.tz is not None:
+        drawn = drawn.tz_localize(None)
+    # numpy's ISO formatting is several times faster than strftime
+    unit = 'm' if intraday else 'D'
+    formatted = np.datetime_as_string(drawn.to_numpy(dtype=f'datetime64[{unit}]'), unit=unit)
+    if intraday:
+        formatted = np.char.replace(formatted, 'T', ' ')
+    return [formatted[np.searchsorted(unique, p)].tolist() for p in positions]
+
+
+def build_payload(hist, max_points=MAX_POINTS):
+    """Plain-list chart data: bucketed candles plus one (x, y) pair per line."""
+    n = len(hist)
+    if n > max_points:
+        bucket = np.arange(n) * max_points // n
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        ends = np.r_[starts[1:], n] - 1
+        candles = {
+            'open': hist['Open'].to_numpy()[starts].tolist(),
+            'high': np.maximum.reduceat(hist['High'].to_numpy(), starts).tolist(),
+            'low': np.minimum.reduceat(hist['Low'].to_numpy(), starts).tolist(),
+            'close': hist['Close'].to_numpy()[ends].tolist(),
+            'volume': np.add.reduceat(hist['Volume'].to_numpy(dtype=float), starts).tolist(),
+        }
+    else:
+        starts = np.arange(n)
+        candles = {
+            'open': hist['Open'].tolist(),
+            'high': hist['High'].tolist(),
+            'low': hist['Low'].tolist(),
+            'close': hist['Close'].tolist(),
+            'volume': hist['Volume'].tolist(),
+        }
+
+    columns = [column for column in LINE_COLUMNS if column in hist.columns]
+    series = [hist[column].to_numpy(dtype=float) for column in columns]
+    valid = [np.flatnonzero(~np.isnan(y)) for y in series]
+    keeps = [v[picked] for v, picked in zip(valid, lttb_many([y[v] for y, v in zip(series, valid)], max_points))]
+    positions = [starts, *keeps]
+    values = [y[keep].tolist() for y, keep in zip(series, keeps)]
+
+    labels = _labels(hist.index, positions)
+    candles['x'] = labels[0]
+    lines = {column: (x, y) for column, x, y in zip(columns, labels[1:], values)}
+    return {'candles': candles, 'lines': lines, 'points': n}
+
+
+def _build_figures(symbol, payload):
+    # plotly is only needed for figures; payloads (and their benchmark) work without it
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    candles, lines = payload['candles'], payload['lines']
+
+    price = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.03, row_heights=[0.7, 0.3])
+    price.add_trace(go.Candlestick(
+        x=candles['x'], open=candles['open'], high=candles['high'], low=candles['low'], close=candles['close'],
+        name="Price", increasing_line_color='green', decreasing_line_color='red'
+    ), row=1, col=1)
+    price.add_trace(go.Bar(x=candles['x'], y=candles['volume'], name="Volume", marker_color='lightblue'),
+                    row=2, col=1)
+    price.update_layout(title=f"{symbol} Stock Price", xaxis_title="Date", yaxis_title="Price (₹)",
+                        xaxis_rangeslider_visible=False, height=600)
+
+    def line(name, **style):
+        x, y = lines.get(name, ([], []))
+        return go.Scatter(x=x, y=y, mode='lines', name=name, line=style)
+
+    rsi = go.Figure([line('RSI', color='purple')])
+    rsi.add_hline(y=70, line_dash="dash", line_color="red", annotation_text="Overbought")
+    rsi.add_hline(y=30, line_dash="dash", line_color="green", annotation_text="Oversold")
+    rsi.update_layout(title="RSI", height=300)
+
+    macd = go.Figure([line('MACD', color='blue'), line('Signal', color='red')])
+    macd.update_layout(title="MACD", height=300)
+
+    averages = go.Figure([
+        line('Close', color='black', width=2),
+        line('MA20', color='blue', dash='dash'),
+        line('MA50', color='orange', dash='dash'),
+    ])
+    averages.update_layout(title="Moving Averages", height=300)
+
+    return {'price': price, 'rsi': rsi, 'macd': macd, 'moving_averages': averages}
+
+
+def get_chart_figures(symbol, hist, max_points=MAX_POINTS):
+    """Figures keyed ``price``/``rsi``/``macd``/``moving_averages``, cached per symbol and range."""
+    key = (symbol, hist.index[0], hist.index[-1], len(hist), float(hist['Close'].iloc[-1]), max_points)
+    with _lock:
+        if key in _figures:
+            _figures.move_to_end(key)
+            return _figures[key]
+    figures = _build_figures(symbol, build_payload(hist, max_points))
+    with _lock:
+        _figures[key] = figures
+        while len(_figures) > MAX_CACHED_CHARTS:
+            _figures.popitem(last=False)
+    return figures
@@ -0,0 +1,91 @@
+"""Process-wide analysis components, built once and shared by every session."""
+import atexit
+import os
+import threading
+
+from src.scrapers.news_scraper import NewsScraper
+from src.scrapers.stock_data_fetcher import StockDataFetcher
+from src.analysis.sentiment_analyzer import SentimentAnalyzer
+from src.models.predictor import StockPredictor
+from price_store import SNAPSHOT_TTL_SECONDS, CachedStockDataFetcher
+from indicator_state import IncrementalIndicatorEngine
+from sentiment_cache import CachedSentimentAnalyzer, SharedScores
+from sentiment_aggregate import SentimentAggregator
+from news_store import REFRESH_INTERVAL_SECONDS, StoredNewsScraper
+from instrumentation import instrument, tracer
+from shared_store import SharedStore, share
+
+# Sentiment scores depend only on the article text
+SHARED_SENTIMENT_TTL_SECONDS = 7 * 86400
+
+_components = None
+_lock = threading.Lock()
+
+
+def news_upstream():
+    """``NewsScraper``, or the pooled ``AsyncNewsScraper`` when aiohttp is installed and a key is set.
+
+    The async client shares one connection pool and rate limiter between
+    every thread, so batch runs and screener refreshes fetch concurrently
+    without exceeding the NewsAPI quota. ``ASYNC_NEWS=0`` turns it off.
+    """
+    scraper = NewsScraper()
+    if os.getenv('ASYNC_NEWS', '1') == '0':
+        return scraper
+    try:
+        from async_news import AsyncNewsScraper
+    except ImportError:
+        return scraper
+    api_key = getattr(scraper, 'api_key', None) or os.getenv('NEWS_API_KEY')
+    if not api_key:
+        return scraper
+    async_scraper = AsyncNewsScraper(api_key=api_key)
+    atexit.register(async_scraper.close)
+    return async_scraper
+
+
+def build_components():
+    # Upstream fetches and scoring go through the store shared by all workers and replicas
+    shared_store = SharedStore()
+    # Fetched volumes are counted at the upstream calls, beneath every cache layer,
+    # so cache and shared-store hits do not count as fetches
+    stock_upstream = instrument(StockDataFetcher(), 'stock_upstream',
+                                rows={'get_stock_data': 'bars_fetched'},
+                                sizes={'get_stock_data': 'result_bytes'})
+    news_source = instrument(news_upstream(), 'news_upstream',
+                             rows={'fetch_company_news': 'articles_fetched'},
+                             sizes={'fetch_company_news': 'result_bytes'})
+    stock_fetcher = CachedStockDataFetcher(
+        share(stock_upstream, shared_store, 'prices', {'get_stock_data': SNAPSHOT_TTL_SECONDS}))
+    sentiment_analyzer = CachedSentimentAnalyzer(
+        SentimentAnalyzer(),
+        # Scores live in the shared store only, per article
+        scores=SharedScores(shared_store, SHARED_SENTIMENT_TTL_SECONDS),
+        # Large backfills (screener refreshes, big watchlists) are scored on a process pool
+        workers=int(os.getenv('SENTIMENT_WORKERS', '0')) or None)
+    news_scraper = StoredNewsScraper(
+        share(news_source, shared_store, 'articles', {'fetch_company_news': REFRESH_INTERVAL_SECONDS}))
+    sentiment_aggregator = SentimentAggregator()
+    tracer.register_collector(lambda: {f"price_cache_{k}": v for k, v in stock_fetcher.stats.items()})
+    tracer.register_collector(lambda: {f"sentiment_cache_{k}": v for k, v in sentiment_analyzer.cache_stats().items()})
+    tracer.register_collector(lambda: {f"sentiment_aggregate_{k}": v for k, v in sentiment_aggregator.stats().items()})
+    tracer.register_collector(lambda: {f"shared_store_{k}": v for k, v in shared_store.info().items()})
+    # Every public method call is timed; scored volumes are counted
+    return {
+        'news_scraper': instrument(news_scraper, 'news_scraper'),
+        'stock_fetcher': instrument(stock_fetcher, 'stock_fetcher'),
+        'sentiment_analyzer': instrument(sentiment_analyzer, 'sentiment_analyzer',
+                                         rows={'analyze_dataframe': 'articles_scored'}),
+        'predictor': instrument(StockPredictor(), 'predictor'),
+        'indicator_engine': instrument(IncrementalIndicatorEngine(), 'indicator_engine'),
+        'sentiment_aggregator': instrument(sentiment_aggregator, 'sentiment_aggregator')
+    }
+
+
+def get_components():
+    """Return the shared components, building them on first use."""
+    global _components
+    with _lock:
+        if _components is None:
+            _components = build_components()
+        return _components
@@ -0,0 +1,203 @@
+"""Stateful RSI / MACD / Signal / MA20 / MA50 that update in O(1) per bar.
+
+The recursions reproduce ``TechnicalIndicators.add_all_indicators``:
+EMAs as ``ewm(span=n, adjust=False)``, Wilder RSI as
+``ewm(alpha=1/14, adjust=False)`` over gains and losses, and moving averages
+as ``rolling(n).mean()`` (NaN until the window is full).
+"""
+import math
+import threading
+from collections import deque
+
+import numpy as np
+
+from synthetic import TRADING_DAYS
+
+RSI_PERIOD = 14
+MACD_FAST = 12
+MACD_SLOW = 26
+SIGNAL_PERIOD = 9
+MA_SHORT = 20
+MA_LONG = 50
+
+INDICATOR_COLUMNS = ['RSI', 'MACD', 'Signal', 'MA20', 'MA50']
+
+# Daily bars behind every indicator value shown or screened: MA50, with
+# RSI/MACD settled to within 1e-4 of their seed. EMAs depend on where the
+# series starts, so every page fetches this much.
+HISTORY_BARS = 3 * MA_LONG
+# Calendar days of slack for exchange holidays on top of weekends
+HOLIDAY_DAYS = 15
+
+
+def history_days(bars=HISTORY_BARS):
+    """Calendar days to fetch for ``bars`` daily trading bars."""
+    return math.ceil(bars * 365 / TRADING_DAYS) + HOLIDAY_DAYS
+
+
+class _RollingMean:
+    __slots__ = ('window', 'values', 'total', 'evicted')
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self.evicted = None
+
+    def update(self, value):
+        self.values.append(value)
+        self.total += value
+        self.evicted = None
+        if len(self.values) > self.window:
+            self.evicted = self.values.popleft()
+            self.total -= self.evicted
+        return self.total / self.window if len(self.values) == self.window else math.nan
+
+    def undo(self):
+        """Take back the most recent ``update``."""
+        self.total -= self.values.pop()
+        if self.evicted is not None:
+            self.values.appendleft(self.evicted)
+            self.total += self.evicted
+            self.evicted = None
+
+
+class IndicatorState:
+    """Indicator accumulators for one price series."""
+
+    def __init__(self):
+        self.prev_close = None
+        self.fast = None
+        self.slow = None
+        self.signal = None
+        self.avg_gain = None
+        self.avg_loss = None
+        self.ma_short = _RollingMean(MA_SHORT)
+        self.ma_long = _RollingMean(MA_LONG)
+
+    def update(self, close):
+        """Consume one close and return ``(rsi, macd, signal, ma20, ma50)``."""
+        close = float(close)
+        if self.fast is None:
+            self.fast = self.slow = close
+        else:
+            self.fast += (close - self.fast) * (2.0 / (MACD_FAST + 1))
+            self.slow += (close - self.slow) * (2.0 / (MACD_SLOW + 1))
+        macd = self.fast - self.slow
+        if self.signal is None:
+            self.signal = macd
+        else:
+            self.signal += (macd - self.signal) * (2.0 / (SIGNAL_PERIOD + 1))
+
+        rsi = math.nan
+        if self.prev_close is not None:
+            change = close - self.prev_close
+            gain = change if change > 0 else 0.0
+            loss = -change if change < 0 else 0.0
+            if self.avg_gain is None:
+                self.avg_gain, self.avg_loss = gain, loss
+            else:
+                self.avg_gain += (gain - self.avg_gain) / RSI_PERIOD
+                self.avg_loss += (loss - self.avg_loss) / RSI_PERIOD
+            if self.avg_loss > 0:
+                rsi = 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+            elif self.avg_gain > 0:
+                rsi = 100.0
+        self.prev_close = close
+
+        return rsi, macd, self.signal, self.ma_short.update(close), self.ma_long.update(close)
+
+    def snapshot(self):
+        return (self.prev_close, self.fast, self.slow, self.signal, self.avg_gain, self.avg_loss)
+
+    def rollback(self, snapshot):
+        """Undo the last ``update`` given the snapshot taken just before it."""
+        (self.prev_close, self.fast, self.slow, self.signal,
+         self.avg_gain, self.avg_loss) = snapshot
+        self.ma_short.undo()
+        self.ma_long.undo()
+
+
+class _SeriesState:
+    def __init__(self, first_index):
+        self.first_index = first_index
+        self.index = []
+        self.closes = []
+        self.rows = []
+        self.state = IndicatorState()
+        self.before_last = None
+
+    def append(self, index, close):
+        self.before_last = self.state.snapshot()
+        self.index.append(index)
+        self.closes.append(close)
+        self.rows.append(self.state.update(close))
+
+    def revise_last(self, close):
+        self.state.rollback(self.before_last)
+        self.closes[-1] = close
+        self.rows[-1] = self.state.update(close)
+
+
+class IncrementalIndicatorEngine:
+    """Per-symbol indicator state shared across requests.
+
+    ``add_all_indicators(symbol, hist)`` returns the same columns as the batch
+    version but only feeds bars it has not seen for that symbol. A revised
+    last bar (an intraday close that moved) is recomputed from the state
+    saved before it; a history that does not extend the stored one resets
+    the symbol, since EMA values depend on where the series starts.
+    """
+
+    def __init__(self):
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def reset(self, symbol=None):
+        with self._lock:
+            if symbol is None:
+                self._series.clear()
+            else:
+                self._series.pop(symbol, None)
+
+    def add_all_indicators(self, symbol, hist):
+        if hist.empty:
+            return hist
+        closes = hist['Close'].to_numpy(dtype=float)
+        index = hist.index
+        with self._lock:
+            series = self._series.get(symbol)
+            start = self._resume_position(series, index, closes)
+            if start is None:
+                series = self._series[symbol] = _SeriesState(index[0])
+                start = 0
+            for position in range(start, len(closes)):
+                series.append(index[position], closes[position])
+            rows = np.array(series.rows, dtype=float)
+
+        # A new frame around the caller's columns; copy-on-write keeps the OHLCV shared
+        return hist.assign(**dict(zip(INDICATOR_COLUMNS, rows.T)))
+
+    def update(self, symbol, timestamp, close):
+        """Append a single bar and return its indicator values as a dict."""
+        with self._lock:
+            series = self._series.get(symbol)
+            if series is None:
+                series = self._series[symbol] = _SeriesState(timestamp)
+            if series.index and series.index[-1] == timestamp:
+                series.revise_last(close)
+            else:
+                series.append(timestamp, close)
+            return dict(zip(INDICATOR_COLUMNS, series.rows[-1]))
+
+    @staticmethod
+    def _resume_position(series, index, closes):
+        """Index of the first bar still to feed, or None when a reset is needed."""
+        if series is None or index[0] != series.first_index:
+            return None
+        seen = len(series.index)
+        if len(index) < seen or index[seen - 1] != series.index[-1]:
+            return None
+        if closes[seen - 1] != series.closes[-1]:
+            series.revise_last(closes[seen - 1])
+        return seen
@@ -0,0 +1,256 @@
+"""Timing spans, counters and exporters for the analysis flow.
+
+``tracer.trace(name)`` opens a trace; every ``tracer.span(name)`` opened
+inside it (in the same thread or context) is recorded as a child with its
+start offset and duration, so the last few runs can be drawn as a
+waterfall. Spans outside a trace still feed the per-name totals. Components
+wrapped with ``instrument`` get a span per public method call and can count
+the rows and in-memory bytes of what a method returns. Collectors registered with
+``register_collector`` expose existing statistics, such as the cache hit
+counters, as gauges at export time.
+
+Exports:
+
+* ``prometheus()``   Prometheus text format (counters, span sums/counts, gauges)
+* ``chrome_trace()`` Trace Event JSON for ``chrome://tracing`` or Perfetto
+"""
+import contextvars
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pandas as pd
+
+from result_cache import estimate_size
+
+MAX_TRACES = 20
+METRIC_PREFIX = 'stock_analyzer'
+
+_current_trace = contextvars.ContextVar('current_trace', default=None)
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+class Span:
+    __slots__ = ('name', 'start', 'end', 'parent', 'depth', 'thread', 'attrs')
+
+    def __init__(self, name, start, parent, attrs):
+        self.name = name
+        self.start = start
+        self.end = None
+        self.parent = parent
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.thread = threading.current_thread().name
+        self.attrs = attrs
+
+    @property
+    def duration(self):
+        return (self.end or time.perf_counter()) - self.start
+
+
+class Trace:
+    def __init__(self, name):
+        self.name = name
+        self.started_at = time.time()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    @property
+    def root(self):
+        return self.spans[0] if self.spans else None
+
+
+class Tracer:
+    def __init__(self, max_traces=MAX_TRACES):
+        self.traces = deque(maxlen=max_traces)
+        self.counters = {}
+        self.span_totals = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def trace(self, name, **attrs):
+        trace = Trace(name)
+        token = _current_trace.set(trace)
+        try:
+            with self.span(name, **attrs):
+                yield trace
+        finally:
+            _current_trace.reset(token)
+            with self._lock:
+                self.traces.append(trace)
+
+    @contextmanager
+    def span(self, name, **attrs):
+        span = Span(name, time.perf_counter(), _current_span.get(), attrs)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            _current_span.reset(token)
+            with self._lock:
+                totals = self.span_totals.setdefault(name, [0, 0.0])
+                totals[0] += 1
+                totals[1] += span.end - span.start
+
+    def count(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def register_collector(self, collector):
+        """``collector()`` returns ``{name: value}`` gauges; called on every export."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def gauges(self):
+        values = {}
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            values.update(collector())
+        return values
+
+    def last_trace(self):
+        with self._lock:
+            return self.traces[-1] if self.traces else None
+
+    def waterfall(self, trace=None):
+        """One row per span of ``trace`` (default: the last one) with offsets in ms."""
+        trace = trace or self.last_trace()
+        columns = ['Span', 'Depth', 'Start (ms)', 'Duration (ms)', 'Thread']
+        if trace is None or trace.root is None:
+            return pd.DataFrame(columns=columns)
+        origin = trace.root.start
+        return pd.DataFrame([{
+            'Span': span.name,
+            'Depth': span.depth,
+            'Start (ms)': round((span.start - origin) * 1000, 2),
+            'Duration (ms)': round(span.duration * 1000, 2),
+            'Thread': span.thread
+        } for span in sorted(trace.spans, key=lambda s: s.start)], columns=columns)
+
+    def chrome_trace(self, trace=None):
+        trace = trace or self.last_trace()
+        events = []
+        if trace is not None and trace.root is not None:
+            origin = trace.root.start
+            events = [{
+                'name': span.name, 'ph': 'X', 'pid': 1, 'tid': span.thread,
+                'ts': round((span.start - origin) * 1e6, 1), 'dur': round(span.duration * 1e6, 1),
+                'args': {key: str(value) for key, value in span.attrs.items()}
+            } for span in trace.spans]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms',
+                'otherData': {'trace': trace.name if trace else None}}
+
+    def chrome_trace_json(self, trace=None):
+        return json.dumps(self.chrome_trace(trace))
+
+    def prometheus(self):
+        lines = []
+        with self._lock:
+            counters = dict(self.counters)
+            span_totals = {name: list(values) for name, values in self.span_totals.items()}
+
+        seen = set()
+        for (name, labels), value in sorted(counters.items()):
+            metric = f"{METRIC_PREFIX}_{name}_total"
+            if metric not in seen:
+                lines.append(f"# TYPE {metric} counter")
+                seen.add(metric)
+            lines.append(f"{metric}{_labels(dict(labels))} {value}")
+
+        metric = f"{METRIC_PREFIX}_span_seconds"
+        if span_totals:
+            lines.append(f"# TYPE {metric} summary")
+        for name, (calls, total) in sorted(span_totals.items()):
+            lines.append(f"{metric}_sum{_labels({'span': name})} {total:.6f}")
+            lines.append(f"{metric}_count{_labels({'span': name})} {calls}")
+
+        for name, value in sorted(self.gauges().items()):
+            if value is None:
+                continue
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {float(value)}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self.traces.clear()
+            self.counters.clear()
+            self.span_totals.clear()
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"') for value in labels.values())
+    return "{" + ",".join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + "}"
+
+
+tracer = Tracer()
+
+
+def _frame_of(result):
+    if isinstance(result, pd.DataFrame):
+        return result
+    if isinstance(result, dict) and isinstance(result.get('historical'), pd.DataFrame):
+        return result['historical']
+    return None
+
+
+class InstrumentedComponent:
+    """Proxy that times every public method call of ``component``.
+
+    ``rows`` and ``sizes`` map method names to counter names; the returned
+    frame (or a stock-data dict's ``historical`` frame) adds its row count
+    or ``estimate_size`` to that counter: the size of the parsed frame in
+    memory, not of the response that was downloaded.
+    """
+
+    def __init__(self, component, name, rows=None, sizes=None, tracer=tracer):
+        self._component = component
+        self._name = name
+        self._rows = rows or {}
+        self._sizes = sizes or {}
+        self._tracer = tracer
+
+    def __getattr__(self, attr):
+        value = getattr(self._component, attr)
+        if attr.startswith('_') or not callable(value) or isinstance(value, type):
+            return value
+
+        span_name = f"{self._name}.{attr}"
+
+        def call(*args, **kwargs):
+            with self._tracer.span(span_name):
+                result = value(*args, **kwargs)
+            self._tracer.count('component_calls', component=self._name, method=attr)
+            frame = _frame_of(result)
+            if frame is not None:
+                if attr in self._rows:
+                    self._tracer.count(self._rows[attr], len(frame), component=self._name)
+                if attr in self._sizes:
+                    self._tracer.count(self._sizes[attr], estimate_size(frame), component=self._name)
+            return result
+
+        return call
+
+
+def instrument(component, name, rows=None, sizes=None):
+    return InstrumentedComponent(component, name, rows, sizes)
+
+
+def run_in_context(pool, fn, *args):
+    """``pool.submit`` that keeps the caller's current trace and span for ``fn``."""
+    return pool.submit(contextvars.copy_context().run, fn, *args)
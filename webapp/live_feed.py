@@ -0,0 +1,302 @@
+"""Streaming intraday mode: ticks in, incremental score updates out.
+
+A ``TickSource`` yields ``Tick`` records; ``ReplayTickSource`` plays back a
+local CSV (generated from synthetic minute bars when the file is missing)
+and is the stand-in for a broker or exchange feed. ``LiveSession`` consumes
+the source on a background thread. It folds ticks into bars with
+``BarAggregator`` and updates the indicators through
+``IncrementalIndicatorEngine.update``, revising the open bar on every tick.
+It also recomputes ``day_change`` and the buy_score, then pushes one update
+per tick into a bounded queue. When the UI falls behind, the oldest updates
+are dropped, since only the latest score matters.
+
+Every tick carries the ``perf_counter`` time at which it was received, so
+the consumer can report tick-to-render latency with ``record_render``.
+``ClosedBars`` turns drained updates into bars that will not change again,
+holding the open bar back across drains.
+"""
+import abc
+import os
+import queue
+import threading
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+import pandas as pd
+
+from indicator_state import IncrementalIndicatorEngine
+from price_store import PROJECT_ROOT
+from scoring import compute_buy_score, get_recommendation
+from synthetic import NSE_MINUTES_PER_DAY, TRADING_DAYS, make_ohlcv
+
+DEFAULT_REPLAY_DIR = os.path.join(PROJECT_ROOT, 'data', 'cache', 'replay')
+DEFAULT_QUEUE_SIZE = 1000
+TICKS_PER_BAR = 4
+MAX_REPLAY_GAP = 60
+LATENCY_WINDOW = 2000
+
+Tick = namedtuple('Tick', ['symbol', 'timestamp', 'price', 'volume', 'received'])
+
+
+class TickSource(abc.ABC):
+    """Base class for live feeds of one ``symbol``; ``ticks()`` yields ``Tick`` until the feed ends."""
+
+    @abc.abstractmethod
+    def ticks(self):
+        """Yield ``Tick`` records in timestamp order."""
+
+    def close(self):
+        pass
+
+
+def write_replay_file(path, symbol, days=5, seed=0):
+    """Synthetic NSE session ticks written as CSV, four per minute bar.
+
+    Each bar is replayed open, low, high, close for an up bar (open, high,
+    low, close for a down bar) at random offsets within its minute.
+    """
+    minutes = days * NSE_MINUTES_PER_DAY
+    bars = make_ohlcv(minutes, freq='min', seed=seed, periods_per_year=TRADING_DAYS * NSE_MINUTES_PER_DAY)
+    # Lay the minutes out on 09:15-15:30 sessions of consecutive business days
+    sessions = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days)
+    opens = np.repeat(sessions + pd.Timedelta(hours=9, minutes=15), NSE_MINUTES_PER_DAY)
+    stamps = opens + pd.to_timedelta(np.tile(np.arange(NSE_MINUTES_PER_DAY), days), unit='min')
+
+    o, h, l, c = (bars[column].to_numpy() for column in ['Open', 'High', 'Low', 'Close'])
+    up = (c >= o)[:, None]
+    prices = np.where(up, np.column_stack([o, l, h, c]), np.column_stack([o, h, l, c]))
+    rng = np.random.default_rng(seed)
+    offsets = np.sort(rng.uniform(0, 60, (minutes, TICKS_PER_BAR)), axis=1)
+    volumes = np.maximum(1, np.repeat(bars['Volume'].to_numpy() / TICKS_PER_BAR, TICKS_PER_BAR).round())
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    pd.DataFrame({
+        'timestamp': np.repeat(stamps, TICKS_PER_BAR) + pd.to_timedelta(offsets.ravel(), unit='s'),
+        'symbol': symbol,
+        'price': prices.ravel().round(2),
+        'volume': volumes.astype(int)
+    }).to_csv(path, index=False)
+    return path
+
+
+class ReplayTickSource(TickSource):
+    """Plays back a recorded tick CSV (``timestamp,symbol,price,volume``).
+
+    ``speed`` scales the recorded gaps (60 replays a minute per second) and
+    gaps longer than ``MAX_REPLAY_GAP`` seconds (overnight) are cut short;
+    ``None`` replays as fast as the consumer can take ticks.
+    """
+
+    def __init__(self, symbol, path=None, speed=60.0, days=5, seed=0):
+        self.symbol = symbol
+        self.path = path or os.path.join(DEFAULT_REPLAY_DIR, f"{symbol}.csv")
+        self.speed = speed
+        if not os.path.exists(self.path):
+            write_replay_file(self.path, symbol, days=days, seed=seed)
+        self._closed = threading.Event()
+
+    def ticks(self):
+        frame = pd.read_csv(self.path, parse_dates=['timestamp'])
+        frame = frame[frame['symbol'] == self.symbol]
+        stamps = frame['timestamp'].tolist()
+        prices = frame['price'].to_numpy(dtype=float)
+        volumes = frame['volume'].to_numpy(dtype=float)
+        gaps = np.diff(frame['timestamp'].to_numpy().astype('datetime64[ns]').astype(np.int64), prepend=0)
+        gaps[0] = 0
+        schedule = np.cumsum(np.minimum(gaps / 1e9, MAX_REPLAY_GAP)) / self.speed if self.speed else None
+
+        started = time.perf_counter()
+        for i, (stamp, price, volume) in enumerate(zip(stamps, prices, volumes)):
+            if self._closed.is_set():
+                return
+            if schedule is not None:
+                wait = schedule[i] - (time.perf_counter() - started)
+                if wait > 0 and self._closed.wait(wait):
+                    return
+            yield Tick(self.symbol, stamp, price, volume, time.perf_counter())
+
+    def close(self):
+        self._closed.set()
+
+
+class BarAggregator:
+    """Folds ticks into fixed-interval OHLCV bars.
+
+    ``add`` returns the bar the tick landed in, which may still be open, and
+    the bar it just closed, if any.
+    """
+
+    def __init__(self, interval='1min'):
+        self.interval = pd.Timedelta(interval)
+        self.current = None
+
+    def add(self, tick):
+        start = tick.timestamp.floor(self.interval)
+        closed = None
+        if self.current is not None and self.current['timestamp'] != start:
+            closed = self.current
+            self.current = None
+        if self.current is None:
+            self.current = {'timestamp': start, 'Open': tick.price, 'High': tick.price,
+                            'Low': tick.price, 'Close': tick.price, 'Volume': tick.volume}
+        else:
+            bar = self.current
+            bar['High'] = max(bar['High'], tick.price)
+            bar['Low'] = min(bar['Low'], tick.price)
+            bar['Close'] = tick.price
+            bar['Volume'] += tick.volume
+        return self.current, closed
+
+
+class ClosedBars:
+    """Picks the finished bars out of successive drains of ``LiveSession`` updates.
+
+    Updates carry their bar's ``timestamp``, and the last update seen for a
+    bar holds its final values. A bar is finished once an update for a later
+    bar arrives, even when that only happens in the next drain, or when the
+    feed ends and ``flush`` is called. Each bar is returned exactly once.
+    """
+
+    def __init__(self):
+        self.pending = None
+
+    def add(self, updates):
+        """Bars (their last update each) finished by ``updates``, oldest first."""
+        closed = []
+        for update in updates:
+            if self.pending is not None and update['timestamp'] != self.pending['timestamp']:
+                closed.append(self.pending)
+            self.pending = update
+        return closed
+
+    def flush(self):
+        """The open bar, once no more updates will arrive."""
+        pending, self.pending = self.pending, None
+        return [pending] if pending is not None else []
+
+
+class LiveSession:
+    """Background consumer of a ``TickSource`` producing score updates.
+
+    ``avg_sentiment`` is the news sentiment to score against (it changes on a
+    news timescale, not per tick). ``previous_close`` seeds ``day_change``
+    until the feed crosses into a new session; each new session then
+    measures against the last price of the one before.
+    """
+
+    def __init__(self, source, avg_sentiment=0.0, previous_close=None, interval='1min',
+                 engine=None, queue_size=DEFAULT_QUEUE_SIZE):
+        self.source = source
+        self.symbol = source.symbol
+        self.avg_sentiment = avg_sentiment
+        self.previous_close = previous_close
+        self.aggregator = BarAggregator(interval)
+        self.engine = engine or IncrementalIndicatorEngine()
+        self.updates = queue.Queue(maxsize=queue_size)
+        self.ticks = 0
+        self.bars = 0
+        self.dropped = 0
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._stats_lock = threading.Lock()
+        self._thread = None
+        self._session_day = None
+        self._last_price = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self.engine.reset(self.symbol)
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name=f'live-{self.symbol}', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.source.close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        try:
+            for tick in self.source.ticks():
+                self._publish(self._on_tick(tick))
+        except Exception as exc:
+            self.error = exc
+        finally:
+            self.finished_at = time.perf_counter()
+
+    def _on_tick(self, tick):
+        day = tick.timestamp.date()
+        if self._session_day is not None and day != self._session_day:
+            self.previous_close = self._last_price
+        self._session_day = day
+        if self.previous_close is None:
+            self.previous_close = tick.price
+        self._last_price = tick.price
+
+        bar, closed = self.aggregator.add(tick)
+        if closed is not None:
+            self.bars += 1
+        indicators = self.engine.update(self.symbol, bar['timestamp'], bar['Close'])
+        day_change = (tick.price / self.previous_close - 1) * 100
+        rsi = indicators['RSI']
+        buy_score = compute_buy_score(self.avg_sentiment, day_change, None if np.isnan(rsi) else rsi)
+        self.ticks += 1
+        return {
+            'timestamp': bar['timestamp'],
+            'current_price': tick.price,
+            'day_change': day_change,
+            'volume': bar['Volume'],
+            **indicators,
+            'buy_score': buy_score,
+            'recommendation': get_recommendation(buy_score),
+            'received': tick.received,
+        }
+
+    def _publish(self, update):
+        try:
+            self.updates.put_nowait(update)
+        except queue.Full:
+            try:
+                self.updates.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+            self.updates.put_nowait(update)
+
+    def drain(self, max_items=None):
+        """Pending updates, oldest first, without blocking."""
+        items = []
+        while max_items is None or len(items) < max_items:
+            try:
+                items.append(self.updates.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def record_render(self, updates, rendered_at=None):
+        """Note that ``updates`` are on screen, for tick-to-render latency."""
+        rendered_at = rendered_at or time.perf_counter()
+        with self._stats_lock:
+            self._latencies.extend(rendered_at - update['received'] for update in updates)
+
+    def stats(self):
+        end = self.finished_at or time.perf_counter()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        with self._stats_lock:
+            latencies = np.array(self._latencies)
+        return {
+            'ticks': self.ticks,
+            'bars': self.bars,
+            'dropped': self.dropped,
+            'ticks_per_sec': self.ticks / elapsed if elapsed > 0 else 0.0,
+            'latency_p50_ms': float(np.percentile(latencies, 50) * 1000) if latencies.size else None,
+            'latency_p95_ms': float(np.percentile(latencies, 95) * 1000) if latencies.size else None,
+            'queued': self.updates.qsize(),
+        }
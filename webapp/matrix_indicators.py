@@ -0,0 +1,100 @@
+"""RSI / MACD / Signal / MA20 / MA50 for many symbols in one vectorized pass.
+
+Input is a ``(n_symbols, n_bars)`` close matrix, one row per symbol, oldest
+bar first. Shorter histories are left-padded with NaN; each row starts its
+recursions at its first valid close, so rows match what
+``TechnicalIndicators.add_all_indicators`` gives for that symbol alone.
+Interior gaps (a symbol missing a bar others have) carry the EMAs forward;
+moving averages are NaN for windows that span a gap.
+"""
+import numpy as np
+import pandas as pd
+
+from indicator_state import (INDICATOR_COLUMNS, MA_LONG, MA_SHORT, MACD_FAST, MACD_SLOW,
+                             RSI_PERIOD, SIGNAL_PERIOD)
+
+
+def _ema(values, alpha):
+    """Row-wise ``ewm(alpha=alpha, adjust=False).mean()``; loops over time only."""
+    out = np.empty_like(values)
+    state = np.full(values.shape[0], np.nan)
+    for t in range(values.shape[1]):
+        column = values[:, t]
+        state = np.where(np.isnan(state), column,
+                         np.where(np.isnan(column), state, state + alpha * (column - state)))
+        out[:, t] = state
+    return out
+
+
+def _rolling_mean(values, window):
+    valid = ~np.isnan(values)
+    sums = np.cumsum(np.where(valid, values, 0.0), axis=1)
+    counts = np.cumsum(valid, axis=1)
+    sums[:, window:] = sums[:, window:] - sums[:, :-window]
+    counts[:, window:] = counts[:, window:] - counts[:, :-window]
+    out = sums / window
+    out[counts < window] = np.nan
+    return out
+
+
+def compute_indicators(close):
+    """Return ``{column: (n_symbols, n_bars) array}`` for every indicator column."""
+    close = np.asarray(close, dtype=float)
+    if close.ndim == 1:
+        close = close[np.newaxis, :]
+
+    macd = _ema(close, 2.0 / (MACD_FAST + 1)) - _ema(close, 2.0 / (MACD_SLOW + 1))
+    signal = _ema(macd, 2.0 / (SIGNAL_PERIOD + 1))
+
+    # Diff against the last valid close so a missing bar does not break the chain
+    previous = pd.DataFrame(close).ffill(axis=1).to_numpy()
+    change = np.full_like(close, np.nan)
+    change[:, 1:] = close[:, 1:] - previous[:, :-1]
+    avg_gain = _ema(np.where(change > 0, change, np.where(np.isnan(change), np.nan, 0.0)), 1.0 / RSI_PERIOD)
+    avg_loss = _ema(np.where(change < 0, -change, np.where(np.isnan(change), np.nan, 0.0)), 1.0 / RSI_PERIOD)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    return dict(zip(INDICATOR_COLUMNS, [
+        rsi, macd, signal, _rolling_mean(close, MA_SHORT), _rolling_mean(close, MA_LONG)
+    ]))
+
+
+def stack_closes(histories, column='Close'):
+    """Align per-symbol frames on their union index.
+
+    ``histories`` maps symbol -> OHLCV frame. Returns ``(symbols, index,
+    matrix)`` where ``matrix[i]`` is the column for ``symbols[i]``,
+    NaN-padded where that symbol has no bar.
+    """
+    symbols = [symbol for symbol, hist in histories.items() if hist is not None and not hist.empty]
+    if not symbols:
+        return [], pd.DatetimeIndex([]), np.empty((0, 0))
+    panel = pd.concat({symbol: histories[symbol][column] for symbol in symbols}, axis=1).sort_index()
+    return symbols, panel.index, panel.to_numpy(dtype=float).T
+
+
+def stack_own_bars(histories, column='Close'):
+    """Like ``stack_closes``, but each row holds only that symbol's own bars.
+
+    Rows are right-aligned on their last bar and left-padded with NaN, so
+    column ``-1`` is every symbol's latest bar and a symbol's indicators
+    never see gaps from bars only other symbols have (other exchanges'
+    sessions, a late listing). Returns ``(symbols, matrix)``; use it when
+    only the latest values matter, since columns are not common dates.
+    """
+    symbols = [symbol for symbol, hist in histories.items() if hist is not None and not hist.empty]
+    rows = [histories[symbol][column].sort_index().to_numpy(dtype=float) for symbol in symbols]
+    matrix = np.full((len(rows), max(map(len, rows), default=0)), np.nan)
+    for i, row in enumerate(rows):
+        matrix[i, matrix.shape[1] - len(row):] = row
+    return symbols, matrix
+
+
+def latest(values):
+    """Last non-NaN value of each row (NaN when a row has none)."""
+    valid = ~np.isnan(values)
+    last = values.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+    out = values[np.arange(values.shape[0]), last]
+    out[~valid.any(axis=1)] = np.nan
+    return out
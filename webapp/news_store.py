@@ -0,0 +1,296 @@
+"""Local article store with URL and near-duplicate title de-duplication.
+
+Articles are stored per company in SQLite. A story counts as already known
+when its normalized URL matches, or when its title SimHash is within
+``NEAR_DUPLICATE_DISTANCE`` bits of a stored title (syndicated copies that
+differ in case, punctuation or a source suffix). The 64-bit hash is split
+into four 16-bit bands; two hashes within 3 bits must agree on at least one
+band, so candidates come from an indexed band lookup. Titles and descriptions are also indexed with FTS5 when
+the SQLite build supports it. Articles whose date cannot be parsed are
+dated by when they were stored, so lookbacks still return them.
+"""
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import pandas as pd
+
+from price_store import PROJECT_ROOT
+
+DEFAULT_STORE_PATH = os.path.join(PROJECT_ROOT, 'data', 'cache', 'news.sqlite')
+NEAR_DUPLICATE_DISTANCE = 3
+REFRESH_INTERVAL_SECONDS = 900
+NEWS_COLUMNS = ['title', 'description', 'published_at', 'source', 'url']
+_SQL_CHUNK = 500
+_TRACKING_PARAMS = re.compile(r'^(utm_\w+|fbclid|gclid|ref|cmpid)$', re.IGNORECASE)
+
+
+def normalize_url(url):
+    if not isinstance(url, str) or not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query) if not _TRACKING_PARAMS.match(k)))
+    return urlunsplit(('', host, parts.path.rstrip('/'), query, ''))
+
+
+def title_simhash(title, source=None):
+    """64-bit SimHash over character 3-grams of the title (as a signed int for SQLite).
+
+    Case, punctuation and a trailing `` - <source>`` suffix are ignored, so
+    syndicated copies of a headline hash identically or within a few bits.
+    """
+    text = str(title).lower()
+    if isinstance(source, str) and source and text.endswith(source.lower()):
+        text = text[:-len(source)].rstrip(' -|:')
+    text = re.sub(r'\W+', ' ', text).strip()
+    weights = [0] * 64
+    for i in range(max(1, len(text) - 2)):
+        value = int.from_bytes(hashlib.blake2b(text[i:i + 3].encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    fingerprint = sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+def _bands(fingerprint):
+    unsigned = fingerprint & ((1 << 64) - 1)
+    return [unsigned >> shift & 0xFFFF for shift in (0, 16, 32, 48)]
+
+
+def _distance(a, b):
+    return bin((a ^ b) & ((1 << 64) - 1)).count('1')
+
+
+class _BandIndex:
+    """SimHashes by band value, for near-duplicate checks against the band candidates only."""
+
+    def __init__(self, fingerprints=()):
+        self._bands = [{} for _ in range(4)]
+        for fingerprint in fingerprints:
+            self.add(fingerprint, _bands(fingerprint))
+
+    def add(self, fingerprint, bands):
+        for by_value, value in zip(self._bands, bands):
+            by_value.setdefault(value, []).append(fingerprint)
+
+    def near(self, fingerprint, bands):
+        return any(_distance(fingerprint, other) <= NEAR_DUPLICATE_DISTANCE
+                   for by_value, value in zip(self._bands, bands) for other in by_value.get(value, ()))
+
+
+class NewsStore:
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        # Readers in other workers are not blocked by this one's writes
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.Lock()
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                company TEXT NOT NULL,
+                url_key TEXT,
+                simhash INTEGER NOT NULL,
+                band0 INTEGER, band1 INTEGER, band2 INTEGER, band3 INTEGER,
+                published_ts REAL,
+                ingested_ts REAL,
+                title TEXT, description TEXT, published_at TEXT, source TEXT, url TEXT
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS articles_url ON articles (company, url_key);
+            CREATE INDEX IF NOT EXISTS articles_time ON articles (company, published_ts);
+            CREATE INDEX IF NOT EXISTS articles_band0 ON articles (company, band0);
+            CREATE INDEX IF NOT EXISTS articles_band1 ON articles (company, band1);
+            CREATE INDEX IF NOT EXISTS articles_band2 ON articles (company, band2);
+            CREATE INDEX IF NOT EXISTS articles_band3 ON articles (company, band3);
+            CREATE TABLE IF NOT EXISTS company_meta (
+                company TEXT PRIMARY KEY,
+                covered_from REAL,
+                newest_ts REAL,
+                fetched_at REAL
+            );
+        """)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(articles)")}
+        if 'ingested_ts' not in columns:
+            self._db.execute("ALTER TABLE articles ADD COLUMN ingested_ts REAL")
+        try:
+            self._db.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts "
+                "USING fts5(title, description, content='articles', content_rowid='id')"
+            )
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+        self._db.commit()
+
+    def add_articles(self, company, news_df):
+        """Insert unseen articles in one transaction; returns how many were new.
+
+        Rows are checked against the store and against the rows before them
+        in the same batch, so a page repeating a story stores it once.
+        """
+        if news_df is None or news_df.empty:
+            return 0
+        timestamps = pd.to_datetime(news_df['published_at'], utc=True, errors='coerce', format='mixed')
+        rows = []
+        for row, published in zip(news_df.to_dict('records'), timestamps):
+            fingerprint = title_simhash(row.get('title', ''), row.get('source'))
+            rows.append((row, published, normalize_url(row.get('url')), fingerprint, _bands(fingerprint)))
+
+        now = time.time()
+        with self._lock:
+            # Held from the lookups to the commit, so another writer cannot slip in between
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                seen_urls = self._known_urls(company, [url_key for _, _, url_key, _, _ in rows if url_key])
+                band_index = _BandIndex(self._candidates(company, [bands for *_, bands in rows]))
+                new_rows = []
+                for row, published, url_key, fingerprint, bands in rows:
+                    if (url_key and url_key in seen_urls) or band_index.near(fingerprint, bands):
+                        continue
+                    if url_key:
+                        seen_urls.add(url_key)
+                    band_index.add(fingerprint, bands)
+                    new_rows.append((company, url_key, fingerprint, *bands,
+                                     None if pd.isna(published) else published.timestamp(), now,
+                                     row.get('title'), row.get('description'), row.get('published_at'),
+                                     row.get('source'), row.get('url')))
+                last_id = self._db.execute("SELECT COALESCE(MAX(id), 0) FROM articles").fetchone()[0]
+                self._db.executemany(
+                    "INSERT INTO articles (company, url_key, simhash, band0, band1, band2, band3, "
+                    "published_ts, ingested_ts, title, description, published_at, source, url) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", new_rows
+                )
+                if self.has_fts:
+                    self._db.execute(
+                        "INSERT INTO articles_fts (rowid, title, description) "
+                        "SELECT id, title, description FROM articles WHERE id > ?", (last_id,)
+                    )
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+        return len(new_rows)
+
+    def _known_urls(self, company, url_keys):
+        known = set()
+        url_keys = list(dict.fromkeys(url_keys))
+        for i in range(0, len(url_keys), _SQL_CHUNK):
+            chunk = url_keys[i:i + _SQL_CHUNK]
+            known.update(url_key for (url_key,) in self._db.execute(
+                f"SELECT url_key FROM articles WHERE company = ? AND url_key IN ({', '.join('?' * len(chunk))})",
+                (company, *chunk)
+            ))
+        return known
+
+    def _candidates(self, company, band_rows):
+        """Stored ``(simhash, bands)`` of ``company`` sharing a band with any of ``band_rows``."""
+        found = {}
+        for position in range(4):
+            values = list({bands[position] for bands in band_rows})
+            for i in range(0, len(values), _SQL_CHUNK):
+                chunk = values[i:i + _SQL_CHUNK]
+                found.update(self._db.execute(
+                    f"SELECT id, simhash FROM articles WHERE company = ? "
+                    f"AND band{position} IN ({', '.join('?' * len(chunk))})", (company, *chunk)
+                ))
+        return found.values()
+
+    def articles_since(self, company, since_ts):
+        """Articles for ``company`` published (or, undated, stored) at or after ``since_ts``, newest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT title, description, published_at, source, url FROM articles "
+                "WHERE company = ? AND COALESCE(published_ts, ingested_ts) >= ? "
+                "ORDER BY COALESCE(published_ts, ingested_ts) DESC",
+                (company, since_ts)
+            ).fetchall()
+        return pd.DataFrame(rows, columns=NEWS_COLUMNS)
+
+    def articles_since_many(self, companies, since_ts):
+        """``articles_since`` for several companies in one query, with a ``company`` column."""
+        companies = list(dict.fromkeys(companies))
+        if not companies:
+            return pd.DataFrame(columns=['company', *NEWS_COLUMNS])
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT company, title, description, published_at, source, url FROM articles "
+                f"WHERE company IN ({', '.join('?' * len(companies))}) "
+                "AND COALESCE(published_ts, ingested_ts) >= ? "
+                "ORDER BY company, COALESCE(published_ts, ingested_ts) DESC",
+                (*companies, since_ts)
+            ).fetchall()
+        return pd.DataFrame(rows, columns=['company', *NEWS_COLUMNS])
+
+    def search(self, query, company=None, limit=50):
+        """Full-text search over titles and descriptions (requires FTS5)."""
+        if not self.has_fts:
+            raise RuntimeError("SQLite was built without FTS5")
+        sql = ("SELECT a.title, a.description, a.published_at, a.source, a.url FROM articles_fts "
+               "JOIN articles a ON a.id = articles_fts.rowid WHERE articles_fts MATCH ?")
+        params = [query]
+        if company is not None:
+            sql += " AND a.company = ?"
+            params.append(company)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return pd.DataFrame(rows, columns=NEWS_COLUMNS)
+
+    def get_meta(self, company):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT covered_from, newest_ts, fetched_at FROM company_meta WHERE company = ?", (company,)
+            ).fetchone()
+        return dict(zip(['covered_from', 'newest_ts', 'fetched_at'], row)) if row else None
+
+    def set_meta(self, company, covered_from, fetched_at):
+        with self._lock:
+            newest_ts = self._db.execute(
+                "SELECT MAX(published_ts) FROM articles WHERE company = ?", (company,)
+            ).fetchone()[0]
+            self._db.execute(
+                "INSERT OR REPLACE INTO company_meta (company, covered_from, newest_ts, fetched_at) "
+                "VALUES (?, ?, ?, ?)", (company, covered_from, newest_ts, fetched_at)
+            )
+            self._db.commit()
+
+
+class StoredNewsScraper:
+    """Drop-in wrapper for ``NewsScraper`` that serves lookbacks from ``NewsStore``.
+
+    Only the days since the newest stored article are requested upstream, and
+    not at all within ``refresh_interval`` seconds of the last fetch.
+    """
+
+    def __init__(self, scraper, store=None, refresh_interval=REFRESH_INTERVAL_SECONDS):
+        self._scraper = scraper
+        self.store = store or NewsStore()
+        self.refresh_interval = refresh_interval
+
+    def __getattr__(self, name):
+        return getattr(self._scraper, name)
+
+    def fetch_company_news(self, company, days=7):
+        now = time.time()
+        window_start = now - days * 86400
+        meta = self.store.get_meta(company)
+        covered = bool(meta) and meta['covered_from'] <= window_start
+
+        if not (covered and now - meta['fetched_at'] < self.refresh_interval):
+            fetch_days = days
+            if covered and meta['newest_ts']:
+                fetch_days = max(1, math.ceil((now - meta['newest_ts']) / 86400))
+            self.store.add_articles(company, self._scraper.fetch_company_news(company, fetch_days))
+            covered_from = min(meta['covered_from'], window_start) if covered else window_start
+            self.store.set_meta(company, covered_from, now)
+
+        return self.store.articles_since(company, window_start)
@@ -0,0 +1,161 @@
+"""Analysis pipeline shared by the single-ticker page and batch mode."""
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from src.analysis.technical_indicators import TechnicalIndicators
+from compact import compact_news, window
+from indicator_state import history_days
+from instrumentation import tracer
+from scoring import compute_buy_score, get_recommendation
+
+MOCK_SOURCES = ['Economic Times', 'Moneycontrol', 'Bloomberg', 'Reuters']
+# The price chart covers at least this many calendar days
+MIN_DISPLAY_DAYS = 30
+
+
+class StageTimer:
+    """Thread-safe accumulator of wall-clock time per pipeline stage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.totals = {}
+        self.counts = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.totals[name] = self.totals.get(name, 0.0) + elapsed
+                self.counts[name] = self.counts.get(name, 0) + 1
+
+    def summary(self):
+        rows = []
+        for name, total in self.totals.items():
+            calls = self.counts[name]
+            rows.append({
+                'Stage': name,
+                'Calls': calls,
+                'Total (s)': round(total, 3),
+                'Mean (ms)': round(total / calls * 1000, 1)
+            })
+        return pd.DataFrame(rows, columns=['Stage', 'Calls', 'Total (s)', 'Mean (ms)'])
+
+
+@contextmanager
+def _stage(timer, name):
+    with tracer.span(name), (timer.stage(name) if timer is not None else nullcontext()):
+        yield
+
+
+def mock_news(company, days):
+    headlines = [
+        f"{company} reports strong quarterly results",
+        f"{company} launches new product line",
+        f"Market analysts positive on {company} growth",
+        f"{company} faces regulatory hurdles",
+        f"{company} announces expansion plans"
+    ]
+    rows = []
+    for i in range(min(5, days)):
+        rows.append({
+            'title': headlines[i % len(headlines)],
+            'description': f"Mock description for {company}",
+            'published_at': (datetime.now() - timedelta(days=i)).isoformat(),
+            'source': MOCK_SOURCES[i % len(MOCK_SOURCES)],
+            'url': 'https://example.com'
+        })
+    return pd.DataFrame(rows)
+
+
+def fetch_news(components, company, days, timer=None):
+    """Return ``(news_df, used_mock)``, falling back to mock headlines."""
+    with _stage(timer, 'news'):
+        news_df = components['news_scraper'].fetch_company_news(company, days)
+    if news_df.empty:
+        return mock_news(company, days), True
+    return news_df, False
+
+
+def fetch_prices(components, symbol, days, timer=None):
+    """Price data with the full indicator history (``history_days``), as the screener uses."""
+    with _stage(timer, 'prices'):
+        return components['stock_fetcher'].get_stock_data(
+            symbol, period=f"{max(days, MIN_DISPLAY_DAYS, history_days())}d")
+
+
+def finish_analysis(components, company, symbol, news_df, stock_data, used_mock_news=False, timer=None,
+                    days=None):
+    """Run the CPU-bound stages on already fetched news and prices.
+
+    Indicators are computed over all of ``stock_data['historical']``; with
+    ``days`` given, the bars are then cut to the displayed window (at least
+    ``MIN_DISPLAY_DAYS``), which the features and charts use.
+    """
+    with _stage(timer, 'sentiment'):
+        news_df = components['sentiment_analyzer'].analyze_dataframe(news_df)
+        sentiment_summary = components['sentiment_analyzer'].get_average_sentiment(news_df)
+        aggregator = components.get('sentiment_aggregator')
+        if aggregator is not None and not used_mock_news:
+            aggregator.add(company, news_df)
+
+    result = {
+        'company': company,
+        'symbol': symbol,
+        'news_df': news_df,
+        'used_mock_news': used_mock_news,
+        'sentiment_summary': sentiment_summary,
+        'stock_data': stock_data,
+        'hist': None,
+        'sentiment_series': None,
+        'features': None,
+        'buy_score': None,
+        'recommendation': None
+    }
+    if not stock_data:
+        return result
+
+    # Add technical indicators
+    hist = stock_data['historical']
+    if not hist.empty:
+        with _stage(timer, 'indicators'):
+            engine = components.get('indicator_engine')
+            if engine is not None:
+                hist = engine.add_all_indicators(symbol, hist)
+            else:
+                hist = TechnicalIndicators.add_all_indicators(hist.copy())
+        if days is not None:
+            hist = window(hist, pd.Timestamp.now(tz=hist.index.tz) - pd.Timedelta(days=max(days, MIN_DISPLAY_DAYS)))
+        stock_data['historical'] = hist
+
+    with _stage(timer, 'features'):
+        features = components['predictor'].prepare_features(news_df, stock_data)
+
+    latest_rsi = None
+    if not hist.empty and 'RSI' in hist.columns:
+        latest_rsi = hist['RSI'].iloc[-1]
+    buy_score = compute_buy_score(sentiment_summary['avg_compound'], stock_data['day_change'], latest_rsi)
+
+    result.update({
+        'news_df': compact_news(news_df),
+        'hist': hist,
+        'sentiment_series': aggregator.series(company, hist.index) if aggregator is not None and not hist.empty else None,
+        'features': features,
+        'buy_score': buy_score,
+        'recommendation': get_recommendation(buy_score)
+    })
+    return result
+
+
+def analyze_symbol(components, company, symbol, days, timer=None):
+    """Run the full pipeline for one ticker, one stage after another."""
+    news_df, used_mock_news = fetch_news(components, company, days, timer)
+    stock_data = fetch_prices(components, symbol, days, timer)
+    return finish_analysis(components, company, symbol, news_df, stock_data, used_mock_news, timer, days)
@@ -0,0 +1,214 @@
+"""Vectorized valuation and risk for a whole portfolio.
+
+Holdings are a frame with ``symbol``, ``quantity`` and ``avg_cost`` columns
+(``company`` optional, for sentiment). Prices for every holding come from
+one bulk download (``yfinance.download`` with all tickers in a single call)
+and fall back to concurrent per-symbol fetches through the shared
+``stock_fetcher`` when yfinance is not installed or the bulk call fails.
+Closes are aligned into one ``(n_positions, n_bars)`` matrix; after that,
+P&L, weights, covariance, correlation and VaR are all matrix operations,
+with no per-position loop.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from matrix_indicators import stack_closes
+from synthetic import TRADING_DAYS
+
+DEFAULT_HISTORY_DAYS = 365
+DEFAULT_MAX_WORKERS = 8
+VAR_LEVELS = (0.95, 0.99)
+
+
+def bulk_histories(symbols, days=DEFAULT_HISTORY_DAYS, fetcher=None, max_workers=DEFAULT_MAX_WORKERS):
+    """``symbol -> OHLCV frame`` for every symbol (missing symbols are left out)."""
+    symbols = list(dict.fromkeys(symbols))
+    histories = {}
+    try:
+        import yfinance as yf
+        panel = yf.download(symbols, period=f"{days}d", group_by='ticker', auto_adjust=False,
+                            threads=True, progress=False)
+        for symbol in symbols:
+            if symbol in panel.columns.get_level_values(0):
+                hist = panel[symbol].dropna(how='all')
+                if not hist.empty:
+                    histories[symbol] = hist
+    except Exception:
+        # No yfinance, or the bulk endpoint failed: go through the shared fetcher instead
+        histories = {}
+
+    missing = [symbol for symbol in symbols if symbol not in histories]
+    if missing and fetcher is not None:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for symbol, data in zip(missing, pool.map(lambda s: fetcher.get_stock_data(s, period=f"{days}d"), missing)):
+                if data and not data['historical'].empty:
+                    histories[symbol] = data['historical']
+    return histories
+
+
+def _ffill(matrix):
+    return pd.DataFrame(matrix).ffill(axis=1).to_numpy(dtype=float)
+
+
+def _returns(close):
+    """Daily simple returns; NaN before a symbol's first price (and after a zero close)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = close[:, 1:] / close[:, :-1] - 1
+    returns[~np.isfinite(returns)] = np.nan
+    return returns
+
+
+def _pairwise_covariance(returns):
+    """Sample covariance of each pair of rows over the bars where both have a return.
+
+    Symbols listed later than others are measured over their own history
+    rather than against zero returns. Pairs with fewer than two common
+    bars get 0.
+    """
+    valid = np.isfinite(returns).astype(float)
+    filled = np.where(valid > 0, returns, 0.0)
+    counts = valid @ valid.T
+    products = filled @ filled.T
+    # sums[i, j]: sum of row i's returns over the bars where row j also has one
+    sums = filled @ valid.T
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = (products - sums * sums.T / counts) / (counts - 1)
+    return np.where(counts > 1, covariance, 0.0)
+
+
+def _nearest_psd(covariance):
+    """``covariance`` with negative eigenvalues floored at zero; unchanged when it has none.
+
+    Pairs measured over different windows need not be consistent with each
+    other, and without the floor ``w @ cov @ w`` can go negative.
+    """
+    if not covariance.size:
+        return covariance
+    try:
+        # Positive definite (the usual case) is settled by a Cholesky factorization, far cheaper than eigh
+        np.linalg.cholesky(covariance)
+        return covariance
+    except np.linalg.LinAlgError:
+        pass
+    eigenvalues, eigenvectors = np.linalg.eigh((covariance + covariance.T) / 2)
+    if eigenvalues[0] >= 0:
+        return covariance
+    return (eigenvectors * np.maximum(eigenvalues, 0.0)) @ eigenvectors.T
+
+
+def value_portfolio(holdings, histories, sentiment=None, var_levels=VAR_LEVELS):
+    """Valuation, risk and sentiment exposure for ``holdings``.
+
+    ``sentiment`` maps symbol -> average VADER compound (missing means 0).
+    Returns a dict with ``positions`` (one row per holding), ``totals``,
+    ``covariance`` and ``correlation`` (annualized, as DataFrames), ``var``
+    (one-day historical VaR and expected shortfall in currency per level),
+    ``portfolio_returns`` and ``sentiment_exposure``.
+    """
+    # Several lots of the same symbol collapse into one position
+    aggregations = {'quantity': 'sum', 'cost': 'sum'}
+    holdings = holdings.assign(cost=holdings['quantity'] * holdings['avg_cost'])
+    holdings = holdings.groupby('symbol', sort=False).agg(aggregations)
+    symbols, dates, close = stack_closes({symbol: histories.get(symbol) for symbol in holdings.index})
+    if not symbols:
+        raise ValueError("none of the holdings could be priced")
+    priced = holdings.loc[symbols]
+    close = _ffill(close)
+
+    quantity = priced['quantity'].to_numpy(dtype=float)
+    cost = priced['cost'].to_numpy(dtype=float)
+    last = close[:, -1]
+    previous = close[:, -2] if close.shape[1] > 1 else last
+    market_value = quantity * last
+    total_value = market_value.sum()
+    weights = market_value / total_value if total_value else np.zeros_like(market_value)
+    pnl = market_value - cost
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pnl_pct = np.where(cost != 0, pnl / cost * 100, np.nan)
+
+    returns = _returns(close)
+    n_returns = returns.shape[1]
+    pairwise = _pairwise_covariance(returns) * TRADING_DAYS
+    # Each position's own volatility over its full history; portfolio figures use the PSD repair
+    std = np.sqrt(np.diag(pairwise))
+    priced_days = np.isfinite(returns)
+    # Over one common window the pairwise estimate is a sample covariance, PSD already
+    covariance = pairwise if (priced_days == priced_days[:1]).all() else _nearest_psd(pairwise)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlation = covariance / np.sqrt(np.outer(np.diag(covariance), np.diag(covariance)))
+    np.fill_diagonal(correlation, 1.0)
+
+    # Each day's return is over the positions priced that day, reweighted among them
+    with np.errstate(divide='ignore', invalid='ignore'):
+        portfolio_returns = weights @ np.where(priced_days, returns, 0.0) / (weights @ priced_days)
+    portfolio_returns = np.nan_to_num(portfolio_returns, nan=0.0)
+    var = {}
+    for level in var_levels:
+        if n_returns:
+            cutoff = np.quantile(portfolio_returns, 1 - level)
+            tail = portfolio_returns[portfolio_returns <= cutoff]
+            var[level] = {'var': float(-cutoff * total_value), 'expected_shortfall': float(-tail.mean() * total_value)}
+        else:
+            var[level] = {'var': np.nan, 'expected_shortfall': np.nan}
+
+    scores = np.array([(sentiment or {}).get(symbol, 0.0) for symbol in symbols], dtype=float)
+    risk_contribution = weights * (covariance @ weights)
+    portfolio_variance = float(weights @ covariance @ weights)
+
+    positions = pd.DataFrame({
+        'Symbol': symbols,
+        'Quantity': quantity,
+        'Last Price': last,
+        'Market Value': market_value,
+        'Cost': cost,
+        'P&L': pnl,
+        'P&L %': pnl_pct,
+        'Day P&L': quantity * (last - previous),
+        'Weight': weights,
+        'Volatility': std,
+        'Risk Share': risk_contribution / portfolio_variance if portfolio_variance else np.zeros_like(weights),
+        'Sentiment': scores,
+        'Sentiment Exposure': weights * scores,
+    })
+    return {
+        'positions': positions,
+        'totals': {
+            'market_value': float(total_value),
+            'cost': float(cost.sum()),
+            'pnl': float(pnl.sum()),
+            'day_pnl': float(positions['Day P&L'].sum()),
+            'volatility': float(np.sqrt(portfolio_variance)),
+            'unpriced': sorted(set(holdings.index) - set(symbols)),
+        },
+        'covariance': pd.DataFrame(covariance, index=symbols, columns=symbols),
+        'correlation': pd.DataFrame(correlation, index=symbols, columns=symbols),
+        'var': var,
+        'portfolio_returns': pd.Series(portfolio_returns, index=dates[1:], name='Portfolio'),
+        'sentiment_exposure': float(weights @ scores),
+    }
+
+
+def stored_sentiment(components, holdings, days=7):
+    """Average compound of the stored articles of each holding's company (no network calls)."""
+    if 'company' not in holdings.columns:
+        return {}
+    analyzer = components['sentiment_analyzer']
+    companies = holdings[['symbol', 'company']].drop_duplicates('symbol')
+    articles = components['news_scraper'].store.articles_since_many(companies['company'], time.time() - days * 86400)
+    if articles.empty:
+        return {}
+    # One scoring call for every holding's articles, then split by company
+    scored = analyzer.analyze_dataframe(articles)
+    by_company = {company: analyzer.get_average_sentiment(group)['avg_compound']
+                  for company, group in scored.groupby('company', sort=False)}
+    return {symbol: by_company[company] for symbol, company in companies.itertuples(index=False)
+            if company in by_company}
+
+
+def analyze_portfolio(components, holdings, days=DEFAULT_HISTORY_DAYS, sentiment_days=7):
+    """Bulk-fetch prices for ``holdings`` and value them (entry point for the Portfolio page)."""
+    histories = bulk_histories(holdings['symbol'], days, fetcher=components['stock_fetcher'])
+    return value_portfolio(holdings, histories, stored_sentiment(components, holdings, sentiment_days))
@@ -0,0 +1,165 @@
+"""On-disk OHLCV store in front of ``StockDataFetcher``.
+
+Bars are kept per symbol in a Parquet file (pickle when no Parquet engine is
+installed) next to a small JSON sidecar holding the quote snapshot
+(``current_price``, ``day_change``, ``market_cap``, ...). A request is served
+from disk when the stored bars reach back far enough and the snapshot is
+younger than the TTL; otherwise only the bars since the last stored date are
+downloaded and merged in.
+
+Loaded bars are also kept in memory per symbol (reloaded when the file
+changes), and requests get positional slices of them, so concurrent
+sessions share the same arrays; copy-on-write keeps them from writing
+into each other's (without it, on pandas 2.x, they get copies).
+"""
+import json
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+
+from compact import window
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, 'data', 'cache', 'prices')
+SNAPSHOT_TTL_SECONDS = 300
+# Re-download at least this many days so the last (possibly partial) bar and
+# any weekend/holiday gap are refreshed.
+MIN_REFRESH_DAYS = 5
+
+
+def _period_days(period):
+    match = re.fullmatch(r'(\d+)d', str(period))
+    return int(match.group(1)) if match else None
+
+
+def json_default(value):
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def _cutoff(index, days):
+    return pd.Timestamp.now(tz=getattr(index, 'tz', None)) - pd.Timedelta(days=days)
+
+
+class CachedStockDataFetcher:
+    """Drop-in wrapper for ``StockDataFetcher`` with incremental refresh."""
+
+    def __init__(self, fetcher, cache_dir=DEFAULT_CACHE_DIR, snapshot_ttl=SNAPSHOT_TTL_SECONDS):
+        self._fetcher = fetcher
+        self.cache_dir = cache_dir
+        self.snapshot_ttl = snapshot_ttl
+        self.stats = {'hits': 0, 'incremental': 0, 'full': 0}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._memory = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def __getattr__(self, name):
+        return getattr(self._fetcher, name)
+
+    def get_stock_data(self, symbol, period="1mo"):
+        days = _period_days(period)
+        if days is None:
+            return self._fetcher.get_stock_data(symbol, period=period)
+
+        with self._lock_for(symbol):
+            bars = self.read_bars(symbol)
+            meta = self._read_meta(symbol)
+            now = time.time()
+            covered = bool(meta) and not bars.empty and meta['covered_from'] <= now - days * 86400
+            fresh = bool(meta) and now - meta['snapshot_at'] < self.snapshot_ttl
+
+            if covered and fresh:
+                self._count('hits')
+            else:
+                if covered:
+                    last_bar = bars.index[-1]
+                    gap = (pd.Timestamp.now(tz=last_bar.tz) - last_bar).days + 1
+                    fetch_period = f"{max(gap, MIN_REFRESH_DAYS)}d"
+                    self._count('incremental')
+                else:
+                    fetch_period = period
+                    self._count('full')
+
+                data = self._fetcher.get_stock_data(symbol, period=fetch_period)
+                if not data:
+                    # Serve the stored copy when the upstream call fails
+                    if not meta or bars.empty:
+                        return data
+                else:
+                    new_bars = data['historical']
+                    if not new_bars.empty:
+                        bars = pd.concat([bars, new_bars]) if not bars.empty else new_bars
+                        bars = bars[~bars.index.duplicated(keep='last')].sort_index()
+                        bars = self._write_bars(symbol, bars)
+                    covered_from = now - days * 86400
+                    if covered:
+                        covered_from = min(covered_from, meta['covered_from'])
+                    meta = {
+                        'covered_from': covered_from,
+                        'snapshot_at': now,
+                        'snapshot': {k: v for k, v in data.items() if k != 'historical'}
+                    }
+                    self._write_meta(symbol, meta)
+
+            stock_data = dict(meta['snapshot'])
+            stock_data['historical'] = window(bars, _cutoff(bars.index, days)) if not bars.empty else bars
+            return stock_data
+
+    def _count(self, key):
+        with self._locks_guard:
+            self.stats[key] += 1
+
+    def _lock_for(self, symbol):
+        with self._locks_guard:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def _path(self, symbol, ext):
+        return os.path.join(self.cache_dir, re.sub(r'[^A-Za-z0-9._-]', '_', symbol) + ext)
+
+    def read_bars(self, symbol):
+        """All stored bars for ``symbol`` (empty frame when none), shared between callers."""
+        for path, read in ((self._path(symbol, '.parquet'), pd.read_parquet),
+                           (self._path(symbol, '.pkl'), pd.read_pickle)):
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            cached = self._memory.get(symbol)
+            if cached is not None and cached[0] == (path, mtime):
+                return cached[1]
+            bars = read(path)
+            self._memory[symbol] = ((path, mtime), bars)
+            return bars
+        return pd.DataFrame()
+
+    def _write_bars(self, symbol, bars):
+        parquet_path = self._path(symbol, '.parquet')
+        tmp_path = parquet_path + '.tmp'
+        try:
+            bars.to_parquet(tmp_path)
+            os.replace(tmp_path, parquet_path)
+            path = parquet_path
+        except ImportError:
+            path = self._path(symbol, '.pkl')
+            bars.to_pickle(path + '.tmp')
+            os.replace(path + '.tmp', path)
+        self._memory[symbol] = ((path, os.stat(path).st_mtime_ns), bars)
+        return bars
+
+    def _read_meta(self, symbol):
+        try:
+            with open(self._path(symbol, '.json')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, symbol, meta):
+        path = self._path(symbol, '.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(meta, f, default=json_default)
+        os.replace(path + '.tmp', path)
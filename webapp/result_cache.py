@@ -0,0 +1,159 @@
+"""Stale-while-revalidate cache for full analysis results.
+
+Entries younger than ``ttl`` are served as-is. Older ones (up to
+``max_stale``) are served immediately while a background worker recomputes
+them. Concurrent misses for the same key share one computation. The
+least recently used entries are evicted once the estimated size of all
+entries passes ``max_bytes``. Every caller gets its own shallow copy of the
+result (dicts, lists and frames), so a session that edits its result does
+not change what other sessions see.
+"""
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_MAX_STALE_SECONDS = 3600
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def estimate_size(value, _seen=None):
+    """Rough deep size in bytes of a result (frames, arrays, dicts, lists).
+
+    An object reachable more than once (e.g. ``hist`` and
+    ``stock_data['historical']``) is counted once.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        items = sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items())
+        return sys.getsizeof(value) + items
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v, _seen) for v in value)
+    return sys.getsizeof(value)
+
+
+def session_copy(value):
+    """Copy of the containers and frames in ``value``; frame data is shared until written (copy-on-write)."""
+    if isinstance(value, dict):
+        return {key: session_copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [session_copy(item) for item in value]
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    return value
+
+
+class _Entry:
+    __slots__ = ('value', 'created', 'size')
+
+    def __init__(self, value, created, size):
+        self.value = value
+        self.created = created
+        self.size = size
+
+
+class ResultCache:
+    def __init__(self, ttl=DEFAULT_TTL_SECONDS, max_stale=DEFAULT_MAX_STALE_SECONDS,
+                 max_bytes=DEFAULT_MAX_BYTES, refresh_workers=2):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_bytes = max_bytes
+        self.stats = {'fresh': 0, 'stale': 0, 'miss': 0, 'refreshes': 0, 'evictions': 0}
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix='result-refresh')
+
+    def get_or_compute(self, key, compute):
+        """Return ``(value, status)`` where status is ``fresh``, ``stale`` or ``miss``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = time.time() - entry.created
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.stats['fresh'] += 1
+                    return session_copy(entry.value), 'fresh'
+                if age < self.max_stale:
+                    self._entries.move_to_end(key)
+                    self.stats['stale'] += 1
+                    if key not in self._inflight:
+                        self._inflight[key] = self._refresher.submit(self._refresh, key, compute)
+                        self.stats['refreshes'] += 1
+                    return session_copy(entry.value), 'stale'
+            self.stats['miss'] += 1
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            return session_copy(future.result()), 'miss'
+        try:
+            value = compute()
+            self._put(key, value)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return session_copy(value), 'miss'
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._bytes = 0
+            elif key in self._entries:
+                self._bytes -= self._entries.pop(key).size
+
+    def info(self):
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries), bytes=self._bytes)
+
+    def _refresh(self, key, compute):
+        try:
+            value = compute()
+            self._put(key, value)
+            return value
+        except Exception:
+            logger.exception("Refreshing %r failed; keeping the previous result", key)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _put(self, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = _Entry(value, time.time(), size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.stats['evictions'] += 1
@@ -0,0 +1,57 @@
+"""Rule-based buy score used by the Analysis page."""
+import numpy as np
+
+BUY_THRESHOLD = 0.6
+SELL_THRESHOLD = 0.4
+
+
+def compute_buy_score(avg_sentiment, day_change, latest_rsi=None):
+    """Combine sentiment, daily move and RSI into a score between 0 and 1."""
+    buy_score = 0.5
+    if avg_sentiment > 0.1:
+        buy_score += 0.2
+    elif avg_sentiment < -0.1:
+        buy_score -= 0.2
+
+    if day_change < -2:
+        buy_score += 0.1
+    elif day_change > 5:
+        buy_score -= 0.1
+
+    if latest_rsi is not None:
+        if latest_rsi < 30:
+            buy_score += 0.15
+        elif latest_rsi > 70:
+            buy_score -= 0.15
+
+    return max(0, min(1, buy_score))
+
+
+def get_recommendation(buy_score):
+    if buy_score > BUY_THRESHOLD:
+        return "BUY"
+    if buy_score < SELL_THRESHOLD:
+        return "DON'T BUY"
+    return "HOLD"
+
+
+def compute_buy_scores(avg_sentiment, day_change, latest_rsi=None):
+    """Vectorized ``compute_buy_score`` over arrays; NaN RSI leaves the score unchanged.
+
+    Thresholds are compared in the inputs' own dtype, so float32 features
+    land on the same side of each cut-off as their float32 values suggest.
+    """
+    avg_sentiment = np.asarray(avg_sentiment)
+    day_change = np.asarray(day_change)
+    scores = 0.5 + np.select([avg_sentiment > 0.1, avg_sentiment < -0.1], [0.2, -0.2], 0.0)
+    scores += np.select([day_change < -2, day_change > 5], [0.1, -0.1], 0.0)
+    if latest_rsi is not None:
+        latest_rsi = np.asarray(latest_rsi)
+        scores += np.select([latest_rsi < 30, latest_rsi > 70], [0.15, -0.15], 0.0)
+    return np.clip(scores, 0, 1)
+
+
+def get_recommendations(buy_scores):
+    buy_scores = np.asarray(buy_scores)
+    return np.where(buy_scores > BUY_THRESHOLD, "BUY",
+                    np.where(buy_scores < SELL_THRESHOLD, "DON'T BUY", "HOLD"))
@@ -0,0 +1,256 @@
+"""Market-wide screener over a precomputed indicator and sentiment index.
+
+``ScreenerIndex.refresh`` is the precompute job. It fetches prices and news
+for a universe on a thread pool through the shared (disk-cached)
+components. It computes the indicators for every symbol in one matrix pass,
+each symbol on its own bars, and scores the articles. The latest values land in one indexed SQLite row
+per symbol, with the rule-based buy_score and, when the trained predictor
+can score the batch features, its ``confidence``. Symbols refreshed within ``max_age`` seconds are skipped, so the
+job can run nightly over the whole universe or every few minutes
+incrementally. ``query`` only reads that table, so screens return in
+milliseconds:
+
+    python webapp/screener.py refresh --watchlist watchlist.txt
+    python webapp/screener.py query "rsi < 30" "sentiment > 0" "close > ma50"
+"""
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from batch_predict import build_feature_matrix, model_scores
+from indicator_state import history_days
+from matrix_indicators import compute_indicators, latest, stack_own_bars
+from price_store import PROJECT_ROOT
+from scoring import compute_buy_scores, get_recommendations
+
+DEFAULT_INDEX_PATH = os.path.join(PROJECT_ROOT, 'data', 'cache', 'screener.sqlite')
+DEFAULT_SENTIMENT_DAYS = 7
+DEFAULT_MAX_WORKERS = 8
+
+NUMERIC_COLUMNS = ['close', 'day_change', 'rsi', 'macd', 'signal', 'ma20', 'ma50',
+                   'sentiment', 'articles', 'buy_score', 'confidence']
+TEXT_COLUMNS = ['symbol', 'company', 'recommendation']
+OPERATORS = ['<=', '>=', '!=', '<', '>', '=']
+RESULT_COLUMNS = ['symbol', 'company', 'as_of'] + NUMERIC_COLUMNS + ['recommendation', 'updated_at']
+
+
+def parse_filter(text):
+    """``"rsi < 30"`` -> ``('rsi', '<', 30.0)``; the right side may be a column name."""
+    match = re.fullmatch(r'\s*(\w+)\s*(<=|>=|!=|<|>|=)\s*(.+?)\s*', text)
+    if not match:
+        raise ValueError(f"cannot parse filter {text!r}")
+    column, op, value = match.groups()
+    try:
+        value = float(value)
+    except ValueError:
+        value = value.strip('\'"')
+    return column.lower(), op, value
+
+
+class ScreenerIndex:
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS latest (
+                symbol TEXT PRIMARY KEY,
+                company TEXT NOT NULL,
+                as_of TEXT,
+                close REAL,
+                day_change REAL,
+                rsi REAL,
+                macd REAL,
+                signal REAL,
+                ma20 REAL,
+                ma50 REAL,
+                sentiment REAL,
+                articles INTEGER NOT NULL DEFAULT 0,
+                buy_score REAL,
+                confidence REAL,
+                recommendation TEXT,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS latest_rsi ON latest (rsi);
+            CREATE INDEX IF NOT EXISTS latest_sentiment ON latest (sentiment);
+            CREATE INDEX IF NOT EXISTS latest_buy_score ON latest (buy_score);
+            CREATE INDEX IF NOT EXISTS latest_day_change ON latest (day_change);
+            CREATE INDEX IF NOT EXISTS latest_updated_at ON latest (updated_at);
+        """)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(latest)")}
+        if 'confidence' not in columns:
+            self._db.execute("ALTER TABLE latest ADD COLUMN confidence REAL")
+            self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM latest").fetchone()[0]
+
+    def query(self, filters=(), order_by='buy_score', descending=True, limit=200):
+        """Rows matching every ``(column, op, value)`` filter, as a DataFrame.
+
+        Columns and operators are checked against a whitelist; values are
+        bound as parameters, except that a value naming a numeric column
+        compares two columns (``('close', '>', 'ma50')``).
+        """
+        clauses, params = [], []
+        for column, op, value in filters:
+            if column not in NUMERIC_COLUMNS + TEXT_COLUMNS:
+                raise ValueError(f"unknown screener column {column!r}")
+            if op not in OPERATORS:
+                raise ValueError(f"unsupported operator {op!r}")
+            if isinstance(value, str) and value.lower() in NUMERIC_COLUMNS:
+                clauses.append(f"{column} {op} {value.lower()}")
+            else:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        if order_by not in NUMERIC_COLUMNS + TEXT_COLUMNS:
+            raise ValueError(f"unknown screener column {order_by!r}")
+
+        sql = f"SELECT {', '.join(RESULT_COLUMNS)} FROM latest"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order_by} IS NULL, {order_by} {'DESC' if descending else 'ASC'} LIMIT ?"
+        with self._lock:
+            rows = self._db.execute(sql, params + [int(limit)]).fetchall()
+        return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+    def stale_pairs(self, pairs, max_age):
+        """The ``(company, symbol)`` pairs not refreshed within ``max_age`` seconds."""
+        with self._lock:
+            fresh = {row[0] for row in self._db.execute(
+                "SELECT symbol FROM latest WHERE updated_at >= ?", (time.time() - max_age,))}
+        return [(company, symbol) for company, symbol in pairs if symbol not in fresh]
+
+    def refresh(self, components, pairs, sentiment_days=DEFAULT_SENTIMENT_DAYS, max_age=None,
+                max_workers=DEFAULT_MAX_WORKERS):
+        """Recompute the rows for ``pairs``; returns the number of symbols written."""
+        if max_age is not None:
+            pairs = self.stale_pairs(pairs, max_age)
+        if not pairs:
+            return 0
+
+        fetcher = components['stock_fetcher']
+        # The same history as the Analysis page, so RSI, MACD and the score agree with it
+        period = f"{history_days()}d"
+        scraper = components['news_scraper']
+        analyzer = components['sentiment_analyzer']
+
+        def fetch(pair):
+            company, symbol = pair
+            try:
+                stock_data = fetcher.get_stock_data(symbol, period=period)
+            except Exception:
+                stock_data = None
+            try:
+                news_df = scraper.fetch_company_news(company, sentiment_days)
+            except Exception:
+                news_df = pd.DataFrame()
+            return stock_data, news_df
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            fetched = list(pool.map(fetch, pairs))
+
+        companies, histories, day_changes, pe_ratios, sentiments, counts, news = {}, {}, {}, {}, {}, {}, {}
+        for (company, symbol), (stock_data, news_df) in zip(pairs, fetched):
+            if not stock_data or stock_data['historical'].empty:
+                continue
+            companies[symbol] = company
+            histories[symbol] = stock_data['historical']
+            day_changes[symbol] = stock_data.get('day_change', np.nan)
+            pe_ratios[symbol] = stock_data.get('pe_ratio') or np.nan
+            counts[symbol] = len(news_df)
+            if not news_df.empty:
+                news[symbol] = news_df
+        if news:
+            # One scoring call for the universe, so large refreshes reach the process pool
+            combined = pd.concat(news, names=['_symbol', None]).reset_index(level=0).reset_index(drop=True)
+            scored = analyzer.analyze_dataframe(combined)
+            for symbol, group in scored.groupby('_symbol', sort=False):
+                sentiments[symbol] = analyzer.get_average_sentiment(group)['avg_compound']
+
+        # Each symbol on its own bars, not the gaps of the union index
+        symbols, close = stack_own_bars(histories)
+        if not symbols:
+            return 0
+        values = {name: latest(matrix) for name, matrix in compute_indicators(close).items()}
+        last_close = latest(close)
+        day_change = np.array([day_changes[s] for s in symbols], dtype=float)
+        sentiment = np.array([sentiments.get(s, np.nan) for s in symbols], dtype=float)
+        scores = compute_buy_scores(np.nan_to_num(sentiment), np.nan_to_num(day_change), values['RSI'])
+        recommendations = get_recommendations(scores)
+        confidence = np.full(len(symbols), np.nan)
+        if components.get('predictor') is not None:
+            # The whole universe through the trained model in one call
+            _, volume = stack_own_bars(histories, 'Volume')
+            features = build_feature_matrix(np.nan_to_num(sentiment), close, volume, [pe_ratios[s] for s in symbols])
+            model = model_scores(components['predictor'], features)
+            if model is not None:
+                confidence = np.asarray(model, dtype=float)
+
+        def number(value):
+            return None if np.isnan(value) else float(value)
+
+        now = time.time()
+        rows = [
+            (symbol, companies[symbol], str(histories[symbol].index[-1].date()),
+             number(last_close[i]), number(day_change[i]), number(values['RSI'][i]),
+             number(values['MACD'][i]), number(values['Signal'][i]), number(values['MA20'][i]),
+             number(values['MA50'][i]), number(sentiment[i]), counts[symbol],
+             float(scores[i]), number(confidence[i]), str(recommendations[i]), now)
+            for i, symbol in enumerate(symbols)
+        ]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO latest (symbol, company, as_of, close, day_change, rsi, macd, "
+                "signal, ma20, ma50, sentiment, articles, buy_score, confidence, recommendation, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute and query the market screener index")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    refresh = commands.add_parser('refresh', help="recompute the index for a watchlist")
+    refresh.add_argument('--watchlist', required=True, help="file of 'Company, SYMBOL' lines")
+    refresh.add_argument('--days', type=int, default=DEFAULT_SENTIMENT_DAYS, help="sentiment lookback")
+    refresh.add_argument('--max-age', type=float, help="skip symbols refreshed within this many seconds")
+    refresh.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS)
+
+    query = commands.add_parser('query', help="print matching symbols")
+    query.add_argument('filters', nargs='*', help='e.g. "rsi < 30" "close > ma50"')
+    query.add_argument('--order-by', default='buy_score')
+    query.add_argument('--limit', type=int, default=50)
+
+    args = parser.parse_args()
+    index = ScreenerIndex()
+    if args.command == 'refresh':
+        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from batch_analysis import parse_watchlist
+        from components import get_components
+        with open(args.watchlist) as f:
+            pairs = parse_watchlist(f.read())
+        start = time.perf_counter()
+        written = index.refresh(get_components(), pairs, args.days, args.max_age, args.workers)
+        print(f"Refreshed {written} of {len(pairs)} symbols in {time.perf_counter() - start:.1f}s")
+    else:
+        start = time.perf_counter()
+        result = index.query([parse_filter(text) for text in args.filters], args.order_by, limit=args.limit)
+        elapsed = time.perf_counter() - start
+        print(result.to_string(index=False) if not result.empty else "No matches")
+        print(f"\n{len(result)} rows in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""Incremental, time-decayed and source-weighted sentiment per company.
+
+Scored articles are folded into daily buckets as they arrive; each bucket
+keeps the source weight, weighted score, decayed weight, decayed weighted
+score and class counts of its articles. Cumulative sums over the buckets
+are rebuilt lazily after new articles, so the aggregate for any lookback
+window is two array lookups instead of a rescan of ``news_df``.
+
+The decayed score for a window ending on day ``E`` is
+
+    sum(w_i * s_i * exp(-lambda * (E - t_i))) / sum(w_i * exp(-lambda * (E - t_i)))
+
+with ``w_i`` the source weight and ``lambda = ln 2 / half_life_days``. Terms
+are stored as ``exp(lambda * (t_i - first_day))``, and the ``exp(-lambda * E)``
+factor cancels in the ratio. ``retention_days`` bounds the span so the
+anchored terms stay finite in float64; buckets older than that, and the
+article keys remembered for them, are dropped, and articles that old are
+not taken in again.
+
+Articles are dated by their UTC publication day; price bars by the calendar
+date of their index, so an IST bar and that day's headlines line up.
+"""
+import math
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from sentiment_cache import article_key
+
+DEFAULT_HALF_LIFE_DAYS = 3.0
+DEFAULT_RETENTION_DAYS = 365
+DEFAULT_SOURCE_WEIGHT = 1.0
+# Wire services are weighted up; anything unlisted counts once
+SOURCE_WEIGHTS = {
+    'Reuters': 1.5,
+    'Bloomberg': 1.5,
+    'Economic Times': 1.0,
+    'Moneycontrol': 1.0,
+    'Mint': 1.0,
+    'Business Standard': 1.0,
+}
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+_SECONDS_PER_DAY = 86400.0
+# Bucket fields
+_WEIGHT, _SCORE, _DECAYED_WEIGHT, _DECAYED_SCORE, _COUNT, _POSITIVE, _NEGATIVE, _NEUTRAL = range(8)
+_FIELDS = 8
+_CLASS_FIELDS = {'Positive': _POSITIVE, 'Negative': _NEGATIVE, 'Neutral': _NEUTRAL}
+
+
+def day_numbers(index):
+    """Calendar dates of a ``DatetimeIndex`` as days since the epoch (wall-clock date when tz-aware)."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.to_numpy(dtype='datetime64[D]').astype(np.int64)
+
+
+def classify(score):
+    if score >= POSITIVE_THRESHOLD:
+        return 'Positive'
+    if score <= NEGATIVE_THRESHOLD:
+        return 'Negative'
+    return 'Neutral'
+
+
+class _CompanySentiment:
+    __slots__ = ('seen', 'day_keys', 'buckets', 'first_day', 'prefix', 'cutoff')
+
+    def __init__(self):
+        self.seen = set()
+        # Article keys per bucket day, so pruning a bucket forgets its articles
+        self.day_keys = {}
+        self.buckets = {}
+        self.first_day = None
+        self.prefix = None
+        # Days up to and including this one have been pruned
+        self.cutoff = None
+
+
+class SentimentAggregator:
+    """Rolling sentiment aggregates per company, shared by every session."""
+
+    def __init__(self, half_life_days=DEFAULT_HALF_LIFE_DAYS, retention_days=DEFAULT_RETENTION_DAYS,
+                 source_weights=None, score_column='vader_compound'):
+        self.decay = math.log(2) / half_life_days
+        if self.decay * retention_days > 600:
+            raise ValueError("half_life_days is too short for retention_days; decayed sums would overflow")
+        self.half_life_days = half_life_days
+        self.retention_days = retention_days
+        self.source_weights = SOURCE_WEIGHTS if source_weights is None else source_weights
+        self.score_column = score_column
+        self._companies = {}
+        self._lock = threading.Lock()
+
+    def add(self, company, news_df):
+        """Fold scored articles into ``company``'s buckets; returns how many were new."""
+        if news_df is None or news_df.empty or self.score_column not in news_df.columns:
+            return 0
+        published = pd.to_datetime(news_df['published_at'], utc=True, errors='coerce', format='mixed')
+        seconds = published.to_numpy(dtype='datetime64[s]', na_value=np.datetime64('NaT')).astype(np.int64)
+        scores = pd.to_numeric(news_df[self.score_column], errors='coerce').to_numpy(dtype=float)
+        sources = news_df['source'] if 'source' in news_df.columns else [None] * len(news_df)
+        descriptions = news_df['description'] if 'description' in news_df.columns else [''] * len(news_df)
+        classes = news_df['sentiment_class'] if 'sentiment_class' in news_df.columns else [None] * len(news_df)
+        valid = published.notna().to_numpy() & ~np.isnan(scores)
+
+        added = 0
+        with self._lock:
+            state = self._companies.setdefault(company, _CompanySentiment())
+            rows = zip(valid, seconds, scores, sources, news_df['title'], descriptions, classes)
+            for ok, second, score, source, title, description, label in rows:
+                if not ok:
+                    continue
+                day, offset = divmod(second / _SECONDS_PER_DAY, 1.0)
+                day = int(day)
+                key = article_key(title, description)
+                if key in state.seen or (state.cutoff is not None and day <= state.cutoff):
+                    continue
+                state.seen.add(key)
+                state.day_keys.setdefault(day, []).append(key)
+                bucket = state.buckets.get(day)
+                if bucket is None:
+                    bucket = state.buckets[day] = np.zeros(_FIELDS)
+                weight = self.source_weights.get(source, DEFAULT_SOURCE_WEIGHT)
+                decayed = weight * math.exp(self.decay * offset)
+                bucket[_WEIGHT] += weight
+                bucket[_SCORE] += weight * score
+                bucket[_DECAYED_WEIGHT] += decayed
+                bucket[_DECAYED_SCORE] += decayed * score
+                bucket[_COUNT] += 1
+                bucket[_CLASS_FIELDS.get(label, _CLASS_FIELDS[classify(score)])] += 1
+                added += 1
+            if added:
+                self._prune(state)
+                state.prefix = None
+        return added
+
+    def _prune(self, state):
+        """Drop buckets, and their article keys, older than ``retention_days`` before the newest (lock held)."""
+        state.cutoff = max(state.buckets) - self.retention_days
+        for day in [day for day in state.buckets if day <= state.cutoff]:
+            del state.buckets[day]
+            state.seen.difference_update(state.day_keys.pop(day))
+
+    def _prefix(self, state):
+        """``(first_day, cumulative sums)`` for ``state``, rebuilt after new articles (lock held)."""
+        if state.prefix is None:
+            last = max(state.buckets)
+            first = min(state.buckets)
+            totals = np.zeros((last - first + 2, _FIELDS))
+            days = np.fromiter(state.buckets, dtype=np.int64, count=len(state.buckets))
+            totals[days - first + 1] = np.array(list(state.buckets.values()))
+            totals[:, [_DECAYED_WEIGHT, _DECAYED_SCORE]] *= np.exp(self.decay * np.arange(-1, last - first + 1))[:, None]
+            state.first_day = first
+            state.prefix = np.cumsum(totals, axis=0)
+        return state.first_day, state.prefix
+
+    def _totals(self, company, start_days, end_days):
+        """Bucket sums over each inclusive ``[start, end]`` day range (arrays of day numbers)."""
+        with self._lock:
+            state = self._companies.get(company)
+            if state is None or not state.buckets:
+                return np.zeros((len(end_days), _FIELDS))
+            first, prefix = self._prefix(state)
+        n = len(prefix) - 1
+        hi = np.clip(end_days - first + 1, 0, n)
+        lo = np.clip(start_days - first, 0, n)
+        return prefix[hi] - prefix[np.minimum(lo, hi)]
+
+    def window(self, company, days, as_of=None):
+        """Aggregate over the ``days`` calendar days up to and including ``as_of`` (today by default)."""
+        if as_of is None:
+            end = np.array([int(time.time() // _SECONDS_PER_DAY)])
+        else:
+            end = day_numbers([pd.Timestamp(as_of)])
+        totals = self._totals(company, end - days + 1, end)[0]
+        count = int(totals[_COUNT])
+        if not count:
+            return {'avg_compound': 0.0, 'mean_compound': 0.0, 'avg_class': 'Neutral', 'article_count': 0,
+                    'positive_pct': 0.0, 'negative_pct': 0.0, 'neutral_pct': 0.0}
+        avg_compound = float(totals[_DECAYED_SCORE] / totals[_DECAYED_WEIGHT])
+        return {
+            'avg_compound': avg_compound,
+            'mean_compound': float(totals[_SCORE] / totals[_WEIGHT]),
+            'avg_class': classify(avg_compound),
+            'article_count': count,
+            'positive_pct': totals[_POSITIVE] / count * 100,
+            'negative_pct': totals[_NEGATIVE] / count * 100,
+            'neutral_pct': totals[_NEUTRAL] / count * 100
+        }
+
+    def series(self, company, index, days=None):
+        """Decayed sentiment at each date of ``index`` (e.g. ``hist.index``), NaN where no articles.
+
+        Each value covers articles published up to that date, within the
+        last ``days`` calendar days when given.
+        """
+        end = day_numbers(index)
+        start = end - days + 1 if days else np.full(len(end), np.iinfo(np.int64).min // 2)
+        totals = self._totals(company, start, end)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            values = np.where(totals[:, _COUNT] > 0, totals[:, _DECAYED_SCORE] / totals[:, _DECAYED_WEIGHT], np.nan)
+        return pd.Series(values, index=index, name='sentiment')
+
+    def stats(self):
+        with self._lock:
+            return {
+                'companies': len(self._companies),
+                'articles': sum(len(state.seen) for state in self._companies.values())
+            }
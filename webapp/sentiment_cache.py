@@ -0,0 +1,208 @@
+"""Content-hash score cache in front of ``SentimentAnalyzer``.
+
+Articles are keyed by a SHA-1 of their normalized title and description, so
+the same syndicated story is scored once no matter which company, lookback
+or session brings it back. Scores persist in a score store: ``SQLiteScores``
+(local, least recently used entries evicted past ``max_entries``) by default,
+or ``SharedScores`` to keep them in the ``SharedStore`` used by every worker
+and replica instead. With ``workers`` set, large
+batches of unseen articles are scored on a process pool, which is shut down
+by ``close`` or at interpreter exit.
+
+Only the article columns (``NEWS_COLUMNS``) are sent to the analyzer, so the
+columns it adds are exactly its scores. They are stored per article and
+written over any score columns the caller's frame already carries.
+"""
+import atexit
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from news_store import NEWS_COLUMNS
+from price_store import PROJECT_ROOT, json_default
+from sentiment_parallel import MIN_PARALLEL_ARTICLES, SentimentPool
+
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_ROOT, 'data', 'cache', 'sentiment.sqlite')
+DEFAULT_MAX_ENTRIES = 200_000
+_SQL_CHUNK = 500
+
+
+def _normalize(text):
+    if not isinstance(text, str):
+        return ''
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+
+def article_key(title, description):
+    text = _normalize(title) + '\x1f' + _normalize(description)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def article_keys(news_df):
+    """``article_key`` of every row of ``news_df``."""
+    descriptions = news_df['description'] if 'description' in news_df.columns else [''] * len(news_df)
+    return [article_key(title, description) for title, description in zip(news_df['title'], descriptions)]
+
+
+class SQLiteScores:
+    """Scores in a local SQLite file, evicting the least recently used past ``max_entries``."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        # Readers in other workers are not blocked by this one's writes
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, payload TEXT, last_used REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS scores_last_used ON scores (last_used)")
+        self._size = self._db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def __len__(self):
+        return self._size
+
+    def get_many(self, keys):
+        payloads = {}
+        now = time.time()
+        with self._lock:
+            for i in range(0, len(keys), _SQL_CHUNK):
+                chunk = keys[i:i + _SQL_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._db.execute(
+                    f"SELECT key, payload FROM scores WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                payloads.update((key, json.loads(payload)) for key, payload in rows)
+                self._db.execute(
+                    f"UPDATE scores SET last_used = ? WHERE key IN ({placeholders})", [now, *chunk]
+                )
+            self._db.commit()
+        return payloads
+
+    def put_many(self, payloads):
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO scores (key, payload, last_used) VALUES (?, ?, ?)",
+                [(key, json.dumps(payload, default=json_default), now) for key, payload in payloads.items()]
+            )
+            # Replaced keys and rows written by other workers make a running total drift
+            self._size = self._db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+            if self._size > self.max_entries:
+                self._db.execute(
+                    "DELETE FROM scores WHERE key IN (SELECT key FROM scores ORDER BY last_used LIMIT ?)",
+                    (self._size - self.max_entries,)
+                )
+                self._size = self.max_entries
+            self._db.commit()
+
+
+class SharedScores:
+    """Scores kept in a ``SharedStore`` namespace for ``ttl`` seconds."""
+
+    def __init__(self, store, ttl, namespace='sentiment'):
+        self.store = store
+        self.namespace = namespace
+        self.ttl = ttl
+
+    def __len__(self):
+        return self.store.backend.info(self.namespace)['entries']
+
+    def get_many(self, keys):
+        return self.store.get_many(self.namespace, keys)
+
+    def put_many(self, payloads):
+        self.store.put_many(self.namespace, payloads, self.ttl)
+
+
+class CachedSentimentAnalyzer:
+    """Drop-in wrapper that only sends unseen articles to the analyzer."""
+
+    def __init__(self, analyzer, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES, workers=None,
+                 scores=None):
+        self._analyzer = analyzer
+        self.scores = scores if scores is not None else SQLiteScores(path, max_entries)
+        self.workers = workers
+        self._pool = None
+        self.stats = {'hits': 0, 'misses': 0, 'score_seconds': 0.0}
+        self.last_run = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self._analyzer, name)
+
+    def analyze_dataframe(self, news_df):
+        if news_df.empty:
+            return self._analyzer.analyze_dataframe(news_df)
+
+        keys = article_keys(news_df)
+        first_row = {}
+        for position, key in enumerate(keys):
+            first_row.setdefault(key, position)
+
+        # An empty payload (stored by an older version) is a miss, not a row without scores
+        payloads = {key: value for key, value in self.scores.get_many(list(first_row)).items() if value}
+        missing = [key for key in first_row if key not in payloads]
+
+        elapsed = 0.0
+        if missing:
+            # One analyzer call for every unseen, de-duplicated article
+            article_columns = [column for column in news_df.columns if column in NEWS_COLUMNS]
+            batch = news_df.iloc[[first_row[key] for key in missing]][article_columns].reset_index(drop=True)
+            start = time.perf_counter()
+            scored = self._score(batch)
+            elapsed = time.perf_counter() - start
+            score_columns = [column for column in scored.columns if column not in article_columns]
+            if not score_columns:
+                raise ValueError("the sentiment analyzer added no score columns")
+            fresh = dict(zip(missing, scored[score_columns].to_dict('records')))
+            payloads.update(fresh)
+            self.scores.put_many(fresh)
+
+        hits = len(keys) - len(missing)
+        with self._lock:
+            self.stats['hits'] += hits
+            self.stats['misses'] += len(missing)
+            self.stats['score_seconds'] += elapsed
+            self.last_run = {
+                'articles': len(keys),
+                'hits': hits,
+                'scored': len(missing),
+                'score_seconds': elapsed
+            }
+
+        columns = list(dict.fromkeys(column for key in first_row for column in payloads[key]))
+        return news_df.assign(**{column: [payloads[key].get(column) for key in keys] for column in columns})
+
+    def _score(self, batch):
+        if not self.workers or len(batch) < MIN_PARALLEL_ARTICLES:
+            return self._analyzer.analyze_dataframe(batch)
+        with self._lock:
+            if self._pool is None:
+                self._pool = SentimentPool(self.workers)
+                atexit.register(self.close)
+        return self._pool.analyze_dataframe(batch)
+
+    def close(self):
+        """Shut down the scoring pool, if one was started."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+            atexit.unregister(self.close)
+
+    def cache_stats(self):
+        """Hit rate and scoring throughput (articles/sec) since startup."""
+        with self._lock:
+            total = self.stats['hits'] + self.stats['misses']
+            seconds = self.stats['score_seconds']
+            return {
+                'entries': len(self.scores),
+                'hit_rate': self.stats['hits'] / total if total else 0.0,
+                'articles_per_sec': self.stats['misses'] / seconds if seconds else None
+            }
@@ -0,0 +1,66 @@
+"""Process-pool sentiment scoring for large news backfills.
+
+Each worker process builds one ``SentimentAnalyzer`` (loading the lexicon or
+model once) and scores contiguous chunks of the frame. Chunks come back in
+order, so the merged frame has the same rows, index and ``vader_compound`` /
+``sentiment_class`` columns as a single-process ``analyze_dataframe`` call.
+"""
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from price_store import PROJECT_ROOT
+
+DEFAULT_CHUNK_SIZE = 2000
+# Below this many articles the pool start-up and pickling cost more than they save
+MIN_PARALLEL_ARTICLES = 5000
+
+_worker_analyzer = None
+
+
+def _init_worker(project_root):
+    global _worker_analyzer
+    if project_root not in sys.path:
+        sys.path.append(project_root)
+    from src.analysis.sentiment_analyzer import SentimentAnalyzer
+    _worker_analyzer = SentimentAnalyzer()
+
+
+def _score_chunk(chunk):
+    return _worker_analyzer.analyze_dataframe(chunk)
+
+
+class SentimentPool:
+    """Long-lived pool of sentiment workers; use as a context manager or call ``close``."""
+
+    def __init__(self, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(PROJECT_ROOT,)
+        )
+
+    def analyze_dataframe(self, news_df):
+        if news_df.empty:
+            return self._executor.submit(_score_chunk, news_df).result()
+        chunks = [news_df.iloc[i:i + self.chunk_size] for i in range(0, len(news_df), self.chunk_size)]
+        scored = pd.concat(list(self._executor.map(_score_chunk, chunks)))
+        scored.index = news_df.index
+        return scored
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def analyze_dataframe_parallel(news_df, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """One-off parallel ``analyze_dataframe`` for a backfill."""
+    with SentimentPool(workers, chunk_size) as pool:
+        return pool.analyze_dataframe(news_df)
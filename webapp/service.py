@@ -0,0 +1,186 @@
+"""Headless analysis engine with a CLI and a small HTTP JSON endpoint.
+
+The engine runs the same pipeline and buy_score rules as the Analysis page,
+keeps the components warm across requests and serves repeat requests from
+the shared result cache.
+
+    python webapp/service.py analyze RELIANCE.NS --company "Reliance Industries"
+    python webapp/service.py serve --port 8000
+    curl 'http://localhost:8000/recommend?symbol=RELIANCE.NS&company=Reliance%20Industries&days=7'
+    curl http://localhost:8000/metrics
+"""
+import argparse
+import json
+import math
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instrumentation import tracer
+from result_cache import ResultCache
+
+DEFAULT_DAYS = 7
+# Same range as the Analysis page's lookback slider; anything else would add cache keys no UI can reach
+MIN_DAYS = 1
+MAX_DAYS = 30
+
+
+def parse_days(value):
+    """``value`` as a lookback in days; ValueError unless it is an integer in ``[MIN_DAYS, MAX_DAYS]``."""
+    try:
+        days = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("'days' must be an integer") from None
+    if not MIN_DAYS <= days <= MAX_DAYS:
+        raise ValueError(f"'days' must be between {MIN_DAYS} and {MAX_DAYS}")
+    return days
+
+
+def _number(value):
+    if value is None:
+        return None
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+class AnalysisEngine:
+    def __init__(self, components=None, result_cache=None):
+        if components is None:
+            from components import get_components
+            components = get_components()
+        self.components = components
+        self.result_cache = result_cache or ResultCache()
+        tracer.register_collector(lambda: {f"result_cache_{k}": v for k, v in self.result_cache.info().items()})
+
+    def recommend(self, symbol, company=None, days=DEFAULT_DAYS):
+        from pipeline import analyze_symbol
+        days = parse_days(days)
+        symbol = symbol.upper()
+        company = company or symbol.split('.')[0]
+        with tracer.trace(f"recommend {symbol}"):
+            result, status = self.result_cache.get_or_compute(
+                (symbol, company, days),
+                lambda: analyze_symbol(self.components, company, symbol, days)
+            )
+        tracer.count('recommendations', cache=status)
+        return result_payload(result, days, status)
+
+
+def result_payload(result, days, cache_status=None):
+    """JSON-safe summary of a pipeline result."""
+    stock_data = result['stock_data'] or {}
+    summary = result['sentiment_summary']
+    hist = result['hist']
+    latest_rsi = None
+    if hist is not None and not hist.empty and 'RSI' in hist.columns:
+        latest_rsi = _number(hist['RSI'].iloc[-1])
+    return {
+        'symbol': result['symbol'],
+        'company': result['company'],
+        'days': days,
+        'found': bool(stock_data),
+        'current_price': _number(stock_data.get('current_price')),
+        'day_change': _number(stock_data.get('day_change')),
+        'market_cap': _number(stock_data.get('market_cap')),
+        'avg_sentiment': _number(summary['avg_compound']),
+        'sentiment_class': str(summary['avg_class']),
+        'articles': len(result['news_df']),
+        'used_mock_news': result['used_mock_news'],
+        'latest_rsi': latest_rsi,
+        'buy_score': _number(result['buy_score']),
+        'recommendation': result['recommendation'],
+        'cache': cache_status
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    engine = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/health':
+            return self._send(200, {'status': 'ok', 'cache': self.engine.result_cache.info()})
+        if url.path == '/metrics':
+            return self._send_text(200, tracer.prometheus(), 'text/plain; version=0.0.4')
+        if url.path != '/recommend':
+            return self._send(404, {'error': f"unknown path {url.path}"})
+
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if not query.get('symbol'):
+            return self._send(400, {'error': "missing 'symbol' parameter"})
+        try:
+            days = parse_days(query.get('days', DEFAULT_DAYS))
+        except ValueError as exc:
+            return self._send(400, {'error': str(exc)})
+        try:
+            payload = self.engine.recommend(query['symbol'], query.get('company'), days)
+        except Exception as exc:
+            return self._send(502, {'error': str(exc)})
+        self._send(200 if payload['found'] else 404, payload)
+
+    def _send(self, status, payload):
+        self._send_text(status, json.dumps(payload), 'application/json')
+
+    def _send_text(self, status, text, content_type):
+        body = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Access logs would dominate at hundreds of requests per second
+        pass
+
+
+def serve(engine, host='127.0.0.1', port=8000):
+    handler = type('Handler', (_Handler,), {'engine': engine})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    print(f"Serving recommendations on http://{host}:{server.server_address[1]}/recommend")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless stock recommendation engine")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    analyze = commands.add_parser('analyze', help="print recommendations as JSON lines")
+    analyze.add_argument('symbols', nargs='+')
+    analyze.add_argument('--company', help="company name used for the news search (one symbol only)")
+    analyze.add_argument('--days', type=int, default=DEFAULT_DAYS)
+
+    server = commands.add_parser('serve', help="run the HTTP JSON endpoint")
+    server.add_argument('--host', default='127.0.0.1')
+    server.add_argument('--port', type=int, default=8000)
+
+    args = parser.parse_args()
+    if args.command == 'analyze':
+        if args.company and len(args.symbols) > 1:
+            parser.error("--company can only be used with a single symbol")
+        try:
+            parse_days(args.days)
+        except ValueError as exc:
+            parser.error(str(exc))
+    engine = AnalysisEngine()
+    if args.command == 'analyze':
+        for symbol in args.symbols:
+            print(json.dumps(engine.recommend(symbol, args.company, args.days)))
+    else:
+        serve(engine, args.host, args.port)
+
+
+if __name__ == '__main__':
+    main()
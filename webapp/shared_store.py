@@ -0,0 +1,301 @@
+"""Data tier shared by every worker and replica of the app.
+
+``SharedStore`` keeps upstream results (price bars, articles, sentiment
+scores) by namespace and key with a TTL, and coalesces requests: within a
+process, concurrent callers for the same key wait on one ``Future``; across
+processes, the first caller takes a lease on the key and the others poll the
+backend until the value lands or the lease expires. So ten analysts opening
+the same ticker cause one upstream fetch.
+
+The backend is pluggable. ``SQLiteBackend`` (WAL mode) is the local one:
+processes on one host share it by pointing ``SHARED_STORE_PATH`` at the same
+file. A networked backend only needs the ``get``/``put``/``acquire``/
+``release`` methods. Values are pickled, so only point trusted processes at
+a store.
+
+``share`` wraps a component like ``instrumentation.instrument``: the listed
+methods go through the store, keyed by their arguments, with frames keyed
+by a hash of their contents. Sentiment scores are shared per article by
+``sentiment_cache.SharedScores`` through ``get_many``/``put_many``.
+
+Empty results are kept for ``HANDOFF_TTL_SECONDS`` only: long enough for
+concurrent callers to pick them up instead of calling upstream again, short
+enough that a failed or premature fetch is soon retried.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+
+import pandas as pd
+
+from price_store import PROJECT_ROOT
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = os.getenv('SHARED_STORE_PATH', os.path.join(PROJECT_ROOT, 'data', 'cache', 'shared.sqlite'))
+DEFAULT_LEASE_SECONDS = 60
+POLL_INTERVAL_SECONDS = 0.05
+BUSY_TIMEOUT_MS = 5000
+# Expired entries are purged every this many writes
+PURGE_EVERY = 200
+HANDOFF_TTL_SECONDS = 30
+_SQL_CHUNK = 500
+_MISSING = object()
+
+
+class SQLiteBackend:
+    """Entries and leases in one SQLite file in WAL mode, safe for several processes."""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=BUSY_TIMEOUT_MS / 1000)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB,
+                expires_at REAL,
+                PRIMARY KEY (namespace, key)
+            );
+            CREATE INDEX IF NOT EXISTS entries_expiry ON entries (expires_at);
+            CREATE TABLE IF NOT EXISTS leases (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                owner TEXT,
+                expires_at REAL,
+                PRIMARY KEY (namespace, key)
+            );
+        """)
+        self._db.commit()
+
+    def get(self, namespace, key):
+        """Stored bytes for the key, or None when missing or expired."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM entries WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (namespace, key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_many(self, namespace, keys):
+        """``{key: bytes}`` for the keys that are stored and unexpired."""
+        found = {}
+        now = time.time()
+        with self._lock:
+            for i in range(0, len(keys), _SQL_CHUNK):
+                chunk = keys[i:i + _SQL_CHUNK]
+                found.update(self._db.execute(
+                    f"SELECT key, value FROM entries WHERE namespace = ? AND expires_at > ? "
+                    f"AND key IN ({', '.join('?' * len(chunk))})", (namespace, now, *chunk)
+                ).fetchall())
+        return found
+
+    def put(self, namespace, key, value, ttl):
+        self.put_many(namespace, {key: value}, ttl)
+
+    def put_many(self, namespace, values, ttl):
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                [(namespace, key, sqlite3.Binary(value), now + ttl) for key, value in values.items()]
+            )
+            self._writes += 1
+            if self._writes % PURGE_EVERY == 0:
+                self._db.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+                self._db.execute("DELETE FROM leases WHERE expires_at <= ?", (now,))
+            self._db.commit()
+
+    def acquire(self, namespace, key, owner, lease_seconds):
+        """Take the lease on the key unless another owner holds an unexpired one."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("DELETE FROM leases WHERE namespace = ? AND key = ? AND expires_at <= ?",
+                             (namespace, key, now))
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO leases (namespace, key, owner, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, owner, now + lease_seconds)
+            )
+            self._db.commit()
+        return cursor.rowcount == 1
+
+    def release(self, namespace, key, owner):
+        with self._lock:
+            self._db.execute("DELETE FROM leases WHERE namespace = ? AND key = ? AND owner = ?",
+                             (namespace, key, owner))
+            self._db.commit()
+
+    def info(self, namespace=None):
+        sql = "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM entries"
+        params = ()
+        if namespace is not None:
+            sql += " WHERE namespace = ?"
+            params = (namespace,)
+        with self._lock:
+            entries, size = self._db.execute(sql, params).fetchone()
+        return {'entries': entries, 'bytes': size}
+
+
+def fingerprint(value):
+    """Stable text key for call arguments; frames and series are hashed by content."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        try:
+            hashed = pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes()
+        except TypeError:
+            hashed = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        columns = repr(list(value.columns)) if isinstance(value, pd.DataFrame) else repr(value.name)
+        return f"frame:{hashlib.sha1(columns.encode('utf-8') + hashed).hexdigest()}"
+    if isinstance(value, (list, tuple)):
+        return '(' + ','.join(fingerprint(item) for item in value) + ')'
+    if isinstance(value, dict):
+        return '{' + ','.join(f"{key!r}:{fingerprint(item)}" for key, item in sorted(value.items())) + '}'
+    return repr(value)
+
+
+def _cacheable(value):
+    if value is None:
+        return False
+    if isinstance(value, (pd.DataFrame, pd.Series, dict, list, tuple)):
+        return len(value) > 0
+    return True
+
+
+class SharedStore:
+    """TTL store with in-process and cross-process request coalescing."""
+
+    def __init__(self, backend=None, lease_seconds=DEFAULT_LEASE_SECONDS, poll_interval=POLL_INTERVAL_SECONDS):
+        self.backend = backend or SQLiteBackend()
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.stats = {'hits': 0, 'computed': 0, 'coalesced': 0, 'waited': 0}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _lookup(self, namespace, key):
+        payload = self.backend.get(namespace, key)
+        return _MISSING if payload is None else pickle.loads(payload)
+
+    def get(self, namespace, key):
+        value = self._lookup(namespace, key)
+        return None if value is _MISSING else value
+
+    def get_many(self, namespace, keys):
+        """``{key: value}`` for the keys that are stored."""
+        return {key: pickle.loads(payload) for key, payload in self.backend.get_many(namespace, list(keys)).items()}
+
+    def put(self, namespace, key, value, ttl):
+        self.backend.put(namespace, key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ttl)
+
+    def put_many(self, namespace, values, ttl):
+        self.backend.put_many(namespace, {key: pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                                          for key, value in values.items()}, ttl)
+
+    def get_or_compute(self, namespace, key, compute, ttl):
+        """The stored value for the key, computing it at most once across threads and processes.
+
+        Empty results (None, empty frames and containers) are stored for at
+        most ``HANDOFF_TTL_SECONDS``, so callers waiting on the key get them
+        too, but a failed upstream call is retried soon after.
+        """
+        value = self._lookup(namespace, key)
+        if value is not _MISSING:
+            self._count('hits')
+            return value
+
+        with self._lock:
+            future = self._inflight.get((namespace, key))
+            owner = future is None
+            if owner:
+                future = self._inflight[(namespace, key)] = Future()
+        if not owner:
+            self._count('coalesced')
+            return future.result()
+
+        try:
+            value = self._compute_once(namespace, key, compute, ttl)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            with self._lock:
+                self._inflight.pop((namespace, key), None)
+        return value
+
+    def _compute_once(self, namespace, key, compute, ttl):
+        """Compute under the cross-process lease, or wait for the process holding it."""
+        waited = False
+        while not self.backend.acquire(namespace, key, self.owner, self.lease_seconds):
+            if not waited:
+                self._count('waited')
+                waited = True
+            time.sleep(self.poll_interval)
+            value = self._lookup(namespace, key)
+            if value is not _MISSING:
+                return value
+        try:
+            # Another process may have finished between our lookup and the lease
+            value = self._lookup(namespace, key)
+            if value is not _MISSING:
+                self._count('hits')
+                return value
+            value = compute()
+            self._count('computed')
+            try:
+                self.put(namespace, key, value, ttl if _cacheable(value) else min(ttl, HANDOFF_TTL_SECONDS))
+            except (pickle.PicklingError, TypeError, AttributeError, sqlite3.Error):
+                logger.exception("Could not store %s/%s in the shared store", namespace, key)
+            return value
+        finally:
+            self.backend.release(namespace, key, self.owner)
+
+    def info(self):
+        with self._lock:
+            stats = dict(self.stats)
+        return dict(stats, **self.backend.info())
+
+
+class SharedComponent:
+    """Proxy that serves ``ttls``' methods of ``component`` through a ``SharedStore``.
+
+    ``ttls`` maps method names to how long their results stay shared; every
+    other attribute passes through untouched.
+    """
+
+    def __init__(self, component, store, namespace, ttls):
+        self._component = component
+        self._store = store
+        self._namespace = namespace
+        self._ttls = ttls
+
+    def __getattr__(self, attr):
+        value = getattr(self._component, attr)
+        if attr not in self._ttls:
+            return value
+
+        def call(*args, **kwargs):
+            key = f"{attr}:{fingerprint(args)}:{fingerprint(kwargs)}"
+            return self._store.get_or_compute(self._namespace, key, lambda: value(*args, **kwargs), self._ttls[attr])
+
+        return call
+
+
+def share(component, store, namespace, ttls):
+    return SharedComponent(component, store, namespace, ttls)
@@ -0,0 +1,80 @@
+"""Seeded synthetic market data for benchmarks and offline runs."""
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+NSE_MINUTES_PER_DAY = 375
+
+
+def make_ohlcv(n_bars, freq='B', seed=0, start_price=100.0, drift=0.08, volatility=0.25,
+               periods_per_year=TRADING_DAYS, end=None):
+    """Geometric Brownian motion closes with plausible OHLC and volume."""
+    rng = np.random.default_rng(seed)
+    dt = 1.0 / periods_per_year
+    shocks = rng.normal((drift - 0.5 * volatility ** 2) * dt, volatility * np.sqrt(dt), n_bars)
+    close = start_price * np.exp(np.cumsum(shocks))
+    open_ = np.concatenate([[start_price], close[:-1]])
+    wiggle = np.abs(rng.normal(0, volatility * np.sqrt(dt) / 2, n_bars))
+    high = np.maximum(open_, close) * (1 + wiggle)
+    low = np.minimum(open_, close) * (1 - wiggle)
+    # Volume rises with the size of the move
+    volume = rng.lognormal(13, 0.4, n_bars) * (1 + 20 * np.abs(shocks))
+
+    end = pd.Timestamp(end) if end is not None else pd.Timestamp.now().normalize()
+    index = pd.date_range(end=end, periods=n_bars, freq=freq, name='Date')
+    return pd.DataFrame({
+        'Open': open_,
+        'High': high,
+        'Low': low,
+        'Close': close,
+        'Volume': volume.round()
+    }, index=index)
+
+
+
+def make_close_matrix(n_symbols, n_bars, seed=0, volatility=0.25):
+    """``(n_symbols, n_bars)`` GBM closes, one row per symbol."""
+    rng = np.random.default_rng(seed)
+    dt = 1.0 / TRADING_DAYS
+    vols = rng.uniform(0.5, 1.5, (n_symbols, 1)) * volatility
+    shocks = rng.normal(0, 1, (n_symbols, n_bars)) * vols * np.sqrt(dt) - 0.5 * vols ** 2 * dt
+    start = rng.uniform(50, 3000, (n_symbols, 1))
+    return start * np.exp(np.cumsum(shocks, axis=1))
+
+
+NEWS_SOURCES = ['Economic Times', 'Moneycontrol', 'Bloomberg', 'Reuters', 'Mint', 'Business Standard']
+_HEADLINE_TEMPLATES = [
+    "{company} reports strong quarterly results",
+    "{company} shares slump after weak guidance",
+    "{company} announces expansion plans in {region}",
+    "{company} faces regulatory hurdles in {region}",
+    "Analysts upgrade {company} on robust demand",
+    "{company} misses revenue estimates as costs rise",
+    "{company} board approves dividend and buyback",
+    "{company} CEO steps down amid probe",
+]
+_REGIONS = ['India', 'Europe', 'the US', 'Southeast Asia', 'the Middle East']
+
+
+def make_news(n_articles, companies=None, days=30, seed=0, end=None):
+    """News frame shaped like ``NewsScraper.fetch_company_news`` output."""
+    rng = np.random.default_rng(seed)
+    companies = companies or [f"Company {i}" for i in range(50)]
+    end = pd.Timestamp(end) if end is not None else pd.Timestamp.now()
+    company = rng.choice(companies, n_articles)
+    template = rng.integers(0, len(_HEADLINE_TEMPLATES), n_articles)
+    region = rng.choice(_REGIONS, n_articles)
+    # Numbered suffix keeps titles distinct so caches cannot short-circuit the work
+    titles = [
+        _HEADLINE_TEMPLATES[t].format(company=c, region=r) + f" ({i})"
+        for i, (t, c, r) in enumerate(zip(template, company, region))
+    ]
+    published = end - pd.to_timedelta(rng.uniform(0, days * 86400, n_articles), unit='s')
+    return pd.DataFrame({
+        'title': titles,
+        'description': [f"{title}. More details inside." for title in titles],
+        'published_at': published.strftime('%Y-%m-%dT%H:%M:%S'),
+        'source': rng.choice(NEWS_SOURCES, n_articles),
+        'url': [f"https://news.example.com/{i}" for i in range(n_articles)],
+        'company': company
+    })
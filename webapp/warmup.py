@@ -0,0 +1,43 @@
+"""Background warm-up of heavy modules and shared components.
+
+Streamlit has no server-start hook, so ``prewarm()`` is called at the top of
+every script run and starts a daemon thread the first time only. While the
+first visitor is still looking at the page, that thread imports pandas and
+plotly and builds the components (sentiment lexicon, predictor model), so
+the first analysis does not pay for them. Set ``STOCK_ANALYZER_PREWARM=0``
+to disable.
+"""
+import importlib
+import os
+import threading
+import time
+
+HEAVY_MODULES = ['numpy', 'pandas', 'plotly.graph_objects', 'plotly.subplots']
+
+timings = {}
+_started = False
+_lock = threading.Lock()
+
+
+def prewarm():
+    """Start warming once per process; returns immediately."""
+    global _started
+    if os.getenv('STOCK_ANALYZER_PREWARM', '1') == '0':
+        return
+    with _lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=_warm, name='prewarm', daemon=True).start()
+
+
+def _warm():
+    for name in HEAVY_MODULES:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        timings[name] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from components import get_components
+    get_components()
+    timings['components'] = time.perf_counter() - start